@@ -0,0 +1,89 @@
+"""Benchmark: read asset/library facts with core.blendfile vs opening in Blender.
+
+    python source/benchmarks/bench_blend_reader.py
+    python source/benchmarks/bench_blend_reader.py --dir Blender/Geonodes --blender /path/to/blender
+
+Reads every .blend under `--dir` (default: the repo's Blender/Geonodes) with the
+bpy-free reader and reports the time per file and any file it had to hand back
+to Blender. With `--blender`, each file is also opened headless - the floor of
+what a Blender inspection costs, before the driver runs a single check.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import time
+
+SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SOURCE_DIR)
+
+from core import blendfile  # noqa: E402
+
+DEFAULT_DIR = os.path.normpath(os.path.join(SOURCE_DIR, "..", "..", "..", "..", "Geonodes"))
+CHECKS = ("asset_marked", "catalog_assigned", "no_external_deps")
+
+
+def _read_all(paths: list) -> tuple:
+    """(seconds, assets found, [(path, error)])"""
+    assets = 0
+    failed = []
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            assets += len(blendfile.inspect_file(path, checks=CHECKS)["assets"])
+        except blendfile.BlendFileError as exc:
+            failed.append((path, str(exc)))
+    return time.perf_counter() - start, assets, failed
+
+
+def _open_all(blender: str, paths: list) -> float:
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run(
+            [blender, "-b", "--factory-startup", path, "--python-expr", "pass"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False,
+        )
+    return time.perf_counter() - start
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=DEFAULT_DIR, help="folder of .blend files")
+    parser.add_argument("--blender", default="", help="also time headless Blender opens")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "**", "*.blend"), recursive=True))
+    if not paths:
+        print("no .blend files under %s" % args.dir)
+        return 1
+    total = sum(os.path.getsize(p) for p in paths)
+    print("%d file(s), %.1f MiB under %s (zstd reader: %s)" % (
+        len(paths), total / 2**20, args.dir, "yes" if blendfile.zstd_available() else "no"
+    ))
+
+    best = None
+    for _ in range(args.repeat):
+        secs, assets, failed = _read_all(paths)
+        best = secs if best is None else min(best, secs)
+    print("  reader     %7.3f s   %6.1f ms/file   %d asset(s)" % (
+        best, best * 1000 / len(paths), assets
+    ))
+    for path, error in failed:
+        print("    falls back to Blender: %s (%s)" % (os.path.basename(path), error))
+
+    if args.blender:
+        secs = _open_all(args.blender, paths)
+        print("  blender    %7.3f s   %6.1f ms/file   (open only)" % (
+            secs, secs * 1000 / len(paths)
+        ))
+        print("  speed-up   %.0fx" % (secs / max(best, 1e-9)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""Benchmark: every stage of `publish.publish` on a synthetic library.
+
+    python source/benchmarks/bench_publish.py
+    python source/benchmarks/bench_publish.py --files 20000 --scopes 12 --out run.json
+    python source/benchmarks/bench_publish.py --baseline baseline.json
+    python source/benchmarks/bench_publish.py --baseline baseline.json --update-baseline
+
+Generates a repo with `synthlib` (N scopes, M files, a size distribution,
+nested junk for the excludes to prune, a large catalog) and publishes it through
+the `copy` backend into a temp folder, with every criterion off - no Blender, no
+rclone. Four scenarios per round:
+
+  cold    first publish: empty caches, empty destination
+  noop    nothing changed: select, hash from cache, diff, skip delivery
+  edit    a small change set (`--edit` files changed, added and removed)
+  force   `--force` over a warm staging tree and an up-to-date destination
+
+Each stage (select, catalog, criteria, hash, diff, stage, deliver) keeps its best
+time over `--repeat` rounds. `--out` writes the result as JSON; `--baseline`
+compares against a stored result and exits 1 if any stage got slower by more
+than `--tolerance` (relative) *and* `--min-delta` seconds (absolute - so a
+stage going from 2 ms to 4 ms is not a regression).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import synthlib  # noqa: E402
+from core import publish  # noqa: E402
+
+RESULT_SCHEMA = 1
+SCENARIOS = ("cold", "noop", "edit", "force")
+
+
+def _stages(result) -> dict:
+    return {
+        t.name: {"seconds": t.seconds, "files": t.files, "bytes": t.bytes,
+                 "cache_hits": t.cache_hits}
+        for t in result.stages
+    }
+
+
+def run_round(cfg: dict, spec: synthlib.Spec, work: str, round_no: int, edit: int) -> dict:
+    """One cold -> noop -> edit -> force sequence against fresh caches."""
+    tool_root = os.path.join(work, "tool_%d" % round_no)
+    os.makedirs(os.path.join(tool_root, "source", "checks"))
+    cfg = dict(cfg, delivery=dict(cfg["delivery"], local=dict(
+        cfg["delivery"]["local"], path=os.path.join(work, "drive_%d" % round_no, "ST3E_Ext"),
+    )))
+    out = {}
+    for scenario in SCENARIOS:
+        if scenario == "edit":
+            synthlib.edit(cfg, spec, round_no, edit)
+        started = time.perf_counter()
+        result = publish.publish(cfg, tool_root, force=scenario == "force",
+                                 reason="benchmark")
+        total = time.perf_counter() - started
+        if not result.ok:
+            raise RuntimeError("%s publish failed:\n%s" % (scenario, "\n".join(result.lines)))
+        out[scenario] = {
+            "seconds": total,
+            "delivered": result.delivered,
+            "files": len(result.manifest.get("files", {})),
+            "stages": _stages(result),
+        }
+    shutil.rmtree(tool_root, ignore_errors=True)
+    shutil.rmtree(os.path.join(work, "drive_%d" % round_no), ignore_errors=True)
+    return out
+
+
+def best_of(rounds: list) -> dict:
+    """Per scenario and stage, the fastest round (counts from that round)."""
+    best = {}
+    for scenario in SCENARIOS:
+        runs = [r[scenario] for r in rounds]
+        merged = dict(min(runs, key=lambda r: r["seconds"]))
+        stages = {}
+        for run in runs:
+            for name, stage in run["stages"].items():
+                if name not in stages or stage["seconds"] < stages[name]["seconds"]:
+                    stages[name] = stage
+        merged["stages"] = stages
+        best[scenario] = merged
+    return best
+
+
+def compare(current: dict, baseline: dict, tolerance: float, min_delta: float) -> list:
+    """(scenario, stage, old s, new s, regressed) for every timing both have."""
+    rows = []
+    for scenario in SCENARIOS:
+        new = current["scenarios"].get(scenario)
+        old = baseline["scenarios"].get(scenario)
+        if not new or not old:
+            continue
+        pairs = [("total", old["seconds"], new["seconds"])]
+        for name, stage in new["stages"].items():
+            if name in old["stages"]:
+                pairs.append((name, old["stages"][name]["seconds"], stage["seconds"]))
+        for name, was, now in pairs:
+            regressed = now > was * (1 + tolerance) and now - was > min_delta
+            rows.append((scenario, name, was, now, regressed))
+    return rows
+
+
+def _print_result(result: dict) -> None:
+    spec = result["spec"]
+    print("library: %d file(s) in %d scope(s), sizes %s, %d catalog entries, %s" % (
+        spec["files"], spec["scopes"], spec["sizes"], spec["catalogs"],
+        _human_bytes(result["generated_bytes"]),
+    ))
+    names = []
+    for scenario in SCENARIOS:
+        for name in result["scenarios"][scenario]["stages"]:
+            if name not in names:
+                names.append(name)
+    print("  %-8s %8s  %s" % ("", "total", "  ".join("%8s" % n for n in names)))
+    for scenario in SCENARIOS:
+        run = result["scenarios"][scenario]
+        cells = []
+        for name in names:
+            stage = run["stages"].get(name)
+            cells.append("%8s" % ("-" if stage is None else "%.3f" % stage["seconds"]))
+        print("  %-8s %8.3f  %s" % (scenario, run["seconds"], "  ".join(cells)))
+
+
+def _human_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return ("%d %s" if unit == "B" else "%.1f %s") % (n, unit)
+        n /= 1024.0
+
+
+def main(argv=None) -> int:
+    defaults = synthlib.Spec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scopes", type=int, default=defaults.scopes)
+    parser.add_argument("--files", type=int, default=defaults.files)
+    parser.add_argument("--sizes", default=defaults.sizes,
+                        help="fixed:<KiB> | lognormal:<median KiB>:<sigma> | bimodal")
+    parser.add_argument("--depth", type=int, default=defaults.depth)
+    parser.add_argument("--junk", type=float, default=defaults.junk)
+    parser.add_argument("--catalogs", type=int, default=defaults.catalogs)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--edit", type=int, default=20, help="files per change set")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default="", help="work here (default: temp, removed after)")
+    parser.add_argument("--out", default="", help="write the result JSON here")
+    parser.add_argument("--baseline", default="", help="compare against this result JSON")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="write this run to --baseline afterwards")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    spec = synthlib.Spec(args.scopes, args.files, args.sizes, args.depth, args.junk,
+                         args.catalogs, args.seed)
+    work = args.dir or tempfile.mkdtemp(prefix="lp_bench_publish_")
+    try:
+        repo = os.path.join(work, "repo")
+        cfg = synthlib.generate(repo, spec)
+        generated = sum(
+            os.path.getsize(os.path.join(base, n))
+            for base, _d, names in os.walk(repo) for n in names
+        )
+        rounds = [run_round(cfg, spec, work, i + 1, args.edit) for i in range(args.repeat)]
+    finally:
+        if not args.dir:
+            shutil.rmtree(work, ignore_errors=True)
+
+    result = {
+        "schema": RESULT_SCHEMA,
+        "spec": spec.as_dict(),
+        "edit": args.edit,
+        "repeat": args.repeat,
+        "generated_bytes": generated,
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "scenarios": best_of(rounds),
+    }
+    _print_result(result)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, sort_keys=True)
+        print("wrote %s" % args.out)
+
+    status = 0
+    if args.baseline and os.path.isfile(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        if baseline.get("spec") != result["spec"] or baseline.get("edit") != args.edit:
+            print("baseline %s was taken with a different library spec - "
+                  "not comparable" % args.baseline)
+            status = 2
+        else:
+            rows = compare(result, baseline, args.tolerance, args.min_delta)
+            slower = [r for r in rows if r[4]]
+            for scenario, name, was, now, regressed in rows:
+                if regressed:
+                    print("  REGRESSION %s/%s: %.3f s -> %.3f s (%+.0f%%)" % (
+                        scenario, name, was, now, 100.0 * (now - was) / max(was, 1e-9)))
+            print("baseline: %d timing(s) compared, %d regression(s) (tolerance %.0f%%, "
+                  "min %.3f s)" % (len(rows), len(slower), 100 * args.tolerance, args.min_delta))
+            status = 1 if slower else 0
+    elif args.baseline and not args.update_baseline:
+        print("no baseline at %s - run with --update-baseline to create it" % args.baseline)
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2, sort_keys=True)
+        print("baseline updated: %s" % args.baseline)
+        status = 0
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
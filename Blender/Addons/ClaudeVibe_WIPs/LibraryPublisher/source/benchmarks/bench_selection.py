@@ -0,0 +1,139 @@
+"""Benchmark: scope selection over a synthetic 100k-file repo.
+
+    python source/benchmarks/bench_selection.py
+    python source/benchmarks/bench_selection.py --files 250000 --repeat 5
+
+Builds a throwaway tree shaped like the real one - flat folders of .blends
+next to `_backup*/` and `TreeGenDocu/` junk, and many addon projects whose
+source, archive and build folders dwarf their few distribution zips - then
+runs `selection.select` with the default scope config. As a baseline it also
+runs the original algorithm (list everything with `os.walk`, compile each
+pattern per file, stat again) and checks both pick the same files.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import config, selection  # noqa: E402
+
+
+def make_tree(root: str, files: int) -> int:
+    """Write about `files` empty files under `root`; returns the real count."""
+    made = 0
+
+    def touch(rel):
+        nonlocal made
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, "wb").close()
+        made += 1
+
+    flat = max(files // 50, 10)
+    for folder in ("Blender/Geonodes", "Blender/Shading"):
+        for i in range(flat):
+            touch("%s/GN_%05d.blend" % (folder, i))
+            touch("%s/_backup_%d/GN_%05d.blend" % (folder, i % 7, i))
+        for i in range(flat // 4):
+            touch("%s/GN_%05d_fixed.blend" % (folder, i))
+            touch("%s/TreeGenDocu/iter_%05d.blend" % (folder, i))
+    addon = 0
+    while made < files:
+        base = "Blender/Addons/ClaudeVibe_WIPs/Addon%03d" % addon
+        touch("%s/distribution/Addon%03d_v1.0.zip" % (base, addon))
+        for i in range(40):
+            touch("%s/distribution/archive/Addon%03d_v0.%d.zip" % (base, addon, i))
+        for i in range(400):
+            touch("%s/source/pkg%d/mod%d/file_%03d.py" % (base, i % 5, i % 11, i))
+        for i in range(200):
+            touch("%s/build/tmp/obj_%03d.o" % (base, i))
+        addon += 1
+    return made
+
+
+# --- the original per-file algorithm, kept as the baseline ------------------
+
+def _regex(pattern):
+    body = selection._glob_body(pattern)
+    return re.compile("^%s$" % body, re.IGNORECASE if os.name == "nt" else 0)
+
+
+def _matches(rel, pattern):
+    target = rel if "/" in pattern else rel.rsplit("/", 1)[-1]
+    return _regex(pattern).match(target) is not None
+
+
+def baseline_select(cfg) -> list:
+    out = []
+    for entry in cfg["scope"]["entries"]:
+        if not entry.get("enabled"):
+            continue
+        base = os.path.normpath(os.path.join(cfg["source"]["repo_root"], entry["src"]))
+        if not os.path.isdir(base):
+            continue
+        for folder, dirnames, filenames in os.walk(base):
+            dirnames.sort()
+            if not entry.get("recursive") and folder != base:
+                continue
+            for name in sorted(filenames):
+                rel = os.path.relpath(os.path.join(folder, name), base).replace(os.sep, "/")
+                if not any(_matches(rel, p) for p in entry["include"]):
+                    continue
+                if any(_matches(rel, p) for p in entry.get("exclude") or []):
+                    continue
+                os.stat(os.path.join(folder, name))
+                leaf = rel.rsplit("/", 1)[-1] if entry.get("flatten") else rel
+                out.append("%s/%s" % (entry["dest"].strip("/"), leaf))
+    return sorted(out, key=str.lower)
+
+
+def _best_of(repeat: int, fn) -> tuple:
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dir", default="", help="build the tree here (default: temp)")
+    args = parser.parse_args(argv)
+
+    root = args.dir or tempfile.mkdtemp(prefix="lp_bench_select_")
+    try:
+        made = make_tree(root, args.files)
+        cfg = config.default_config(root)
+        print("tree: %d file(s) at %s" % (made, root))
+
+        old_s, old = _best_of(args.repeat, lambda: baseline_select(cfg))
+        new_s, new = _best_of(args.repeat, lambda: selection.select(cfg))
+        if [f.dest for f in new.files] != old:
+            print("MISMATCH: select() picked different files than the baseline")
+            return 1
+
+        print("  selected   %d file(s)" % len(old))
+        for label, secs in (("baseline", old_s), ("select()", new_s)):
+            print("  %-10s %7.3f s" % (label, secs))
+        print("  speed-up   %.1fx (same selection)" % (old_s / max(new_s, 1e-9)))
+        return 0
+    finally:
+        if not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Synthetic asset libraries for the benchmarks. bpy-free.
+
+    import synthlib      # from a script in this folder
+    spec = synthlib.Spec(scopes=6, files=5000, sizes="lognormal:48:1.2")
+    cfg = synthlib.generate(root, spec)
+
+Writes a repo shaped like the real one - one folder per scope, nested
+subfolders, junk the scope rules must prune (`_backup*/`, `archive/`,
+`*_fixed.blend`) and a catalog file with many nested entries - and returns a
+config whose scope entries describe exactly that tree. Content is seeded, so the
+same spec always produces byte-identical files (and the same hashes).
+"""
+
+from __future__ import annotations
+
+import copy
+import math
+import os
+import random
+import sys
+import uuid
+from typing import NamedTuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import config  # noqa: E402
+
+LIBRARY = "Blender"
+ROOT_CATALOG = "ST3E"
+
+
+class Spec(NamedTuple):
+    scopes: int = 4
+    files: int = 2000          # published files across all scopes
+    sizes: str = "bimodal"     # see `size_sampler`
+    depth: int = 2             # nesting below each scope folder
+    junk: float = 0.25         # extra excluded files, as a fraction of `files`
+    catalogs: int = 500        # entries in blender_assets.cats.txt
+    seed: int = 7
+
+    def as_dict(self) -> dict:
+        return dict(self._asdict())
+
+
+def size_sampler(sizes: str, rng: random.Random):
+    """A callable returning one file size in bytes.
+
+      fixed:<KiB>                 every file the same size
+      lognormal:<median KiB>:<s>  the usual long tail of node-group .blends
+      bimodal                     mostly light files plus 2% heavy (1-4 MiB)
+    """
+    kind, _, rest = sizes.partition(":")
+    args = [float(a) for a in rest.split(":") if a]
+    if kind == "fixed":
+        size = int((args[0] if args else 64) * 1024)
+        return lambda: size
+    if kind == "lognormal":
+        median = (args[0] if args else 48) * 1024
+        sigma = args[1] if len(args) > 1 else 1.0
+        return lambda: max(1, int(rng.lognormvariate(math.log(median), sigma)))
+    if kind == "bimodal":
+        def sample():
+            if rng.random() < 0.02:
+                return rng.randint(1 << 20, 4 << 20)
+            return max(1, int(rng.lognormvariate(math.log(32 * 1024), 0.8)))
+        return sample
+    raise ValueError("unknown size distribution %r" % sizes)
+
+
+def scope_name(i: int) -> str:
+    return "bench%02d" % i
+
+
+def scope_entries(spec: Spec) -> list:
+    return [
+        {
+            "name": scope_name(i),
+            "enabled": True,
+            "src": "%s/Bench/Scope%02d" % (LIBRARY, i),
+            "dest": "Scope%02d" % i,
+            "include": ["*.blend"],
+            "exclude": ["**/_backup*/**", "**/archive/**", "*_fixed.blend"],
+            "recursive": True,
+            "flatten": False,
+        }
+        for i in range(spec.scopes)
+    ]
+
+
+def _folder(rng: random.Random, depth: int) -> str:
+    parts = ["sub%d" % rng.randrange(4) for _ in range(rng.randint(0, depth))]
+    return "/".join(parts)
+
+
+class _Writer:
+    """Writes seeded, distinct file contents without generating them byte by byte."""
+
+    def __init__(self, root: str, rng: random.Random):
+        self.root = root
+        self.block = rng.randbytes(1 << 20) if hasattr(rng, "randbytes") else os.urandom(1 << 20)
+        self.bytes = 0
+        self.written = []
+
+    def backdate(self, seconds: int = 3600) -> None:
+        """Age everything written: a real library's files are not seconds old,
+        and the hash cache rightly refuses to trust files that are."""
+        for path in self.written:
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 10**9))
+        self.written = []
+
+    def write(self, rel: str, size: int, salt: str = "") -> None:
+        path = os.path.join(self.root, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        head = ("%s|%s|" % (rel, salt)).encode("utf-8")
+        with open(path, "wb") as fh:
+            fh.write(head[:size])
+            left = size - min(size, len(head))
+            while left > 0:
+                chunk = self.block[:min(left, len(self.block))]
+                fh.write(chunk)
+                left -= len(chunk)
+        self.bytes += size
+        self.written.append(path)
+
+
+def write_catalog(path: str, count: int, rng: random.Random) -> None:
+    lines = ["# Asset Catalog Definition file", "VERSION 1", ""]
+    lines.append("%s:%s:%s" % (uuid.UUID(int=rng.getrandbits(128)), ROOT_CATALOG, ROOT_CATALOG))
+    for i in range(max(0, count - 1)):
+        cat_path = "%s/Group%02d/Cat%04d" % (ROOT_CATALOG, i % 40, i)
+        lines.append("%s:%s:%s" % (
+            uuid.UUID(int=rng.getrandbits(128)), cat_path, cat_path.replace("/", "-"),
+        ))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("\n".join(lines) + "\n")
+
+
+def generate(root: str, spec: Spec = Spec()) -> dict:
+    """Write the synthetic repo under `root`; returns its config.
+
+    The config uses the `copy` backend into `<root>/../drive` - callers point
+    `delivery.local.path` elsewhere as they need - with every criterion off, so
+    a publish of it never needs Blender or rclone.
+    """
+    rng = random.Random(spec.seed)
+    sample = size_sampler(spec.sizes, rng)
+    writer = _Writer(root, rng)
+    entries = scope_entries(spec)
+    for n in range(spec.files):
+        entry = entries[n % len(entries)]
+        folder = _folder(rng, spec.depth)
+        rel = "%s/%sGN_%06d.blend" % (entry["src"], folder + "/" if folder else "", n)
+        writer.write(rel, sample())
+    for n in range(int(spec.files * spec.junk)):
+        entry = entries[n % len(entries)]
+        folder = _folder(rng, spec.depth)
+        prefix = entry["src"] + ("/" + folder if folder else "")
+        junk = rng.choice((
+            "%s/_backup_%d/GN_%06d.blend" % (prefix, n % 5, n),
+            "%s/archive/GN_%06d.blend" % (prefix, n),
+            "%s/GN_%06d_fixed.blend" % (prefix, n),
+        ))
+        writer.write(junk, sample())
+    writer.backdate()
+    write_catalog(os.path.join(root, LIBRARY, "blender_assets.cats.txt"), spec.catalogs, rng)
+
+    cfg = config.default_config(root)
+    cfg["scope"]["entries"] = copy.deepcopy(entries)
+    cfg["delivery"]["backend"] = "copy"
+    cfg["delivery"]["atomic"] = False
+    cfg["delivery"]["local"]["path"] = os.path.join(
+        os.path.dirname(os.path.abspath(root)), "drive", cfg["library_name"]
+    )
+    for check in cfg["criteria"].values():
+        check["mode"] = "off"
+        check["applies_to"] = [entry["name"] for entry in entries]
+    return cfg
+
+
+def published_sources(cfg: dict) -> list:
+    """Repo-relative paths of every file the scope rules publish, sorted."""
+    out = []
+    for entry in cfg["scope"]["entries"]:
+        base = os.path.join(cfg["source"]["repo_root"], *entry["src"].split("/"))
+        for folder, dirnames, names in os.walk(base):
+            dirnames[:] = sorted(d for d in dirnames
+                                 if not d.startswith("_backup") and d != "archive")
+            for name in sorted(names):
+                if name.endswith(".blend") and not name.endswith("_fixed.blend"):
+                    rel = os.path.relpath(os.path.join(folder, name), cfg["source"]["repo_root"])
+                    out.append(rel.replace(os.sep, "/"))
+    return out
+
+
+def edit(cfg: dict, spec: Spec, round_no: int, count: int) -> dict:
+    """A typical working session: rewrite `count` published files, add `count`
+    new ones and delete the ones the previous round added. Seeded by
+    `round_no`, so every round is a different change set of the same size."""
+    root = cfg["source"]["repo_root"]
+    rng = random.Random(spec.seed * 1000 + round_no)
+    writer = _Writer(root, rng)
+    sample = size_sampler(spec.sizes, rng)
+    sources = [rel for rel in published_sources(cfg) if "/GN_new_" not in rel]
+    for rel in rng.sample(sources, min(count, len(sources))):
+        writer.write(rel, sample(), salt="round%d" % round_no)
+    removed = 0
+    for rel in published_sources(cfg):
+        if "/GN_new_r%d_" % (round_no - 1) in rel:
+            os.remove(os.path.join(root, *rel.split("/")))
+            removed += 1
+    entries = scope_entries(spec)
+    for n in range(count):
+        src = entries[n % len(entries)]["src"]
+        writer.write("%s/GN_new_r%d_%04d.blend" % (src, round_no, n), sample())
+    writer.backdate(60)
+    return {"changed": min(count, len(sources)), "added": count, "removed": removed}
@@ -74,6 +74,7 @@ def _store(context, result, ok: bool, headline: str):
     state.report_text = "\n".join(result.lines) if result else headline
     state.report_ok = ok
     state.headline = headline
+    state.timings = "\n".join(publish.format_stages(result.stages)) if result else ""
 
 
 def _refresh_asset_libraries(context) -> str:
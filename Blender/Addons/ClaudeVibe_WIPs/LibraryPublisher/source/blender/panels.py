@@ -86,6 +86,11 @@ class ST3E_PT_library_publisher(Panel):
                 text=state.headline,
                 icon="CHECKMARK" if state.report_ok else "ERROR",
             )
+            if state.timings:
+                col = box.column(align=True)
+                col.scale_y = 0.8
+                for line in state.timings.splitlines():
+                    col.label(text=line, icon="TIME")
             box.operator("st3e.library_publish_report", text="Full Report", icon="TEXT")
 
 
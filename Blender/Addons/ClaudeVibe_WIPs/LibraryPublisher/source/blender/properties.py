@@ -41,6 +41,11 @@ class ST3E_LibraryPublishState(PropertyGroup):
         description="One-line result of the last run",
         default="",
     )
+    timings: StringProperty(
+        name="Stage Timings",
+        description="Per-stage breakdown of the last run, one stage per line",
+        default="",
+    )
 
 
 class ST3E_LibraryPublisherPreferences(AddonPreferences):
@@ -11,12 +11,25 @@ Invoked as:
 The batch file is written by `core.publish`; the payload comes back on stdout
 between the ST3E_INSPECT markers, because Blender's stdout is full of unrelated
 startup chatter.
+
+Or, as a long-lived inspection daemon that skips Blender's startup cost on every
+run after the first:
+    blender --background --factory-startup --python blender_inspect.py -- \
+        --serve <state.json> <idle_seconds>
+
+It listens on a localhost socket, records port/pid/token in <state.json>, takes
+one JSON batch per connection and answers with the same fenced payload. Between
+files it resets to factory settings, and it exits on its own once idle.
 """
 
+import hashlib
 import json
 import os
+import secrets
+import socket
 import sys
 import tempfile
+import time
 import traceback
 
 import bpy
@@ -232,15 +245,8 @@ def _import_audit_module(audit_dir):
         return None, "could not import layout_audit: %s" % exc
 
 
-def main():
-    argv = sys.argv
-    if "--" not in argv:
-        _emit({"reports": [], "error": "no batch file argument"})
-        return
-    batch_path = argv[argv.index("--") + 1]
-    with open(batch_path, "r", encoding="utf-8") as fh:
-        batch = json.load(fh)
-
+def inspect_batch(batch, reset_between=False):
+    """Inspect every file in one batch and return the payload dict."""
     checks = set(batch.get("checks") or [])
     audit_module = None
     audit_error = ""
@@ -249,6 +255,10 @@ def main():
 
     reports = []
     for item in batch.get("files") or []:
+        if reset_between and reports:
+            # A daemon outlives many files; start each from the same blank slate
+            # a fresh `--factory-startup` process would have had.
+            bpy.ops.wm.read_factory_settings(use_empty=True)
         src = item.get("src", "")
         report = {"src": src, "dest": item.get("dest", ""), "scope": item.get("scope", "")}
         try:
@@ -272,7 +282,110 @@ def main():
             report["error"] = "inspect failed: %s" % traceback.format_exc(limit=3)
         reports.append(report)
 
-    _emit({"reports": reports, "audit_error": audit_error})
+    return {"reports": reports, "audit_error": audit_error}
+
+
+def main():
+    argv = sys.argv
+    if "--" not in argv:
+        _emit({"reports": [], "error": "no batch file argument"})
+        return
+    args = argv[argv.index("--") + 1:]
+    if args and args[0] == "--serve":
+        serve(args[1], float(args[2]) if len(args) > 2 else 900.0)
+        return
+    with open(args[0], "r", encoding="utf-8") as fh:
+        batch = json.load(fh)
+    _emit(inspect_batch(batch))
+
+
+# --- daemon mode -------------------------------------------------------------
+
+def _own_hash():
+    with open(os.path.abspath(__file__), "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def _write_state(path, state):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, path)
+
+
+# A client writes its request right after connecting. One that stalls (killed
+# mid-send, or any local process probing the port) is dropped after this long
+# instead of blocking the single-threaded daemon - and its idle timeout.
+REQUEST_READ_SECONDS = 10.0
+
+
+def _read_request(conn):
+    deadline = time.monotonic() + REQUEST_READ_SECONDS
+    buf = b""
+    while not buf.endswith(b"\n"):
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise socket.timeout("request not received in time")
+        conn.settimeout(left)
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        buf += chunk
+    return json.loads(buf.decode("utf-8")) if buf.strip() else {}
+
+
+def serve(state_path, idle_seconds):
+    """Answer batches over localhost until idle for `idle_seconds`."""
+    token = secrets.token_hex(16)
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(4)
+    server.settimeout(idle_seconds)
+    _write_state(state_path, {
+        "pid": os.getpid(),
+        "port": server.getsockname()[1],
+        "token": token,
+        # The client restarts a daemon whose driver or Blender no longer match.
+        "driver_sha256": _own_hash(),
+        "blender": bpy.app.binary_path,
+        "started": time.time(),
+    })
+    try:
+        while True:
+            try:
+                conn, _addr = server.accept()
+            except socket.timeout:
+                break  # idle: let the next run pay startup again
+            with conn:
+                try:
+                    request = _read_request(conn)
+                except (OSError, ValueError):
+                    continue  # socket.timeout is an OSError: drop the stalled client
+                if request.get("token") != token:
+                    continue
+                if request.get("op") == "shutdown":
+                    break
+                try:
+                    payload = inspect_batch(request.get("batch") or {}, reset_between=True)
+                    bpy.ops.wm.read_factory_settings(use_empty=True)
+                except Exception:
+                    payload = {"reports": [], "error": traceback.format_exc(limit=5)}
+                blob = "\n%s\n%s\n%s\n" % (JSON_BEGIN, json.dumps(payload), JSON_END)
+                conn.settimeout(REQUEST_READ_SECONDS)
+                try:
+                    conn.sendall(blob.encode("utf-8"))
+                except OSError:
+                    pass
+    finally:
+        server.close()
+        try:
+            with open(state_path, "r", encoding="utf-8") as fh:
+                mine = json.load(fh).get("token") == token
+            if mine:
+                os.remove(state_path)
+        except (OSError, ValueError):
+            pass
 
 
 def _emit(payload):
@@ -1,8 +1,11 @@
 """LibraryPublisher CLI - the single entry point every trigger funnels through.
 
-    python source/cli.py status
-    python source/cli.py publish [--force] [--dry-run] [--enforce-branch]
+    python source/cli.py status [--rehash] [--events out.jsonl]
+    python source/cli.py publish [--force] [--dry-run] [--enforce-branch] [--rehash]
+                                 [--events out.jsonl]
     python source/cli.py check
+    python source/cli.py history [DEST] [--diff OLD [NEW]] [--limit N]
+    python source/cli.py watch [--dry-run]
     python source/cli.py config init | show | set | validate | doctor
     python source/cli.py install-hooks | uninstall-hooks
 
@@ -19,7 +22,7 @@ import sys
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from core import config, criteria, publish, selection, shell  # noqa: E402
+from core import config, criteria, history, publish, selection, shell, watch  # noqa: E402
 
 TOOL_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -116,6 +119,12 @@ def _print_summary(cfg: dict) -> None:
         print("  %-6s %-18s %s" % (check.get("mode"), key, check.get("label", "")))
         print("         applies to: %s" % (check.get("applies_to") or []))
     print("")
+    print("blender         : %s  (workers %s, %ss per file, python reader %s)" % (
+        cfg["blender"].get("executable") or "<auto-detect>",
+        cfg["blender"].get("workers"), cfg["blender"].get("timeout_per_file"),
+        _onoff(cfg["blender"].get("python_reader", True)),
+    ))
+    print("")
     print("triggers")
     trig = cfg["triggers"]
     print("  manual        : %s" % _onoff(trig["manual"].get("enabled")))
@@ -253,7 +262,10 @@ def cmd_status(args) -> int:
     """What *would* be published, plus the diff - never delivers anything."""
     cfg = _load(args)
     cfg["delivery"]["dry_run"] = True
-    result = publish.publish(cfg, TOOL_ROOT, force=False, reason="status")
+    result = publish.publish(
+        cfg, TOOL_ROOT, force=False, reason="status", rehash=args.rehash,
+        events=args.events,
+    )
     print("\n".join(result.lines))
     return 0 if result.ok else 1
 
@@ -284,13 +296,72 @@ def cmd_check(args) -> int:
     if not verdict.ran:
         print("criteria did not run: %s" % verdict.inspect_error)
         return 1
-    print("inspected %d file(s)" % len(inspected))
+    print("inspected %d file(s)%s" % (
+        len(inspected), " (%d from cache)" % verdict.cached if verdict.cached else ""
+    ))
     print(criteria.format_report(verdict, show_pass=args.verbose))
     print("")
     print("%d failure(s), %d warning(s)" % (len(verdict.failures()), len(verdict.warnings())))
     return 1 if verdict.failures() else 0
 
 
+def cmd_history(args) -> int:
+    """Past publishes, one file's change history, or a diff between two runs."""
+    path = os.path.join(TOOL_ROOT, publish.CACHE_DIRNAME, history.HISTORY_FILENAME)
+    if not os.path.isfile(path):
+        print("no publish history yet (%s)" % path)
+        return 1
+    hist = history.History(path)
+    try:
+        if args.diff:
+            if len(args.diff) > 2:
+                print("--diff takes one or two publish ids")
+                return 2
+            old = args.diff[0]
+            new = args.diff[1] if len(args.diff) > 1 else hist.publishes(
+                hist.manifest(old).get("destination", ""), limit=1
+            )[0].id
+            change = hist.diff_publishes(old, new)
+            print("publish #%d -> #%d: %s" % (old, new, change.summary()))
+            for mark, dests in (("+", change.added), ("~", change.changed), ("-", change.removed)):
+                for dest in dests:
+                    print("  %s %s" % (mark, dest))
+            return 0
+        if args.dest:
+            changes = hist.file_history(args.dest)
+            if not changes:
+                print("%s was never published" % args.dest)
+                return 1
+            for c in changes:
+                print("#%-5d %s  %-9s %s  %s" % (
+                    c.publish.id, c.publish.generated_utc, c.publish.commit[:9] or "-",
+                    ("%s  %d bytes" % (c.sha256[:12], c.size)) if c.sha256 else "removed",
+                    c.publish.destination,
+                ))
+            return 0
+        for p in hist.publishes(limit=args.limit):
+            print("#%-5d %s  %-9s %-10s %5d file(s)  %-14s %s" % (
+                p.id, p.generated_utc, p.commit[:9] or "-", p.branch or "-", p.files,
+                p.reason or "-", p.destination,
+            ))
+        return 0
+    except history.HistoryError as exc:
+        print("history unavailable: %s" % exc)
+        return 1
+
+
+def cmd_watch(args) -> int:
+    """Stay running and publish every burst of saves (Ctrl+C to stop)."""
+    cfg = _load(args)
+    problems = config.validate(cfg)
+    if problems:
+        print("config problems:")
+        for problem in problems:
+            print("  - %s" % problem)
+        return 1
+    return watch.run(cfg, TOOL_ROOT, out=lambda text: print(text, flush=True))
+
+
 def cmd_publish(args) -> int:
     cfg = _load(args)
     result = publish.publish(
@@ -298,8 +369,14 @@ def cmd_publish(args) -> int:
         force=args.force,
         enforce_branch=args.enforce_branch,
         reason=args.reason,
+        rehash=args.rehash,
+        events=args.events,
     )
     print("\n".join(result.lines))
+    if result.stages:
+        print("\nstage timings:")
+        for line in publish.format_stages(result.stages):
+            print("  " + line)
     if not result.ok:
         return 1
     if result.skipped_files:
@@ -341,7 +418,7 @@ def cmd_hook(args) -> int:
     log_path = os.path.join(log_dir, "hook.log")
 
     if hook_cfg.get("background") and not args.foreground:
-        _spawn_detached(
+        shell.spawn_detached(
             [sys.executable, os.path.abspath(__file__), "publish",
              "--enforce-branch", "--reason", args.event],
             log_path,
@@ -362,22 +439,6 @@ def cmd_hook(args) -> int:
     return 0
 
 
-def _spawn_detached(cmd: list, log_path: str) -> None:
-    """Fire and forget, so a slow Drive upload never holds up a git push."""
-    import subprocess
-
-    kwargs = {}
-    if os.name == "nt":
-        kwargs["creationflags"] = (
-            getattr(subprocess, "DETACHED_PROCESS", 0)
-            | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
-        )
-    else:
-        kwargs["start_new_session"] = True
-    with open(log_path, "w", encoding="utf-8") as log:
-        subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT, **kwargs)
-
-
 def cmd_install_hooks(args) -> int:
     return _hooks(install=True)
 
@@ -424,15 +485,34 @@ def build_parser() -> argparse.ArgumentParser:
     pub.add_argument("--enforce-branch", action="store_true",
                      help="honour triggers.git_hook.branches and skip on other branches")
     pub.add_argument("--reason", default="manual", help="what triggered this run")
+    pub.add_argument("--rehash", action="store_true",
+                     help="ignore the hash cache and re-read every selected file")
+    pub.add_argument("--events", default="", metavar="FILE",
+                     help="append JSON-lines stage/log events to FILE as they happen")
     pub.set_defaults(func=cmd_publish)
 
     sta = sub.add_parser("status", help="show what would be published, with the diff")
+    sta.add_argument("--rehash", action="store_true",
+                     help="ignore the hash cache and re-read every selected file")
+    sta.add_argument("--events", default="", metavar="FILE",
+                     help="append JSON-lines stage/log events to FILE as they happen")
     sta.set_defaults(func=cmd_status)
 
     chk = sub.add_parser("check", help="run the criteria checks only")
     chk.add_argument("--verbose", action="store_true", help="list passing files too")
     chk.set_defaults(func=cmd_check)
 
+    his = sub.add_parser("history", help="list past publishes or one file's history")
+    his.add_argument("dest", nargs="?", default="",
+                     help="a published path, e.g. Geonodes/GN_Bend.blend")
+    his.add_argument("--diff", type=int, nargs="+", metavar="ID",
+                     help="diff publish OLD against NEW (default: the latest to the same place)")
+    his.add_argument("--limit", type=int, default=20)
+    his.set_defaults(func=cmd_history)
+
+    wat = sub.add_parser("watch", help="publish each burst of saves as it happens")
+    wat.set_defaults(func=cmd_watch)
+
     cfg_p = sub.add_parser("config", help="inspect or edit the config")
     cfg_sub = cfg_p.add_subparsers(dest="config_command", required=True)
 
@@ -11,6 +11,7 @@ from __future__ import annotations
 import copy
 import json
 import os
+import re
 from typing import Any
 
 SCHEMA_VERSION = 1
@@ -107,12 +108,32 @@ def default_config(repo_root: str = "") -> dict:
                 # Shared Drive id (rclone --drive-team-drive). Optional when the
                 # remote itself is already scoped to the Shared Drive.
                 "team_drive": "",
+                # Transfer only the manifest diff (--files-from + targeted
+                # deletes) when the drive's manifest matches our baseline.
+                # Otherwise, and with --force, a full checksum sync runs.
+                "delta": True,
+                # Delta uploads go in runs of this many files; each finished run
+                # is journaled, so a killed publish resumes after the last one.
+                # 0 => one run for the whole change set.
+                "batch_files": 50,
+            },
+            "local": {
+                "path": "",
+                # Copy threads for the `copy` backend. 0 => one per core, capped at 8.
+                "workers": 0,
             },
-            "local": {"path": ""},
             # Publish into <dest>.staging then swap, so nobody opens a half-copy.
             "atomic": True,
             "delete_extraneous": True,
             "dry_run": False,
+            # Record each file an rclone delta delivery confirms as it lands, so
+            # a publish killed mid-delivery resumes with only the remainder.
+            "journal": True,
+            # Extra destinations fed from the same select/check/stage pass, in
+            # parallel. Each is {"name": ..., <any delivery.* key to override>},
+            # e.g. {"name": "nas", "backend": "copy", "local": {"path": "N:/lib"}}.
+            # Empty => the settings above are the one and only destination.
+            "targets": [],
         },
         "criteria": {
             "geonode_layout": {
@@ -177,6 +198,13 @@ def default_config(repo_root: str = "") -> dict:
                 ],
             },
             "blender_button": {"enabled": True, "refresh_after": True},
+            # `cli.py watch`: publish each burst of saves as it happens.
+            "watch": {
+                "backend": "auto",            # auto | inotify | poll
+                "debounce_seconds": 2.0,      # quiet time that ends a burst
+                "max_delay_seconds": 20.0,    # publish a long burst anyway
+                "poll_interval": 2.0,         # rescan period for the poll backend
+            },
         },
         "manifest": {
             "enabled": True,
@@ -184,10 +212,29 @@ def default_config(repo_root: str = "") -> dict:
             "incremental": True,
             "write_version_txt": True,
             "write_readme": True,
+            # Parallel hashing threads. 0 => one per core, capped at 8.
+            "hash_workers": 0,
+            # Record every delivered manifest in .last_publish/history.sqlite
+            # (`history` command); also serves as the indexed diff baseline.
+            "history": True,
         },
         "blender": {
             # Empty => auto-detect the highest installed Blender.
             "executable": "",
+            # Concurrent headless Blender processes for the criteria pass. Each
+            # one holds a full Blender in memory, so raise this with care.
+            "workers": 1,
+            # A shard is killed after this many seconds per file it was given,
+            # so one hung .blend cannot stall the whole publish.
+            "timeout_per_file": 300,
+            # Keep headless Blender(s) running between criteria passes, so
+            # repeated `check` runs skip Blender's startup cost. A daemon exits
+            # by itself after idle_timeout seconds without work.
+            "daemon": {"enabled": False, "idle_timeout": 900},
+            # Read asset, catalog and library facts straight from the .blend
+            # (core/blendfile.py) so only the geonode_layout audit launches
+            # Blender. Files the reader cannot parse still go to Blender.
+            "python_reader": True,
         },
     }
 
@@ -289,13 +336,34 @@ def validate(cfg: dict) -> list:
                 problems.append("catalog.rename entry needs non-empty from/to: %r" % (rule,))
 
     dely = cfg.get("delivery", {})
-    backend = dely.get("backend")
-    if backend not in BACKENDS:
-        problems.append("delivery.backend must be one of %s, got %r" % (BACKENDS, backend))
-    if backend == "rclone" and not dely.get("rclone", {}).get("remote"):
-        problems.append("delivery.rclone.remote is empty - run /publish-library-config")
-    if backend in ("robocopy", "copy") and not dely.get("local", {}).get("path"):
-        problems.append("delivery.local.path is empty but backend is %s" % backend)
+    targets = dely.get("targets") or []
+    if not isinstance(targets, list) or not all(isinstance(t, dict) for t in targets):
+        problems.append("delivery.targets must be a list of objects")
+    elif not targets:
+        problems.extend(_delivery_problems(dely, "delivery"))
+    else:
+        names = [t.get("name") for t in targets]
+        if not all(names) or len(set(map(repr, names))) != len(names):
+            problems.append("every delivery.targets entry needs a unique, non-empty name")
+        bad = [n for n in names if n and not _is_target_name(n)]
+        for name in bad:
+            problems.append(
+                "delivery.targets name %r must be letters, digits, '_', '-' or '.' "
+                "(it names the target's cache and staging folders)" % (name,)
+            )
+        if not bad:
+            places = {}
+            for name, target_cfg in delivery_targets(cfg):
+                problems.extend(_delivery_problems(
+                    target_cfg["delivery"], "delivery.targets[%s]" % name
+                ))
+                place = _delivery_place(target_cfg["delivery"])
+                if place in places:
+                    problems.append(
+                        "delivery.targets '%s' and '%s' deliver to the same place"
+                        % (places[place], name)
+                    )
+                places.setdefault(place, name)
 
     for key, check in cfg.get("criteria", {}).items():
         mode = check.get("mode")
@@ -312,13 +380,96 @@ def validate(cfg: dict) -> list:
     if on_block not in ON_BLOCK:
         problems.append("criteria_policy.on_block must be one of %s, got %r" % (ON_BLOCK, on_block))
 
+    blender = cfg.get("blender", {})
+    for key in ("workers", "timeout_per_file"):
+        value = blender.get(key)
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            problems.append("blender.%s must be a positive integer, got %r" % (key, value))
+
+    idle = blender.get("daemon", {}).get("idle_timeout")
+    if not isinstance(idle, int) or isinstance(idle, bool) or idle < 1:
+        problems.append("blender.daemon.idle_timeout must be a positive integer, got %r" % (idle,))
+
+    workers = cfg.get("manifest", {}).get("hash_workers", 0)
+    if not isinstance(workers, int) or isinstance(workers, bool) or workers < 0:
+        problems.append("manifest.hash_workers must be 0 (auto) or a positive integer")
+
+    copiers = dely.get("local", {}).get("workers", 0)
+    if not isinstance(copiers, int) or isinstance(copiers, bool) or copiers < 0:
+        problems.append("delivery.local.workers must be 0 (auto) or a positive integer")
+
     hook = cfg.get("triggers", {}).get("git_hook", {})
     if hook.get("enabled") and hook.get("hook") not in ("pre-push", "post-commit"):
         problems.append("triggers.git_hook.hook must be pre-push or post-commit")
 
+    watch = cfg.get("triggers", {}).get("watch", {})
+    if watch.get("backend", "auto") not in ("auto", "inotify", "poll"):
+        problems.append("triggers.watch.backend must be auto, inotify or poll")
+    for key in ("debounce_seconds", "max_delay_seconds", "poll_interval"):
+        value = watch.get(key, 1)
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value <= 0:
+            problems.append("triggers.watch.%s must be a positive number" % key)
+
+    return problems
+
+
+def _delivery_problems(dely: dict, where: str) -> list:
+    problems = []
+    backend = dely.get("backend")
+    if backend not in BACKENDS:
+        problems.append("%s.backend must be one of %s, got %r" % (where, BACKENDS, backend))
+    if backend == "rclone" and not dely.get("rclone", {}).get("remote"):
+        problems.append("%s.rclone.remote is empty - run /publish-library-config" % where)
+    if backend in ("robocopy", "copy") and not dely.get("local", {}).get("path"):
+        problems.append("%s.local.path is empty but backend is %s" % (where, backend))
+    batch = dely.get("rclone", {}).get("batch_files", 0)
+    if not isinstance(batch, int) or isinstance(batch, bool) or batch < 0:
+        problems.append("%s.rclone.batch_files must be a non-negative integer, got %r"
+                        % (where, batch))
     return problems
 
 
+_TARGET_NAME = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+def _is_target_name(name) -> bool:
+    return (isinstance(name, str) and name not in (".", "..")
+            and _TARGET_NAME.fullmatch(name) is not None)
+
+
+def _delivery_place(dely: dict) -> tuple:
+    """Where a delivery block writes, normalised so two spellings of one
+    folder (or two local backends on it) compare equal."""
+    if dely.get("backend") == "rclone":
+        rc = dely.get("rclone", {})
+        return ("rclone", rc.get("remote", ""), (rc.get("path") or "").strip("/"))
+    path = dely.get("local", {}).get("path", "")
+    return ("local", os.path.normcase(os.path.abspath(path)) if path else "")
+
+
+def delivery_targets(cfg: dict) -> list:
+    """[(name, cfg)] - one full config per destination.
+
+    Each `delivery.targets` entry is deep-filled from the `delivery` block it
+    sits in, so a target only spells out what differs. A dry run anywhere is a
+    dry run everywhere. Without targets this is just [("", cfg)].
+    """
+    dely = cfg.get("delivery", {})
+    targets = dely.get("targets") or []
+    if not targets:
+        return [("", cfg)]
+    base = {k: v for k, v in dely.items() if k != "targets"}
+    out = []
+    for target in targets:
+        merged = _deep_fill(
+            {k: copy.deepcopy(v) for k, v in target.items() if k != "name"}, base
+        )
+        merged["dry_run"] = bool(dely.get("dry_run")) or bool(target.get("dry_run"))
+        merged["targets"] = []
+        out.append((target.get("name", ""), dict(cfg, delivery=merged)))
+    return out
+
+
 # --- dotted-path get/set, so the config slash command can poke single keys ----
 
 def get_path(cfg: dict, dotted: str) -> Any:
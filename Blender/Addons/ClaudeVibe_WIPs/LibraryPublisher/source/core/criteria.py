@@ -20,6 +20,7 @@ interpreter function here.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 from typing import NamedTuple
@@ -30,6 +31,14 @@ BLENDER_CHECKS = ("geonode_layout", "asset_marked", "catalog_assigned", "no_exte
 JSON_BEGIN = "<<<ST3E_INSPECT_JSON>>>"
 JSON_END = "<<<ST3E_INSPECT_END>>>"
 
+INSPECT_CACHE_FILENAME = "inspect_cache.json"
+INSPECT_CACHE_SCHEMA_VERSION = 1
+
+# Per-file keys the driver echoes back from the batch. They describe WHERE a file
+# is published, not what is inside it, so they are stripped before caching and
+# restamped on the way out - the same bytes under two names share one entry.
+_PLACEMENT_KEYS = ("src", "dest", "scope")
+
 PASS = "pass"
 WARN = "warn"
 FAIL = "fail"
@@ -52,6 +61,8 @@ class Verdict(NamedTuple):
     blocked: set         # dest paths a `block`-mode check rejected
     ran: bool            # whether the inspection pass actually ran
     inspect_error: str   # non-empty if the Blender pass itself failed
+    cached: int = 0      # reports reused from the inspection cache
+    direct: int = 0      # reports read straight from the .blend, without Blender
 
     def problems(self) -> list:
         return [r for r in self.results if r.is_problem]
@@ -84,6 +95,16 @@ def mode_of(cfg: dict, key: str) -> str:
     return (cfg.get("criteria") or {}).get(key, {}).get("mode", "off")
 
 
+def needs_blender(cfg: dict, scope: str) -> bool:
+    """Whether an active check on `scope` needs a live Blender.
+
+    Only the layout audit does: it walks evaluated node trees through bpy. The
+    other checks read facts `core.blendfile` can take straight off the file.
+    """
+    conf = active_checks(cfg).get("geonode_layout")
+    return bool(conf) and scope in (conf.get("applies_to") or [])
+
+
 def files_to_inspect(cfg: dict, files: list) -> list:
     """The .blend files any active check applies to, deduped and sorted.
 
@@ -113,37 +134,182 @@ def files_to_inspect(cfg: dict, files: list) -> list:
     return unique
 
 
-def build_command(cfg: dict, blender_exe: str, driver: str, batch_file: str) -> list:
-    """The headless Blender command line for the inspection pass."""
-    return [
+def build_command(
+    cfg: dict, blender_exe: str, driver: str, batch_file: str, *, serve: str = ""
+) -> list:
+    """The headless Blender command line for the inspection pass.
+
+    With `serve` (a state-file path) the driver starts as a persistent
+    inspection daemon instead of running `batch_file` once.
+    """
+    cmd = [
         blender_exe,
         "--background",
         "--factory-startup",
         "--python",
         driver,
         "--",
-        batch_file,
     ]
+    if serve:
+        idle = (cfg.get("blender") or {}).get("daemon", {}).get("idle_timeout", 900)
+        return cmd + ["--serve", serve, str(idle)]
+    return cmd + [batch_file]
 
 
-def build_batch(cfg: dict, inspect_files: list, known_catalog_uuids: set) -> dict:
-    """The job description handed to the in-Blender driver."""
-    repo_root = cfg["source"]["repo_root"]
+def audit_module_dir(cfg: dict) -> str:
+    """Absolute path of the LLMGeonodePipeline folder, or "" if unset."""
     audit_dir = (
         (cfg.get("criteria") or {})
         .get("geonode_layout", {})
         .get("audit_module_dir", "")
     )
+    if not audit_dir:
+        return ""
+    return os.path.normpath(os.path.join(cfg["source"]["repo_root"], audit_dir))
+
+
+def build_batch(
+    cfg: dict, inspect_files: list, known_catalog_uuids: set, cached_reports: dict = None
+) -> dict:
+    """The job description handed to the in-Blender driver.
+
+    Files whose dest is already in `cached_reports` are left out: Blender only
+    ever opens the cache misses.
+    """
+    cached_reports = cached_reports or {}
     return {
-        "files": [{"src": f.src, "dest": f.dest, "scope": f.scope} for f in inspect_files],
+        "files": [
+            {"src": f.src, "dest": f.dest, "scope": f.scope}
+            for f in inspect_files
+            if f.dest not in cached_reports
+        ],
         "checks": sorted(active_checks(cfg)),
-        "audit_module_dir": (
-            os.path.normpath(os.path.join(repo_root, audit_dir)) if audit_dir else ""
-        ),
+        "audit_module_dir": audit_module_dir(cfg),
         "known_catalog_uuids": sorted(known_catalog_uuids),
     }
 
 
+def plan_shards(inspect_files: list, workers: int) -> list:
+    """Split files into at most `workers` shards of roughly equal total bytes.
+
+    Largest-first greedy assignment onto the lightest shard, so one heavy .blend
+    does not end up queued behind several others. Ties break on dest, which
+    keeps the plan identical from run to run; empty shards are dropped.
+    """
+    count = max(1, min(int(workers or 1), len(inspect_files)))
+    shards = [[] for _ in range(count)]
+    loads = [0] * count
+    for item in sorted(inspect_files, key=lambda f: (-f.size, f.dest.lower())):
+        slot = min(range(count), key=lambda i: (loads[i], i))
+        shards[slot].append(item)
+        loads[slot] += item.size
+    return [sorted(shard, key=lambda f: f.src.lower()) for shard in shards if shard]
+
+
+def merge_shard_payloads(batches: list, outcomes: list) -> dict:
+    """Combine per-shard driver payloads into one.
+
+    `outcomes` pairs with `batches`: (payload, "") for a shard that reported, or
+    (None, reason) for one that crashed or timed out. Files of a failed shard
+    come back as per-file inspection errors, so one hung file costs its own
+    shard rather than the whole verdict.
+    """
+    reports = []
+    audit_error = ""
+    for batch, (payload, error) in zip(batches, outcomes):
+        if payload is None:
+            for item in batch.get("files") or []:
+                reports.append(dict(item, error="inspection shard failed: %s" % error))
+            continue
+        reports.extend(payload.get("reports") or [])
+        audit_error = audit_error or payload.get("audit_error") or ""
+    reports.sort(key=lambda r: (r.get("dest") or "").lower())
+    return {"reports": reports, "audit_error": audit_error}
+
+
+# --- inspection cache ----------------------------------------------------------
+
+def inspect_context(cfg: dict, known_catalog_uuids: set, driver_sha256: str,
+                    audit_sha256: str = "") -> str:
+    """Everything besides file content that can change what the driver reports.
+
+    A report is only reusable while the active check set, the known catalog
+    UUIDs, the driver script and (for geonode_layout) the audit module are all
+    exactly what they were when it was produced.
+    """
+    blob = json.dumps({
+        "checks": sorted(active_checks(cfg)),
+        "known_catalog_uuids": sorted(known_catalog_uuids),
+        "driver": driver_sha256,
+        "audit": audit_sha256,
+    }, sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def inspect_key(file_sha256: str, context: str) -> str:
+    return "%s:%s" % (file_sha256, context)
+
+
+class InspectCache:
+    """Raw per-file driver reports, keyed by content hash + inspection context.
+
+    Stores facts, never verdicts: `interpret` re-applies the current warn/block
+    policy on every run, so flipping a check from warn to block needs no fresh
+    Blender pass. A missing or corrupt cache only costs a re-inspection.
+    """
+
+    def __init__(self, path: str = ""):
+        self.path = path
+        self._entries = _load_inspect_cache(path) if path else {}
+        self._kept = {}
+
+    def get(self, key: str, item) -> dict:
+        """The cached report for `item` (a SelectedFile), or None."""
+        report = self._entries.get(key)
+        if not isinstance(report, dict):
+            return None
+        self._kept[key] = report
+        out = dict(report)
+        out.update({"src": item.src, "dest": item.dest, "scope": item.scope})
+        return out
+
+    def put(self, key: str, report: dict) -> None:
+        # A file that could not be opened may open fine next time (locked by a
+        # running Blender, half-synced by Drive), so failures are never cached.
+        if report.get("error"):
+            return
+        self._kept[key] = {k: v for k, v in report.items() if k not in _PLACEMENT_KEYS}
+
+    def save(self) -> None:
+        """Persist only the entries used or produced this run."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"schema_version": INSPECT_CACHE_SCHEMA_VERSION,
+                 "entries": dict(sorted(self._kept.items()))},
+                fh,
+            )
+            fh.write("\n")
+        os.replace(tmp, self.path)
+
+
+def _load_inspect_cache(path: str) -> dict:
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("schema_version") != INSPECT_CACHE_SCHEMA_VERSION:
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
 def extract_json(stdout: str) -> dict:
     """Pull the JSON payload out of Blender's chatty stdout.
 
@@ -257,14 +423,24 @@ def _interpret_geonode_layout(report: dict, conf: dict) -> list:
     return out
 
 
-def interpret(cfg: dict, payload: dict, known_catalog_uuids: set) -> Verdict:
-    """Turn the driver's raw facts into results, then apply block/warn policy."""
+def interpret(
+    cfg: dict, payload: dict, known_catalog_uuids: set, cached_reports: dict = None
+) -> Verdict:
+    """Turn the driver's raw facts into results, then apply block/warn policy.
+
+    `cached_reports` (dest -> report) are merged with the fresh payload, so a
+    run that reused every report reads exactly like one that inspected them all.
+    """
     criteria_cfg = cfg.get("criteria") or {}
     on_block = (cfg.get("criteria_policy") or {}).get("on_block", "skip_file")
     results = []
     blocked = set()
 
-    for report in payload.get("reports") or []:
+    cached_reports = cached_reports or {}
+    reports = list(payload.get("reports") or []) + list(cached_reports.values())
+    reports.sort(key=lambda r: (r.get("dest") or "").lower())
+
+    for report in reports:
         dest = report.get("dest", "?")
         scope = report.get("scope", "")
 
@@ -303,7 +479,7 @@ def interpret(cfg: dict, payload: dict, known_catalog_uuids: set) -> Verdict:
                 if mode == "block" and res.status == FAIL:
                     blocked.add(dest)
 
-    return Verdict(results, blocked, True, "")
+    return Verdict(results, blocked, True, "", len(cached_reports))
 
 
 def skipped_verdict(reason: str = "") -> Verdict:
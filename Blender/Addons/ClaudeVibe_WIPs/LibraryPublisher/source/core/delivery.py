@@ -6,6 +6,9 @@ Two steps, deliberately separate:
    where the filesystem allows it, so staging 66 .blend files costs no bytes and
    no time. Staging the *whole* tree (not just changed files) is what lets the
    transfer step use a mirroring sync without deleting everything it cannot see.
+   The tree persists between runs and is reconciled entry by entry against an
+   index of what it holds, so where hardlinks are unavailable a publish copies
+   only the change set rather than the whole library.
 
 2. **Deliver** - hand the staging tree to a backend:
      rclone   - straight to a Shared Drive, service-account friendly, works in CI
@@ -14,15 +17,34 @@ Two steps, deliberately separate:
 
    Incrementality lives here: rclone/robocopy compare and skip unchanged files.
    The manifest diff decides whether to bother calling a backend at all.
+
+3. **Journal** - while an rclone delta delivery runs, every file confirmed at
+   the destination is appended to a journal. The cached manifest is only
+   replaced once the whole delivery succeeded, so after a killed run the next
+   publish diffs against the old baseline again; the journal is what lets it
+   skip what already landed. The local backends compare the trees themselves
+   and need no journal.
 """
 
 from __future__ import annotations
 
+import errno
+import json
 import os
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import NamedTuple
 
-from . import shell
+from . import manifest, shell
+
+# Sibling of the staging dir (never inside it - the whole tree is delivered):
+# dest path -> {"sha256", "size"} for every entry the tree currently holds.
+STAGING_INDEX_SUFFIX = ".index.json"
+
+# Beside the cached manifest: what an unfinished delivery already put in place.
+JOURNAL_FILENAME = "delivery_journal.jsonl"
+JOURNAL_VERSION = 1
 
 
 class StagingResult(NamedTuple):
@@ -31,6 +53,15 @@ class StagingResult(NamedTuple):
     linked: int
     generated: int
     errors: list
+    kept: int = 0      # entries already staged with the right content
+    removed: int = 0   # stale entries dropped from the tree
+
+
+class Delta(NamedTuple):
+    """What an incremental rclone delivery touches, as dest-relative paths."""
+    upload: list   # new/changed files plus the small generated ones
+    remove: list   # files the new manifest no longer lists
+    last: list     # uploaded only once everything else succeeded (the manifest)
 
 
 class DeliveryResult(NamedTuple):
@@ -51,42 +82,247 @@ def _link_or_copy(src: str, dst: str) -> str:
         return "copied"
 
 
-def build_staging(files: list, generated: dict, staging_root: str) -> StagingResult:
+def build_staging(
+    files: list, generated: dict, staging_root: str, *, hashes: dict = None
+) -> StagingResult:
     """Assemble the full published tree at `staging_root`.
 
     `files` are SelectedFile records; `generated` maps a destination-relative path
     to text content (the rewritten catalog, README, manifest).
+
+    With `hashes` (dest -> sha256, i.e. the new manifest) the existing tree is
+    reconciled instead of rebuilt: entries whose recorded hash and on-disk size
+    still match are kept, the rest are re-linked or re-copied, and stale ones are
+    removed. Only touched entries are verified - by size, and by hash when they
+    had to be copied. Without `hashes`, or with no usable index, it starts over.
     """
-    if os.path.isdir(staging_root):
-        shutil.rmtree(staging_root, ignore_errors=True)
+    index_path = staging_root.rstrip("/\\") + STAGING_INDEX_SUFFIX
+    sources = {item.dest: item for item in files}
+    payloads = {dest: text.encode("utf-8") for dest, text in (generated or {}).items()}
+
+    wanted = {}
+    for item in files:
+        wanted[item.dest] = {"sha256": (hashes or {}).get(item.dest, ""), "size": item.size}
+    for dest, data in payloads.items():
+        wanted[dest] = {"sha256": manifest.hash_bytes(data), "size": len(data)}
+
+    previous = None
+    if hashes is not None and os.path.isdir(staging_root):
+        previous = _load_index(index_path)
+    if previous is None:
+        if os.path.isdir(staging_root):
+            shutil.rmtree(staging_root, ignore_errors=True)
+        previous = {}
     os.makedirs(staging_root, exist_ok=True)
+    # Drop the index while the tree is in flux: a crash mid-way must force a
+    # full rebuild next time rather than trust a half-updated tree.
+    _remove_quietly(index_path)
+
+    change = manifest.diff({"files": previous}, {"files": wanted})
+    touched = list(change.added) + list(change.changed)
+    kept = 0
+    for dest in change.unchanged:
+        dst = _staged_path(staging_root, dest)
+        try:
+            intact = os.path.getsize(dst) == wanted[dest]["size"]
+        except OSError:
+            intact = False
+        if intact and wanted[dest]["sha256"]:
+            kept += 1
+        else:
+            touched.append(dest)
 
-    copied = linked = 0
+    removed = 0
+    for dest in change.removed:
+        dst = _staged_path(staging_root, dest)
+        if os.path.lexists(dst):
+            _remove_quietly(dst)
+            removed += 1
+            _prune_empty_parents(os.path.dirname(dst), staging_root)
+
+    copied = linked = written = 0
     errors = []
-
-    for item in files:
-        dst = os.path.join(staging_root, item.dest.replace("/", os.sep))
+    for dest in sorted(touched):
+        dst = _staged_path(staging_root, dest)
         os.makedirs(os.path.dirname(dst), exist_ok=True)
+        _remove_quietly(dst)
+        expect = wanted[dest]
         try:
-            how = _link_or_copy(item.src, dst)
+            if dest in payloads:
+                with open(dst, "wb") as fh:
+                    fh.write(payloads[dest])
+                written += 1
+                continue
+            how = _link_or_copy(sources[dest].src, dst)
         except OSError as exc:
-            errors.append("staging %s: %s" % (item.dest, exc))
+            errors.append("staging %s: %s" % (dest, exc))
             continue
         if how == "linked":
             linked += 1
         else:
             copied += 1
+        problem = _verify_staged(dst, expect, check_hash=how == "copied")
+        if problem:
+            errors.append("staging %s: %s" % (dest, problem))
 
-    for dest, content in sorted((generated or {}).items()):
-        dst = os.path.join(staging_root, dest.replace("/", os.sep))
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if not errors:
+        _save_index(index_path, wanted)
+    return StagingResult(staging_root, copied, linked, written, errors, kept, removed)
+
+
+def _staged_path(staging_root: str, dest: str) -> str:
+    return os.path.join(staging_root, dest.replace("/", os.sep))
+
+
+def _verify_staged(path: str, expect: dict, *, check_hash: bool) -> str:
+    """"" if `path` holds what the manifest says it should, else the reason.
+
+    A hardlink shares the source's inode, so its size is the whole story; a copy
+    is re-read and hashed because that is where a short write would hide.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError as exc:
+        return "cannot verify: %s" % exc
+    if size != expect["size"]:
+        return "size %d, expected %d" % (size, expect["size"])
+    if check_hash and expect.get("sha256") and manifest.hash_file(path) != expect["sha256"]:
+        return "content hash does not match the manifest"
+    return ""
+
+
+def _load_index(path: str):
+    """The staging index, or None when absent or unreadable (=> full rebuild)."""
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _save_index(path: str, entries: dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dict(sorted(entries.items())), fh, indent=1)
+    os.replace(tmp, path)
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _prune_empty_parents(path: str, stop: str) -> None:
+    stop = os.path.abspath(stop)
+    path = os.path.abspath(path)
+    while path != stop and path.startswith(stop):
         try:
-            with open(dst, "w", encoding="utf-8", newline="\n") as fh:
-                fh.write(content)
-        except OSError as exc:
-            errors.append("writing %s: %s" % (dest, exc))
+            os.rmdir(path)
+        except OSError:
+            return
+        path = os.path.dirname(path)
+
+
+# --- resumable delivery journal ----------------------------------------------
 
-    return StagingResult(staging_root, copied, linked, len(generated or {}), errors)
+class Journal:
+    """Append-only record of what one delivery confirmed at `destination`.
+
+    One JSON line per confirmation: {"dest", "sha256"} for a file that landed,
+    {"dest", "removed": true} for one deleted. Lines are flushed and fsynced as
+    they are written, so a kill loses at most the file in flight. A journal for
+    another destination, or from another journal version, is ignored, and a torn
+    last line is dropped. `clear()` once the delivery is complete.
+    """
+
+    def __init__(self, path: str, destination: str):
+        self.path = path
+        self.destination = destination
+        self._lock = threading.Lock()
+        self._started = False     # the file on disk is ours to append to
+        self._confirmed, self._removed = self._load()
+
+    def _load(self):
+        confirmed, removed = {}, set()
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+        except OSError:
+            return confirmed, removed
+        try:
+            header = json.loads(lines[0]) if lines else {}
+        except ValueError:
+            header = {}
+        if (not isinstance(header, dict) or header.get("version") != JOURNAL_VERSION
+                or header.get("destination") != self.destination):
+            return confirmed, removed
+        self._started = True
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+                dest = entry["dest"]
+            except (ValueError, KeyError, TypeError):
+                continue
+            if entry.get("removed"):
+                removed.add(dest)
+                confirmed.pop(dest, None)
+            else:
+                confirmed[dest] = entry.get("sha256", "")
+                removed.discard(dest)
+        return confirmed, removed
+
+    def __len__(self) -> int:
+        return len(self._confirmed) + len(self._removed)
+
+    def landed(self, dest: str, sha256: str) -> bool:
+        """True if this exact content was already confirmed at `dest`."""
+        return bool(sha256) and self._confirmed.get(dest) == sha256
+
+    def gone(self, dest: str) -> bool:
+        return dest in self._removed
+
+    def touched(self) -> set:
+        """Every dest this journal confirmed as landed or removed."""
+        return set(self._confirmed) | self._removed
+
+    def confirm(self, items) -> None:
+        """Record [(dest, sha256)] as delivered."""
+        self._append([{"dest": d, "sha256": h} for d, h in items if h])
+
+    def confirm_removed(self, dests) -> None:
+        self._append([{"dest": d, "removed": True} for d in dests])
+
+    def _append(self, entries: list) -> None:
+        if not entries:
+            return
+        with self._lock:
+            fresh = not self._started
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "w" if fresh else "a", encoding="utf-8") as fh:
+                if fresh:
+                    fh.write(json.dumps({
+                        "version": JOURNAL_VERSION, "destination": self.destination
+                    }) + "\n")
+                fh.write("".join(json.dumps(e, sort_keys=True) + "\n" for e in entries))
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._started = True
+            for entry in entries:
+                if entry.get("removed"):
+                    self._removed.add(entry["dest"])
+                    self._confirmed.pop(entry["dest"], None)
+                else:
+                    self._confirmed[entry["dest"]] = entry["sha256"]
+                    self._removed.discard(entry["dest"])
+
+    def clear(self) -> None:
+        with self._lock:
+            _remove_quietly(self.path)
+            self._started = False
+            self._confirmed, self._removed = {}, set()
 
 
 # --- backends ----------------------------------------------------------------
@@ -105,7 +341,6 @@ def _rclone_target(cfg: dict) -> str:
 
 def _rclone_command(cfg: dict, staging_root: str) -> list:
     dely = cfg["delivery"]
-    rc = dely["rclone"]
     verb = "sync" if dely.get("delete_extraneous") else "copy"
     cmd = [
         rclone_exe(cfg) or "rclone",
@@ -123,16 +358,109 @@ def _rclone_command(cfg: dict, staging_root: str) -> list:
         "--transfers", "6",
         "--checkers", "12",
     ]
+    return cmd + _rclone_common_flags(cfg)
+
+
+def _rclone_common_flags(cfg: dict) -> list:
+    dely = cfg["delivery"]
+    rc = dely["rclone"]
+    flags = []
     if dely.get("dry_run"):
-        cmd.append("--dry-run")
+        flags.append("--dry-run")
     if rc.get("team_drive"):
-        cmd += ["--drive-team-drive", rc["team_drive"]]
+        flags += ["--drive-team-drive", rc["team_drive"]]
     sa_env = rc.get("service_account_env") or ""
     sa_path = os.environ.get(sa_env, "") if sa_env else ""
     if sa_path:
-        cmd += ["--drive-service-account-file", sa_path]
-    cmd += list(rc.get("extra_flags") or [])
-    return cmd
+        flags += ["--drive-service-account-file", sa_path]
+    return flags + list(rc.get("extra_flags") or [])
+
+
+def _rclone_delta_commands(
+    cfg: dict, staging_root: str, delta: Delta, batch: int = 0
+) -> list:
+    """(label, argv, list file, paths) per step of a change-set delivery.
+
+    Every step names its files explicitly via --files-from, and --no-traverse
+    stops rclone listing the remote tree, so the Drive API cost scales with the
+    change set rather than with the size of the library. With `batch`, uploads
+    are split into runs of that many files, each one a point the journal can
+    resume from.
+    """
+    exe = rclone_exe(cfg) or "rclone"
+    target = _rclone_target(cfg)
+    common = _rclone_common_flags(cfg)
+    scratch = staging_root.rstrip("/\\")
+    steps = []
+    upload = sorted(delta.upload)
+    size = batch if batch and batch > 0 else max(1, len(upload))
+    for start in range(0, len(upload), size):
+        listing = scratch + ".upload.txt"
+        steps.append(("upload", [
+            exe, "copy", staging_root, target, "--files-from", listing,
+            "--checksum", "--no-traverse", "--stats-one-line", "--stats", "10s",
+            "--transfers", "6",
+        ] + common, listing, upload[start:start + size]))
+    # Deletes only after every upload succeeded - the same guarantee the full
+    # sync gets from --delete-after.
+    if delta.remove:
+        listing = scratch + ".remove.txt"
+        steps.append(("delete", [
+            exe, "delete", target, "--files-from", listing,
+        ] + common, listing, delta.remove))
+    # The manifest goes last so the copy on the drive never describes files
+    # that failed to arrive; the next run trusts it as its baseline.
+    if delta.last:
+        listing = scratch + ".last.txt"
+        steps.append(("manifest", [
+            exe, "copy", staging_root, target, "--files-from", listing,
+            "--checksum", "--no-traverse",
+        ] + common, listing, delta.last))
+    return steps
+
+
+def _rclone_delta(
+    cfg: dict, staging_root: str, delta: Delta, hashes: dict = None, journal: Journal = None
+) -> DeliveryResult:
+    hashes = hashes or {}
+    resumed = 0
+    if journal is not None and len(journal):
+        upload = [d for d in delta.upload if not journal.landed(d, hashes.get(d, ""))]
+        remove = [d for d in delta.remove if not journal.gone(d)]
+        resumed = len(delta.upload) - len(upload) + len(delta.remove) - len(remove)
+        delta = delta._replace(upload=upload, remove=remove)
+    batch = int(cfg["delivery"]["rclone"].get("batch_files") or 0) if journal is not None else 0
+    commands = []
+    outputs = []
+    counts = {"upload": 0, "delete": 0, "manifest": 0}
+    for label, cmd, listing, paths in _rclone_delta_commands(cfg, staging_root, delta, batch):
+        with open(listing, "w", encoding="utf-8") as fh:
+            fh.write("".join("%s\n" % p for p in sorted(paths)))
+        commands.append(cmd)
+        res = shell.run(cmd, timeout=3600)
+        outputs.append((res.out + res.err).strip())
+        if not res.ok:
+            return DeliveryResult(
+                "rclone", False,
+                "rclone delta %s FAILED (exit %d): %s" % (
+                    label, res.code, (res.err or res.out).strip()[:400]),
+                commands, "\n".join(o for o in outputs if o),
+            )
+        counts[label] += len(paths)
+        if journal is not None and label == "upload":
+            journal.confirm((d, hashes.get(d, "")) for d in paths)
+        elif journal is not None and label == "delete":
+            journal.confirm_removed(paths)
+    done = ["%d %s" % (counts[label], "deleted" if label == "delete" else "uploaded")
+            for label in ("upload", "delete", "manifest") if counts[label]]
+    if resumed:
+        done.append("%d already delivered by an interrupted run" % resumed)
+    detail = "rclone %s -> %s (changed files only: %s)" % (
+        "dry-run" if cfg["delivery"].get("dry_run") else "delta",
+        _rclone_target(cfg),
+        ", ".join(done) or "nothing to do",
+    )
+    return DeliveryResult("rclone", True, detail, commands, "\n".join(o for o in outputs if o))
 
 
 def _robocopy_command(cfg: dict, staging_root: str, target: str) -> list:
@@ -152,54 +480,155 @@ def _robocopy_command(cfg: dict, staging_root: str, target: str) -> list:
     return cmd
 
 
-def _python_copy(cfg: dict, staging_root: str, target: str) -> DeliveryResult:
-    """Backend of last resort: shutil, with optional pruning."""
-    dry = bool(cfg["delivery"].get("dry_run"))
-    prune = bool(cfg["delivery"].get("delete_extraneous"))
-    moved = 0
-    removed = 0
+# copy2 carries mtimes over, but FAT/exFAT and many NAS shares store them at
+# 2 s resolution, so an exact comparison would re-copy everything every run.
+_MTIME_SLACK_NS = 2 * 10**9
 
-    wanted = set()
-    for root, _dirs, names in os.walk(staging_root):
-        for name in names:
-            src = os.path.join(root, name)
-            rel = os.path.relpath(src, staging_root)
-            wanted.add(rel)
-            dst = os.path.join(target, rel)
-            if dry:
-                moved += 1
+
+def _python_copy(cfg: dict, staging_root: str, target: str, hashes: dict = None) -> DeliveryResult:
+    """Backend of last resort: pure Python mirror, no external tool.
+
+    One scan of each tree; a destination file with the same size and mtime is
+    skipped, as is one whose size matches and whose content hashes to the
+    manifest's sha256 (its mtime is then corrected so the next run is a stat).
+    Copies keep their source mtime, so a killed run resumes on its own: what
+    already landed passes the size+mtime check.
+    Everything else is copied on a bounded thread pool. Pruning reuses the scan.
+    """
+    dely = cfg["delivery"]
+    dry = bool(dely.get("dry_run"))
+    prune = bool(dely.get("delete_extraneous"))
+    hashes = hashes or {}
+
+    wanted = _scan(staging_root)
+    present = _scan(target) if os.path.isdir(target) else {}
+
+    todo = []
+    skipped = 0
+    for rel, (size, mtime_ns) in sorted(wanted.items()):
+        have = present.get(rel)
+        if have and have[0] == size:
+            # The slack applies only where the target evidently stores whole
+            # seconds; elsewhere a same-size rewrite within 2 s must not pass.
+            coarse = have[1] % 10**9 == 0
+            if have[1] == mtime_ns or (coarse and abs(have[1] - mtime_ns) <= _MTIME_SLACK_NS):
+                skipped += 1
+                continue
+            sha = hashes.get(rel.replace(os.sep, "/"))
+            if sha and manifest.hash_file(os.path.join(target, rel)) == sha:
+                if not dry:
+                    os.utime(os.path.join(target, rel), ns=(mtime_ns, mtime_ns))
+                skipped += 1
                 continue
+        todo.append(rel)
+
+    stale = sorted(rel for rel in present if rel not in wanted) if prune else []
+    errors = []
+    if not dry:
+        def _one(rel):
+            dst = os.path.join(target, rel)
             os.makedirs(os.path.dirname(dst), exist_ok=True)
-            shutil.copy2(src, dst)
-            moved += 1
-
-    if prune and os.path.isdir(target):
-        for root, _dirs, names in os.walk(target):
-            for name in names:
-                dst = os.path.join(root, name)
-                rel = os.path.relpath(dst, target)
-                if rel not in wanted:
-                    removed += 1
-                    if not dry:
-                        try:
-                            os.remove(dst)
-                        except OSError:
-                            pass
-
-    verb = "would copy" if dry else "copied"
-    return DeliveryResult(
-        "copy", True,
-        "%s %d file(s), %s %d extraneous" % (verb, moved, "would remove" if dry else "removed", removed),
-        [], "",
+            _copy_file(os.path.join(staging_root, rel), dst)
+
+        workers = manifest.hash_workers(dely.get("local", {}).get("workers", 0))
+        with ThreadPoolExecutor(max_workers=min(workers, max(1, len(todo)))) as pool:
+            # Largest first, so one huge .blend does not become the tail.
+            ordered = sorted(todo, key=lambda rel: -wanted[rel][0])
+            for rel, fut in [(rel, pool.submit(_one, rel)) for rel in ordered]:
+                try:
+                    fut.result()
+                except OSError as exc:
+                    errors.append("%s: %s" % (rel, exc))
+        # Removals only after every copy succeeded, like rclone's --delete-after.
+        if not errors:
+            for rel in stale:
+                try:
+                    os.remove(os.path.join(target, rel))
+                except OSError:
+                    pass
+                _prune_empty_parents(os.path.dirname(os.path.join(target, rel)), target)
+
+    detail = "%s %d file(s), %d unchanged, %s %d extraneous" % (
+        "would copy" if dry else "copied", len(todo), skipped,
+        "would remove" if dry else "removed", len(stale) if not errors else 0,
     )
+    if errors:
+        detail += " FAILED: %s" % "; ".join(errors[:5])
+    return DeliveryResult("copy", not errors, detail, [], "")
 
 
-def _swap_in(staging_root: str, target: str, dry_run: bool) -> DeliveryResult:
+def _scan(root: str) -> dict:
+    """rel path -> (size, mtime_ns) for every file under `root`, one walk."""
+    found = {}
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        try:
+            entries = list(os.scandir(folder))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+            elif entry.is_file():
+                st = entry.stat()
+                found[os.path.relpath(entry.path, root)] = (st.st_size, st.st_mtime_ns)
+    return found
+
+
+def _copy_file(src: str, dst: str) -> None:
+    """copy2 semantics, via the kernel where it can, never a half-file at `dst`.
+
+    `os.copy_file_range` lets the kernel (or a NAS via server-side copy) move
+    the bytes without a trip through userspace; elsewhere `shutil.copyfile`
+    already picks sendfile / fcopyfile / CopyFile2 for the platform.
+    """
+    tmp = dst + ".lp_part"
+    try:
+        if not _copy_range(src, tmp):
+            shutil.copyfile(src, tmp)
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _copy_range(src: str, dst: str) -> bool:
+    """True if `dst` was written with copy_file_range; False to fall back."""
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is None:
+        return False
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        remaining = os.fstat(fin.fileno()).st_size
+        try:
+            while remaining > 0:
+                sent = copy_range(fin.fileno(), fout.fileno(), min(remaining, 1 << 30))
+                if sent == 0:
+                    break
+                remaining -= sent
+        except OSError:
+            # Cross-filesystem on old kernels, or unsupported by the FS.
+            return False
+        return remaining == 0
+
+
+def _swap_in(
+    staging_root: str, target: str, dry_run: bool, generated=()
+) -> DeliveryResult:
     """Atomic-ish local publish: move the new tree into place, then bin the old.
 
     Only used for local backends. On a mounted Google Drive the rename is
     server-side, so the visible window where the library is incomplete is
     milliseconds instead of the length of an upload.
+
+    The incoming tree is cloned from staging rather than copied: a reflink where
+    the filesystem has them, else a hardlink (staging replaces entries instead of
+    rewriting them, so the published file never changes under a user), and a
+    byte copy only for `generated` text files or when neither is possible.
     """
     parent = os.path.dirname(os.path.abspath(target))
     incoming = target + ".incoming"
@@ -210,16 +639,116 @@ def _swap_in(staging_root: str, target: str, dry_run: bool) -> DeliveryResult:
     for scratch in (incoming, retiring):
         if os.path.isdir(scratch):
             shutil.rmtree(scratch, ignore_errors=True)
-    shutil.copytree(staging_root, incoming)
+
+    generated = {dest.replace("/", os.sep) for dest in generated}
+    counts = {"reflinked": 0, "linked": 0, "copied": 0}
+    written = 0
+    # Each flips off for the rest of the run on its first "not supported here".
+    can_clone = {"reflink": True, "link": True}
+    for rel, (size, _mtime) in sorted(_scan(staging_root).items()):
+        src = os.path.join(staging_root, rel)
+        dst = os.path.join(incoming, rel)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        how = _clone(src, dst, can_clone) if rel not in generated else ""
+        if not how:
+            shutil.copy2(src, dst)
+            how = "copied"
+            written += size
+        counts[how] += 1
+
     if os.path.isdir(target):
         os.replace(target, retiring)
     os.replace(incoming, target)
     shutil.rmtree(retiring, ignore_errors=True)
-    return DeliveryResult("swap", True, "swapped new tree into %s" % target, [], "")
+    return DeliveryResult(
+        "swap", True,
+        "swapped new tree into %s (%d reflinked, %d hardlinked, %d copied; %s written)"
+        % (target, counts["reflinked"], counts["linked"], counts["copied"],
+           _human_bytes(written)),
+        [], "",
+    )
+
 
+def _clone(src: str, dst: str, can_clone: dict) -> str:
+    """"reflinked" / "linked" if `dst` now shares `src`'s data, else "".
 
-def deliver(cfg: dict, staging_root: str) -> DeliveryResult:
-    """Push the staging tree to the configured destination."""
+    A filesystem without reflinks (ext4, NTFS, ...) answers the first attempt
+    with "not supported"; later files go straight to the hardlink instead of
+    paying an open, a create, a failing ioctl and an unlink each.
+    """
+    if can_clone["reflink"]:
+        try:
+            if _reflink(src, dst):
+                return "reflinked"
+            can_clone["reflink"] = False      # no ioctl on this platform
+        except OSError as exc:
+            if getattr(exc, "errno", None) in _NO_REFLINK:
+                can_clone["reflink"] = False
+    if not can_clone["link"]:
+        return ""
+    try:
+        os.link(src, dst)
+        return "linked"
+    except OSError as exc:
+        if getattr(exc, "errno", None) == errno.EXDEV:
+            can_clone["link"] = False
+    except (NotImplementedError, AttributeError):
+        can_clone["link"] = False
+    return ""
+
+
+# Linux FICLONE ioctl: a copy-on-write clone on btrfs, XFS, bcachefs, ...
+_FICLONE = 0x40049409
+
+# What FICLONE answers when the filesystem (or the pair of them) cannot clone.
+_NO_REFLINK = frozenset(
+    code for code in (
+        getattr(errno, name, None)
+        for name in ("EOPNOTSUPP", "ENOTSUP", "EINVAL", "EXDEV", "ENOTTY")
+    ) if code is not None
+)
+
+
+def _reflink(src: str, dst: str) -> bool:
+    """True once `dst` is a clone of `src`; False where there is no FICLONE.
+    A failed attempt removes `dst` again and raises the OSError."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+    except OSError:
+        try:
+            os.remove(dst)
+        except OSError:
+            pass
+        raise
+    shutil.copystat(src, dst)
+    return True
+
+
+def _human_bytes(n: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if n < 1024 or unit == "GiB":
+            return ("%d %s" if unit == "B" else "%.1f %s") % (n, unit)
+        n /= 1024.0
+
+
+def deliver(
+    cfg: dict, staging_root: str, *, delta: Delta = None, hashes: dict = None,
+    generated=(), journal: Journal = None,
+) -> DeliveryResult:
+    """Push the staging tree to the configured destination.
+
+    With a `delta` the rclone backend transfers only the listed paths; without
+    one (or on a local backend, which compares for itself) the whole tree goes.
+    `hashes` (dest -> sha256) lets the `copy` backend recognise identical files
+    whose mtimes drifted; `generated` names the text files the atomic swap must
+    copy rather than link. A `journal` records what an rclone delta delivery
+    lands and skips what an interrupted one already confirmed.
+    """
     dely = cfg["delivery"]
     backend = dely.get("backend")
 
@@ -231,6 +760,8 @@ def deliver(cfg: dict, staging_root: str) -> DeliveryResult:
                 "or put it on PATH",
                 [], "",
             )
+        if delta is not None:
+            return _rclone_delta(cfg, staging_root, delta, hashes, journal)
         cmd = _rclone_command(cfg, staging_root)
         res = shell.run(cmd, timeout=3600)
         detail = "rclone %s -> %s" % (
@@ -246,7 +777,7 @@ def deliver(cfg: dict, staging_root: str) -> DeliveryResult:
         return DeliveryResult(backend or "?", False, "delivery.local.path is empty", [], "")
 
     if dely.get("atomic"):
-        return _swap_in(staging_root, target, bool(dely.get("dry_run")))
+        return _swap_in(staging_root, target, bool(dely.get("dry_run")), generated)
 
     if backend == "robocopy":
         cmd = _robocopy_command(cfg, staging_root, target)
@@ -258,4 +789,4 @@ def deliver(cfg: dict, staging_root: str) -> DeliveryResult:
             detail += " FAILED: %s" % (res.err or res.out).strip()[:400]
         return DeliveryResult("robocopy", ok, detail, cmd, (res.out + res.err).strip())
 
-    return _python_copy(cfg, staging_root, target)
+    return _python_copy(cfg, staging_root, target, hashes)
@@ -0,0 +1,266 @@
+"""Publish history: every delivered manifest, in an indexed SQLite file.
+
+`.last_publish/publish_manifest.json` only remembers the latest publish, and
+answering "when did this file last change?" otherwise means digging through old
+drive snapshots or commits. `history.sqlite` next to it keeps one row per
+publish (the manifest header: git, catalog, criteria, selection, timings) and one
+row per file per publish, so:
+
+  * the next run's baseline is read from the index instead of re-parsing JSON;
+  * a diff against *any* past publish is a pair of indexed joins;
+  * a file's history is one range scan on (dest, publish).
+
+The JSON manifest is still written for the drive's consumers and stays the
+fallback: a missing, corrupt or locked database only costs the history, never
+a publish. bpy-free; sqlite3 is stdlib, but some stripped Pythons ship without
+it, so it is imported optionally like zstd in `core.blendfile`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+from typing import NamedTuple
+
+from . import manifest
+
+try:
+    import sqlite3
+except ImportError:  # pragma: no cover - stripped Python builds
+    sqlite3 = None
+
+HISTORY_FILENAME = "history.sqlite"
+HISTORY_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS publishes (
+    id            INTEGER PRIMARY KEY,
+    generated_utc TEXT NOT NULL,
+    destination   TEXT NOT NULL,
+    git_commit    TEXT NOT NULL,
+    branch        TEXT NOT NULL,
+    reason        TEXT NOT NULL,
+    files         INTEGER NOT NULL,
+    header        TEXT NOT NULL,
+    cache_stat    TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS publishes_by_destination ON publishes (destination, id);
+CREATE TABLE IF NOT EXISTS entries (
+    publish_id INTEGER NOT NULL REFERENCES publishes (id) ON DELETE CASCADE,
+    dest       TEXT NOT NULL,
+    sha256     TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    scope      TEXT NOT NULL,
+    source     TEXT,
+    PRIMARY KEY (publish_id, dest)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_by_dest ON entries (dest, publish_id);
+"""
+
+# Rows of the current manifest, diffed against a past publish in SQL.
+_TEMP = "CREATE TEMP TABLE current (dest TEXT PRIMARY KEY, sha256 TEXT NOT NULL) WITHOUT ROWID"
+
+_DIFF_SQL = {
+    "added": "SELECT c.dest FROM current c LEFT JOIN entries e "
+             "ON e.publish_id = ? AND e.dest = c.dest WHERE e.dest IS NULL ORDER BY c.dest",
+    "changed": "SELECT c.dest FROM current c JOIN entries e "
+               "ON e.publish_id = ? AND e.dest = c.dest WHERE e.sha256 != c.sha256 ORDER BY c.dest",
+    "removed": "SELECT e.dest FROM entries e LEFT JOIN current c ON c.dest = e.dest "
+               "WHERE e.publish_id = ? AND c.dest IS NULL ORDER BY e.dest",
+    "unchanged": "SELECT c.dest FROM current c JOIN entries e "
+                 "ON e.publish_id = ? AND e.dest = c.dest WHERE e.sha256 = c.sha256 ORDER BY c.dest",
+}
+
+
+class HistoryError(Exception):
+    """The history database cannot be used; callers fall back to the JSON."""
+
+
+class Publish(NamedTuple):
+    id: int
+    generated_utc: str
+    destination: str
+    commit: str
+    branch: str
+    reason: str
+    files: int
+
+
+class FileChange(NamedTuple):
+    publish: Publish
+    sha256: str     # "" when the file left the library in this publish
+    size: int
+
+
+def available() -> bool:
+    return sqlite3 is not None
+
+
+def stat_signature(path: str) -> str:
+    """size:mtime_ns:inode of `path`, or "" when it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    return "%d:%d:%d" % (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class History:
+    """The publish history at `path`. Each call opens its own short connection,
+    so nothing holds the file open between calls (or across threads)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @contextlib.contextmanager
+    def _connect(self):
+        if sqlite3 is None:
+            raise HistoryError("this Python has no sqlite3 module")
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10)
+        except (OSError, sqlite3.Error) as exc:
+            raise HistoryError("cannot open %s: %s" % (self.path, exc)) from exc
+        try:
+            conn.execute("PRAGMA foreign_keys = ON")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, HISTORY_SCHEMA_VERSION):
+                raise HistoryError("%s has schema %d, expected %d" % (
+                    self.path, version, HISTORY_SCHEMA_VERSION
+                ))
+            if version == 0:
+                conn.executescript(_SCHEMA)
+                conn.execute("PRAGMA user_version = %d" % HISTORY_SCHEMA_VERSION)
+            with conn:
+                yield conn
+        except sqlite3.Error as exc:
+            raise HistoryError("%s: %s" % (self.path, exc)) from exc
+        finally:
+            conn.close()
+
+    # --- writing -------------------------------------------------------------
+
+    def record(self, man: dict, reason: str = "", cache_stat: str = "") -> int:
+        """Store one delivered manifest; returns its publish id.
+
+        `cache_stat` is the stat signature of the JSON cache written alongside
+        (see `baseline`).
+        """
+        header = {k: v for k, v in man.items() if k != "files"}
+        git = man.get("git") or {}
+        files = man.get("files") or {}
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO publishes (generated_utc, destination, git_commit, branch, "
+                "reason, files, header, cache_stat) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    man.get("generated_utc", ""), man.get("destination", ""),
+                    git.get("commit", ""), git.get("branch", ""), reason, len(files),
+                    json.dumps(header, sort_keys=True), cache_stat,
+                ),
+            )
+            publish_id = cur.lastrowid
+            conn.executemany(
+                "INSERT INTO entries (publish_id, dest, sha256, size, scope, source) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (publish_id, dest, meta.get("sha256", ""), meta.get("size", 0),
+                     meta.get("scope", ""), meta.get("source"))
+                    for dest, meta in files.items()
+                ),
+            )
+        return publish_id
+
+    # --- reading -------------------------------------------------------------
+
+    def publishes(self, destination: str = "", limit: int = 0) -> list:
+        """Newest first, optionally only those to `destination`."""
+        sql = ("SELECT id, generated_utc, destination, git_commit, branch, reason, files "
+               "FROM publishes")
+        args = []
+        if destination:
+            sql += " WHERE destination = ?"
+            args.append(destination)
+        sql += " ORDER BY id DESC"
+        if limit:
+            sql += " LIMIT %d" % int(limit)
+        with self._connect() as conn:
+            return [Publish(*row) for row in conn.execute(sql, args)]
+
+    def latest(self, destination: str):
+        found = self.publishes(destination, limit=1)
+        return found[0] if found else None
+
+    def baseline(self, destination: str, cache_stat: str):
+        """The id of the latest publish to `destination`, but only while the JSON
+        cache is still the very file that publish wrote. A deleted, replaced or
+        hand-edited cache means the two disagree, and the JSON wins."""
+        if not cache_stat:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, cache_stat FROM publishes WHERE destination = ? "
+                "ORDER BY id DESC LIMIT 1", (destination,)
+            ).fetchone()
+        return row[0] if row and row[1] == cache_stat else None
+
+    def manifest(self, publish_id: int) -> dict:
+        """The manifest of one publish, rebuilt exactly as it was recorded."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT header FROM publishes WHERE id = ?", (publish_id,)
+            ).fetchone()
+            if row is None:
+                raise HistoryError("no publish #%d in %s" % (publish_id, self.path))
+            man = json.loads(row[0])
+            files = {}
+            for dest, sha256, size, scope, source in conn.execute(
+                "SELECT dest, sha256, size, scope, source FROM entries "
+                "WHERE publish_id = ? ORDER BY dest", (publish_id,)
+            ):
+                meta = {"sha256": sha256, "size": size, "scope": scope}
+                if source is not None:
+                    meta["source"] = source
+                files[dest] = meta
+        man["files"] = dict(sorted(files.items(), key=lambda kv: kv[0].lower()))
+        return man
+
+    def diff(self, publish_id: int, man: dict) -> manifest.Diff:
+        """`manifest.diff(<publish #id>, man)`, as indexed joins in SQLite."""
+        with self._connect() as conn:
+            conn.execute(_TEMP)
+            conn.executemany(
+                "INSERT INTO current (dest, sha256) VALUES (?, ?)",
+                ((dest, meta.get("sha256", "")) for dest, meta in (man.get("files") or {}).items()),
+            )
+            out = {
+                key: [row[0] for row in conn.execute(sql, (publish_id,))]
+                for key, sql in _DIFF_SQL.items()
+            }
+        return manifest.Diff(out["added"], out["changed"], out["removed"], out["unchanged"])
+
+    def diff_publishes(self, old_id: int, new_id: int) -> manifest.Diff:
+        return self.diff(old_id, {"files": self.manifest(new_id)["files"]})
+
+    def file_history(self, dest: str) -> list:
+        """Every publish in which `dest` appeared, changed or disappeared; oldest
+        first. Publishes that left it untouched are folded away."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT p.id, p.generated_utc, p.destination, p.git_commit, p.branch, "
+                "p.reason, p.files, e.sha256, e.size FROM publishes p "
+                "LEFT JOIN entries e ON e.publish_id = p.id AND e.dest = ? "
+                "WHERE p.id >= (SELECT MIN(publish_id) FROM entries WHERE dest = ?) "
+                "ORDER BY p.destination, p.id", (dest, dest),
+            ).fetchall()
+        changes = []
+        last = {}
+        for row in rows:
+            publish = Publish(*row[:7])
+            sha256, size = row[7] or "", row[8] or 0
+            if last.get(publish.destination, "") != sha256:
+                changes.append(FileChange(publish, sha256, size))
+            last[publish.destination] = sha256
+        changes.sort(key=lambda c: c.publish.id)
+        return changes
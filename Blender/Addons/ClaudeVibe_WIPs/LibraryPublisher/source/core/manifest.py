@@ -15,6 +15,8 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import NamedTuple
 
@@ -22,20 +24,176 @@ MANIFEST_SCHEMA_VERSION = 1
 
 _HASH_CHUNK = 1024 * 1024
 
+# Upper bound on read buffers held at once across every hashing worker. Each
+# worker owns exactly one chunk, so the chunk shrinks as the pool grows.
+_HASH_BUFFER_BUDGET = 32 * 1024 * 1024
+_HASH_MIN_CHUNK = 64 * 1024
 
-def hash_file(path: str) -> str:
+# Auto worker count is capped: past a handful of reads in flight even NVMe
+# stops scaling, and a network share just gets slower.
+_HASH_MAX_AUTO_WORKERS = 8
+
+HASH_CACHE_FILENAME = "hash_cache.json"
+HASH_CACHE_SCHEMA_VERSION = 1
+
+# A file modified within this window of being hashed may still change again
+# inside the same mtime tick, so its digest is used but not remembered (the
+# "racy clean" case git guards against the same way).
+_RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def hash_file(path: str, chunk_size: int = _HASH_CHUNK) -> str:
     digest = hashlib.sha256()
-    with open(path, "rb") as fh:
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as fh:
         while True:
-            chunk = fh.read(_HASH_CHUNK)
-            if not chunk:
+            read = fh.readinto(buf)
+            if not read:
                 break
-            digest.update(chunk)
+            digest.update(view[:read])
     return digest.hexdigest()
 
 
+def hash_workers(requested: int = 0) -> int:
+    """Resolve a configured worker count; 0 means "pick for this machine"."""
+    if requested and requested > 0:
+        return int(requested)
+    return max(1, min(_HASH_MAX_AUTO_WORKERS, os.cpu_count() or 1))
+
+
+def hash_many(paths: list, *, workers: int = 0) -> list:
+    """sha256 of every path, in input order, hashed on a bounded thread pool.
+
+    `hashlib` and file reads both release the GIL, so threads overlap real I/O
+    and hashing. Largest files are submitted first so one huge .blend does not
+    start last and become the tail of the whole run. Output is identical to
+    calling `hash_file` on each path in turn.
+    """
+    paths = list(paths)
+    if not paths:
+        return []
+    count = min(hash_workers(workers), len(paths))
+    chunk = max(_HASH_MIN_CHUNK, min(_HASH_CHUNK, _HASH_BUFFER_BUDGET // count))
+    if count == 1:
+        return [hash_file(p, chunk) for p in paths]
+
+    def _size(index):
+        try:
+            return os.path.getsize(paths[index])
+        except OSError:
+            return 0
+
+    order = sorted(range(len(paths)), key=_size, reverse=True)
+    digests = [""] * len(paths)
+    with ThreadPoolExecutor(max_workers=count, thread_name_prefix="hash") as pool:
+        futures = {pool.submit(hash_file, paths[i], chunk): i for i in order}
+        for future, index in futures.items():
+            digests[index] = future.result()
+    return digests
+
+
+class HashCache:
+    """Persistent sha256 memo keyed by source path and stat signature.
+
+    A `.blend` whose size, mtime_ns and inode are all unchanged since it was last
+    hashed reuses the recorded digest, so a no-op publish costs one stat per file
+    instead of reading the whole library. `rehash` ignores what is on disk (but
+    still records fresh digests for next time).
+
+    Like the manifest cache, a missing or corrupt file only costs the speed-up.
+    """
+
+    def __init__(self, path: str = "", *, rehash: bool = False):
+        self.path = path
+        self.rehash = rehash
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._seen = {}
+        # Every digest produced this run, so the criteria pass and the manifest
+        # build can both ask without hashing (or counting) a file twice.
+        self._run = {}
+        if path and not rehash:
+            self._entries = _load_hash_cache(path)
+
+    def digest(self, src: str) -> str:
+        return self.digest_many([src])[0]
+
+    def digest_many(self, paths: list, *, workers: int = 0) -> list:
+        """Digests in input order; only the cache misses are actually read."""
+        out = [""] * len(paths)
+        pending = []
+        for index, src in enumerate(paths):
+            key = os.path.normcase(os.path.abspath(src))
+            stat = os.stat(src)
+            signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            memo = self._run.get(key)
+            if memo and memo[0] == signature:
+                out[index] = memo[1]
+                continue
+            known = self._entries.get(key)
+            if known and known.get("stat") == signature and known.get("sha256"):
+                self.hits += 1
+                self._seen[key] = known
+                self._run[key] = (signature, known["sha256"])
+                out[index] = known["sha256"]
+            else:
+                pending.append((index, src, key, signature))
+
+        self.misses += len(pending)
+        fresh = hash_many([p[1] for p in pending], workers=workers)
+        now = time.time_ns()
+        for (index, _src, key, signature), digest in zip(pending, fresh):
+            out[index] = digest
+            self._run[key] = (signature, digest)
+            if now - signature[1] > _RACY_WINDOW_NS:
+                self._seen[key] = {"stat": signature, "sha256": digest}
+        return out
+
+    def summary(self) -> str:
+        return "%d reused, %d hashed%s" % (
+            self.hits, self.misses, " (--rehash)" if self.rehash else ""
+        )
+
+    def save(self) -> None:
+        """Write back only the entries this run touched, so deleted or
+        deselected files do not accumulate forever."""
+        if not self.path:
+            return
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        data = {
+            "schema_version": HASH_CACHE_SCHEMA_VERSION,
+            "files": dict(sorted(self._seen.items())),
+        }
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=1)
+            fh.write("\n")
+        os.replace(tmp, self.path)
+
+
+def _load_hash_cache(path: str) -> dict:
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict) or data.get("schema_version") != HASH_CACHE_SCHEMA_VERSION:
+        return {}
+    files = data.get("files")
+    return files if isinstance(files, dict) else {}
+
+
 def hash_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
 
 
 def utc_stamp() -> str:
@@ -70,16 +228,30 @@ def build(
     criteria_summary: dict = None,
     skipped: list = None,
     extra_files: dict = None,
+    hash_cache: HashCache = None,
+    workers: int = 0,
+    known: dict = None,
+    selection_info: dict = None,
 ) -> dict:
     """Build a manifest from selected files (hashing each one).
 
     `extra_files` maps dest path -> hash for content generated rather than copied
-    (the rewritten catalog file, README, version stamp).
+    (the rewritten catalog file, README, version stamp). With a `hash_cache`,
+    files whose stat signature is unchanged are not re-read. `workers` sizes the
+    hashing pool (0 = auto). `known` maps dest -> sha256 for files vouched for
+    elsewhere (the git-delta fast path); those are neither read nor stat'ed.
     """
+    known = known or {}
+    srcs = [item.src for item in files if item.dest not in known]
+    if hash_cache is not None:
+        fresh = iter(hash_cache.digest_many(srcs, workers=workers))
+    else:
+        fresh = iter(hash_many(srcs, workers=workers))
+    digests = [known[item.dest] if item.dest in known else next(fresh) for item in files]
     entries = {}
-    for item in files:
+    for item, digest in zip(files, digests):
         entries[item.dest] = {
-            "sha256": hash_file(item.src),
+            "sha256": digest,
             "size": item.size,
             "scope": item.scope,
             "source": os.path.relpath(item.src, cfg["source"]["repo_root"]).replace(
@@ -105,6 +277,8 @@ def build(
         "catalog": catalog_info or {},
         "criteria": criteria_summary or {},
         "skipped": skipped or [],
+        # What the file list was selected with; lets the next run start from it.
+        "selection": selection_info or {},
         "counts": {"files": len(entries), "by_scope": by_scope},
         "files": dict(sorted(entries.items(), key=lambda kv: kv[0].lower())),
     }
@@ -9,10 +9,13 @@ from __future__ import annotations
 
 import json
 import os
-import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import NamedTuple
 
-from . import catalogs, config, criteria, delivery, manifest, selection, shell
+from . import (
+    blendfile, catalogs, config, criteria, delivery, history, manifest, selection, shell,
+)
 
 STAGING_DIRNAME = ".staging"
 CACHE_DIRNAME = ".last_publish"
@@ -29,6 +32,88 @@ class PublishResult(NamedTuple):
     delivered: bool
     delivery: object       # DeliveryResult or None
     skipped_files: list    # dest paths dropped by a blocking check
+    stages: list = []      # StageTiming per pipeline stage that ran, in order
+    targets: list = []     # TargetResult per destination, in config order
+
+
+class StageTiming(NamedTuple):
+    name: str
+    seconds: float
+    files: int = 0         # files the stage looked at or moved
+    bytes: int = 0
+    cache_hits: int = 0
+
+
+class _Recorder:
+    """Times the pipeline stages and mirrors progress to a JSON-lines file.
+
+    Stages are consecutive: `mark` closes the open stage and starts the next, so
+    the orchestrator needs one line per section rather than a re-indented block.
+    Each event is flushed as written, so a UI or CI job can tail the file live.
+    """
+
+    def __init__(self, events_path: str = ""):
+        self.stages = []
+        self._fh = None
+        if events_path:
+            os.makedirs(os.path.dirname(os.path.abspath(events_path)), exist_ok=True)
+            self._fh = open(events_path, "a", encoding="utf-8")
+        self._open = None
+        self._start = time.perf_counter()
+
+    def emit(self, event: str, **fields) -> None:
+        if self._fh is None:
+            return
+        record = {"event": event, "t": round(time.time(), 3)}
+        record.update(fields)
+        self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def mark(self, name: str) -> None:
+        self.end()
+        self._open = [name, time.perf_counter(), {}]
+        self.emit("stage_start", stage=name)
+
+    def note(self, **counts) -> None:
+        if self._open is not None:
+            self._open[2].update(counts)
+
+    def end(self) -> None:
+        if self._open is None:
+            return
+        name, began, counts = self._open
+        self._open = None
+        timing = StageTiming(name, round(time.perf_counter() - began, 4), **counts)
+        self.stages.append(timing)
+        fields = timing._asdict()
+        self.emit("stage_end", stage=fields.pop("name"), **fields)
+
+    def summary(self) -> dict:
+        """The closed stages, as recorded in the manifest."""
+        return {
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "stages": [t._asdict() for t in self.stages],
+        }
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+def format_stages(stages: list) -> list:
+    """One console/panel line per stage: time, then whatever it counted."""
+    out = []
+    for t in stages:
+        bits = ["%-9s %7.2fs" % (t.name, t.seconds)]
+        if t.files:
+            bits.append("%d file(s)" % t.files)
+        if t.bytes:
+            bits.append("%.1f MiB" % (t.bytes / 2**20))
+        if t.cache_hits:
+            bits.append("%d cached" % t.cache_hits)
+        out.append("  ".join(bits))
+    return out
 
 
 def _fail(reason: str, lines: list, sel=None, verdict=None) -> PublishResult:
@@ -47,8 +132,15 @@ def catalog_source_path(cfg: dict) -> str:
     )
 
 
-def run_criteria(cfg: dict, tool_root: str, files: list, known_uuids: set):
-    """Launch the single headless Blender inspection pass, if any check is on."""
+def run_criteria(
+    cfg: dict, tool_root: str, files: list, known_uuids: set, hash_cache=None
+):
+    """Run the headless Blender inspection pass, if any check is on.
+
+    Per-file reports are cached by content hash (see `criteria.InspectCache`),
+    so Blender only opens files it has not seen in this exact form - and is not
+    launched at all when nothing in scope changed.
+    """
     # No active check at all is the common, cheap case: Blender is never
     # launched and the publish stays pure file I/O. Reported as "all checks off"
     # rather than as a reason it could not run.
@@ -59,39 +151,209 @@ def run_criteria(cfg: dict, tool_root: str, files: list, known_uuids: set):
     if not targets:
         return criteria.skipped_verdict("no selected file is in scope for any active check"), []
 
-    blender_exe = shell.find_blender(cfg.get("blender", {}).get("executable", ""))
-    if not blender_exe:
-        return criteria.skipped_verdict(
-            "no Blender executable found - set blender.executable in the config"
-        ), []
-
     driver = os.path.join(tool_root, "source", "checks", "blender_inspect.py")
     if not os.path.isfile(driver):
         return criteria.skipped_verdict("inspection driver missing: %s" % driver), []
 
-    scratch = os.path.join(tool_root, STAGING_DIRNAME + "_batch")
-    os.makedirs(scratch, exist_ok=True)
-    batch_path = os.path.join(scratch, "inspect_batch.json")
-    batch = criteria.build_batch(cfg, targets, known_uuids)
-    with open(batch_path, "w", encoding="utf-8") as fh:
-        json.dump(batch, fh, indent=2)
+    cache_dir = os.path.join(tool_root, CACHE_DIRNAME)
+    owns_hashes = hash_cache is None
+    if owns_hashes:
+        hash_cache = manifest.HashCache(os.path.join(cache_dir, manifest.HASH_CACHE_FILENAME))
+    context = criteria.inspect_context(
+        cfg, known_uuids, manifest.hash_file(driver), _audit_module_hash(cfg)
+    )
+    # Files only the cheap checks apply to are keyed on the reader instead of
+    # the driver: editing the driver must not invalidate what it never produced.
+    use_reader = bool(cfg.get("blender", {}).get("python_reader", True))
+    reader_context = criteria.inspect_context(
+        cfg, known_uuids, "blendfile-%s" % blendfile.READER_VERSION
+    )
+    inspected = criteria.InspectCache(os.path.join(cache_dir, criteria.INSPECT_CACHE_FILENAME))
+    digests = hash_cache.digest_many(
+        [t.src for t in targets], workers=cfg["manifest"].get("hash_workers", 0)
+    )
+    if owns_hashes:
+        hash_cache.save()
+    keys = {}
+    cached = {}
+    reader_keys = {}
+    for item, digest in zip(targets, digests):
+        keys[item.dest] = criteria.inspect_key(digest, context)
+        if use_reader and not criteria.needs_blender(cfg, item.scope):
+            reader_keys[item.dest] = criteria.inspect_key(digest, reader_context)
+        report = None
+        if item.dest in reader_keys:
+            report = inspected.get(reader_keys[item.dest], item)
+        if report is None:
+            report = inspected.get(keys[item.dest], item)
+        if report is not None:
+            cached[item.dest] = report
 
-    cmd = criteria.build_command(cfg, blender_exe, driver, batch_path)
-    res = shell.run(cmd, timeout=3600)
-    try:
-        payload = criteria.extract_json(res.out)
-    except (ValueError, json.JSONDecodeError) as exc:
-        tail = (res.err or res.out).strip()[-600:]
-        return criteria.skipped_verdict(
-            "inspection pass produced no usable output (%s). Tail: %s" % (exc, tail)
-        ), targets
-
-    verdict = criteria.interpret(cfg, payload, known_uuids)
+    read = {}
+    checks = sorted(criteria.active_checks(cfg))
+    for item in targets:
+        if item.dest in cached or item.dest not in reader_keys:
+            continue
+        try:
+            facts = blendfile.inspect_file(item.src, checks=checks)
+        except blendfile.BlendFileError:
+            continue      # Blender opens it instead, cached under the driver's key
+        read[item.dest] = dict(facts, src=item.src, dest=item.dest, scope=item.scope)
+        inspected.put(reader_keys[item.dest], read[item.dest])
+
+    payload = {"reports": list(read.values())}
+    if len(cached) + len(read) < len(targets):
+        blender_exe = shell.find_blender(cfg.get("blender", {}).get("executable", ""))
+        if not blender_exe:
+            return criteria.skipped_verdict(
+                "no Blender executable found - set blender.executable in the config"
+            ), []
+
+        misses = [t for t in targets if t.dest not in cached and t.dest not in read]
+        payload, error = _inspect_sharded(
+            cfg, tool_root, blender_exe, driver, misses, known_uuids
+        )
+        if payload is None:
+            return criteria.skipped_verdict(error), targets
+
+        # An audit module that failed to import yields empty audits, which must
+        # not be remembered as this file's real layout result. Only Blender's
+        # own reports go under the driver's key; the reader's are cached above.
+        if not payload.get("audit_error"):
+            for report in payload.get("reports") or []:
+                if report.get("dest") in keys:
+                    inspected.put(keys[report["dest"]], report)
+        payload["reports"] = list(read.values()) + list(payload.get("reports") or [])
+
+    inspected.save()
+    verdict = criteria.interpret(cfg, payload, known_uuids, cached)._replace(direct=len(read))
     if payload.get("audit_error"):
         verdict = verdict._replace(inspect_error=payload["audit_error"])
     return verdict, targets
 
 
+def _inspect_sharded(
+    cfg: dict, tool_root: str, blender_exe: str, driver: str, files: list, known_uuids: set
+):
+    """Run `blender.workers` headless Blenders concurrently over size-balanced
+    shards of `files`. Returns (merged payload, "") or (None, reason) when no
+    shard produced anything usable."""
+    blender_cfg = cfg.get("blender", {})
+    shards = criteria.plan_shards(files, blender_cfg.get("workers", 1))
+    batches = [criteria.build_batch(cfg, shard, known_uuids) for shard in shards]
+    per_file = blender_cfg.get("timeout_per_file", 300)
+
+    scratch = os.path.join(tool_root, STAGING_DIRNAME + "_batch")
+    os.makedirs(scratch, exist_ok=True)
+
+    def _run_shard(index):
+        batch = batches[index]
+        batch_path = os.path.join(scratch, "inspect_batch_%02d.json" % index)
+        with open(batch_path, "w", encoding="utf-8") as fh:
+            json.dump(batch, fh, indent=2)
+        # Blender startup is paid once per shard: allow it one file's worth.
+        timeout = per_file * (len(batch["files"]) + 1)
+        if blender_cfg.get("daemon", {}).get("enabled"):
+            res = _daemon_request(cfg, tool_root, blender_exe, driver, index, batch, timeout)
+        else:
+            cmd = criteria.build_command(cfg, blender_exe, driver, batch_path)
+            res = shell.run(cmd, timeout=timeout)
+        try:
+            return criteria.extract_json(res.out), ""
+        except (ValueError, json.JSONDecodeError) as exc:
+            tail = (res.err or res.out).strip()[-600:]
+            return None, "inspection pass produced no usable output (%s). Tail: %s" % (exc, tail)
+
+    if len(batches) == 1:
+        outcomes = [_run_shard(0)]
+    else:
+        with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+            outcomes = list(pool.map(_run_shard, range(len(batches))))
+
+    if all(payload is None for payload, _err in outcomes):
+        return None, outcomes[0][1]
+    return criteria.merge_shard_payloads(batches, outcomes), ""
+
+
+def _daemon_request(
+    cfg: dict, tool_root: str, blender_exe: str, driver: str, index: int,
+    batch: dict, timeout: int,
+) -> shell.Completed:
+    """Hand one shard's batch to persistent inspection daemon #`index`.
+
+    Starts the daemon when none is listening, replaces one running an older
+    driver or a different Blender, and restarts one that died mid-job. A daemon
+    that times out is killed, since it is stuck on a file it will never finish.
+    """
+    state_path = os.path.join(tool_root, CACHE_DIRNAME, "inspect_daemon_%02d.json" % index)
+    driver_sha = manifest.hash_file(driver)
+
+    state = shell.read_state(state_path)
+    if state and (
+        state.get("driver_sha256") != driver_sha
+        or os.path.normcase(state.get("blender", "")) != os.path.normcase(blender_exe)
+    ):
+        shell.request(state_path, {"op": "shutdown"}, timeout=5)
+        shell.terminate(state.get("pid"))
+        _remove(state_path)
+
+    for attempt in range(2):
+        res = shell.request(state_path, {"batch": batch}, timeout=timeout)
+        if res.code == 124:
+            shell.terminate(shell.read_state(state_path).get("pid"))
+            _remove(state_path)
+            return res
+        if res.code != shell.UNREACHABLE and criteria.JSON_END in res.out:
+            return res
+        # Nobody home, or it died mid-reply: (re)start and try once more.
+        _remove(state_path)
+        if attempt == 0:
+            started = _start_daemon(cfg, tool_root, blender_exe, driver, state_path, timeout)
+            if started is not None:
+                return started
+    return res
+
+
+def _start_daemon(cfg, tool_root, blender_exe, driver, state_path, timeout):
+    """Launch a daemon and wait for its state file. None on success, else the
+    failure as a `Completed` carrying the daemon's log tail."""
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    log_path = os.path.splitext(state_path)[0] + ".log"
+    cmd = criteria.build_command(cfg, blender_exe, driver, "", serve=state_path)
+    proc = shell.spawn_detached(cmd, log_path)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if shell.read_state(state_path):
+            return None
+        if proc.poll() is not None:
+            break
+        time.sleep(0.1)
+    else:
+        shell.terminate(proc.pid)
+    try:
+        with open(log_path, "r", encoding="utf-8", errors="replace") as fh:
+            tail = fh.read()[-600:]
+    except OSError:
+        tail = ""
+    return shell.Completed(1, "", "inspection daemon did not start. %s" % tail, cmd)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _audit_module_hash(cfg: dict) -> str:
+    """Hash of layout_audit.py when geonode_layout is on, so an edited audit
+    invalidates every cached layout report."""
+    if "geonode_layout" not in criteria.active_checks(cfg):
+        return ""
+    path = os.path.join(criteria.audit_module_dir(cfg), "layout_audit.py")
+    return manifest.hash_file(path) if os.path.isfile(path) else ""
+
+
 def publish(
     cfg: dict,
     tool_root: str,
@@ -99,10 +361,42 @@ def publish(
     force: bool = False,
     enforce_branch: bool = False,
     reason: str = "manual",
+    rehash: bool = False,
+    events: str = "",
+    changed: list = None,
+    hashes: manifest.HashCache = None,
 ) -> PublishResult:
-    """Run one publish. `force` delivers even when nothing changed."""
+    """Run one publish. `force` delivers even when nothing changed; `rehash`
+    ignores the hash cache and reads every selected file again; `events` is a
+    JSON-lines file that receives stage and log events as they happen.
+
+    `changed` (repo-relative posix paths) is a caller's promise that nothing
+    else moved since the cached baseline - the watcher's fast path, used in
+    place of the git delta. `hashes` lets a long-lived caller keep one hash
+    cache in memory across runs.
+    """
+    rec = _Recorder(events)
+    rec.emit("publish_start", library=cfg.get("library_name", ""), reason=reason,
+             dry_run=bool(cfg.get("delivery", {}).get("dry_run")))
+    try:
+        result = _publish(cfg, tool_root, rec, force=force, enforce_branch=enforce_branch,
+                          reason=reason, rehash=rehash, changed=changed, hashes=hashes)
+        rec.end()
+        result = result._replace(stages=list(rec.stages))
+        rec.emit("publish_end", ok=result.ok, reason=result.reason,
+                 delivered=result.delivered, **rec.summary())
+        return result
+    finally:
+        rec.close()
+
+
+def _publish(cfg, tool_root, rec, *, force, enforce_branch, reason, rehash,
+             changed=None, hashes=None):
     lines = []
-    add = lines.append
+
+    def add(text):
+        lines.append(text)
+        rec.emit("log", text=text)
 
     problems = config.validate(cfg)
     if problems:
@@ -134,7 +428,41 @@ def publish(
             )
 
     # --- select --------------------------------------------------------------
-    sel = selection.select(cfg)
+    rec.mark("select")
+    cache_dir = os.path.join(tool_root, CACHE_DIRNAME)
+    hist = (
+        history.History(os.path.join(cache_dir, history.HISTORY_FILENAME))
+        if cfg["manifest"].get("history") and history.available() else None
+    )
+    targets = []
+    for name, target_cfg in config.delivery_targets(cfg):
+        cache_path = _cache_path(cfg, cache_dir, name)
+        prev, baseline_id, note = _previous_manifest(target_cfg, cache_path, hist)
+        if note:
+            add("  ! %s" % note)
+        targets.append(_Target(
+            name, target_cfg, cache_path, os.path.join(tool_root, _staging_dirname(name)),
+            prev, baseline_id,
+        ))
+    # Any destination's baseline describes the repo at its commit, which is all
+    # the git delta needs; the first one that has a baseline is used.
+    previous = next((t.previous for t in targets if t.previous), {})
+    if changed is not None:
+        delta, note = _watch_delta(cfg, git, previous, changed, rehash)
+    else:
+        delta, note = _git_delta(cfg, git, previous, rehash)
+    known = {}
+    if delta is not None:
+        sel = selection.select_changed(cfg, previous, delta.changed)
+        touched = set(delta.changed)
+        known = {
+            dest: meta["sha256"] for dest, meta in previous["files"].items()
+            if meta.get("source") and meta["source"] not in touched
+        }
+    else:
+        sel = selection.select(cfg)
+    rec.note(files=len(sel.files), bytes=sum(f.size for f in sel.files),
+             cache_hits=len(known))
     for warn in sel.warnings:
         add("  ! %s" % warn)
     if not sel.files:
@@ -143,8 +471,11 @@ def publish(
         len(sel.files),
         ", ".join("%s=%d" % (k, v) for k, v in sorted(sel.per_scope.items())),
     ))
+    if note:
+        add("  %s" % note)
 
     # --- catalog transform (Variant A) ---------------------------------------
+    rec.mark("catalog")
     cat_path = catalog_source_path(cfg)
     generated = {}
     catalog_info = {}
@@ -188,9 +519,19 @@ def publish(
             generated[cfg["source"]["catalog_file"]] = text
 
     # --- criteria ------------------------------------------------------------
-    verdict, inspected = run_criteria(cfg, tool_root, sel.files, known_uuids)
+    rec.mark("criteria")
+    if hashes is None:
+        hashes = manifest.HashCache(
+            os.path.join(cache_dir, manifest.HASH_CACHE_FILENAME), rehash=rehash
+        )
+    verdict, inspected = run_criteria(cfg, tool_root, sel.files, known_uuids, hashes)
+    rec.note(files=len(inspected), cache_hits=verdict.cached)
     if verdict.ran:
-        add("  criteria: inspected %d file(s)" % len(inspected))
+        add("  criteria: inspected %d file(s)%s%s" % (
+            len(inspected),
+            " (%d from cache)" % verdict.cached if verdict.cached else "",
+            " (%d read without Blender)" % verdict.direct if verdict.direct else "",
+        ))
         report = criteria.format_report(
             verdict, show_pass=bool(cfg.get("criteria_policy", {}).get("verbose"))
         )
@@ -233,6 +574,7 @@ def publish(
                 return _fail("every selected file failed a blocking check", lines, sel, verdict)
 
     # --- manifest + diff -----------------------------------------------------
+    rec.mark("hash")
     man = manifest.build(
         cfg, files,
         git_info=git,
@@ -244,14 +586,184 @@ def publish(
                    "scope": "generated"}
             for dest, text in generated.items()
         },
+        hash_cache=hashes,
+        workers=cfg["manifest"].get("hash_workers", 0),
+        known=known,
+        selection_info={
+            "fingerprint": selection.fingerprint(cfg),
+            "dirty": delta.dirty if delta is not None else _dirty_paths(git, cfg),
+        },
     )
+    # Saved even on a dry run: it memoises file contents, not what the
+    # destination holds, so it can never make a later publish skip anything.
+    hashes.save()
+    add("  hashes: %s" % hashes.summary())
+    rec.note(files=len(files), bytes=sum(f.size for f in files),
+             cache_hits=hashes.hits + len(known))
 
-    cache_dir = os.path.join(tool_root, CACHE_DIRNAME)
-    cache_path = os.path.join(cache_dir, cfg["manifest"]["filename"])
-    previous = _previous_manifest(cfg, cache_path)
-    if not previous and cfg["delivery"]["backend"] == "rclone":
-        previous = _fetch_remote_manifest(cfg)
-    change = manifest.diff(previous, man)
+    common = dict(man=man, files=files, generated=generated, hist=hist,
+                  reason=reason, force=force)
+    if len(targets) == 1:
+        shipped = _ship(targets[0], rec=rec, add=add, **common)
+        if not shipped.ok:
+            return _fail(shipped.detail, lines, sel, verdict)
+        if not shipped.delivered:
+            return PublishResult(
+                True, "up to date", lines, shipped.manifest, shipped.diff, verdict, sel,
+                False, None, skipped, targets=[shipped],
+            )
+    else:
+        shipped_all = _fan_out(targets, rec, add, common)
+        failed = [t for t in shipped_all if not t.ok]
+        shipped = shipped_all[0]
+        if failed:
+            add("  targets: %d ok, %d FAILED (%s)" % (
+                len(shipped_all) - len(failed), len(failed), ", ".join(t.name for t in failed)
+            ))
+            res = _fail("delivery failed for target(s) %s" % ", ".join(t.name for t in failed),
+                        lines, sel, verdict)
+            return res._replace(manifest=shipped.manifest, diff=shipped.diff,
+                                delivered=any(t.delivered for t in shipped_all),
+                                skipped_files=skipped, targets=shipped_all)
+        if not any(t.delivered for t in shipped_all):
+            return PublishResult(
+                True, "up to date", lines, shipped.manifest, shipped.diff, verdict, sel,
+                False, None, skipped, targets=shipped_all,
+            )
+
+    add("  timings: %s" % ", ".join(
+        "%s %.2fs" % (t.name, t.seconds) for t in rec.stages
+    ))
+    add("  done: %d file(s) published as '%s'" % (man["counts"]["files"], lib_name))
+    return PublishResult(
+        True, "", lines, shipped.manifest, shipped.diff, verdict, sel, True,
+        shipped.delivery, skipped, targets=[shipped] if len(targets) == 1 else shipped_all,
+    )
+
+
+# --- per destination ---------------------------------------------------------
+
+class _Target(NamedTuple):
+    name: str              # "" for the single, classic destination
+    cfg: dict              # the full config with this target's delivery block
+    cache_path: str        # its own cached baseline manifest
+    staging_root: str
+    previous: dict
+    baseline_id: object    # history id of that baseline, or None
+
+
+class TargetResult(NamedTuple):
+    name: str
+    destination: str
+    ok: bool
+    delivered: bool
+    diff: manifest.Diff
+    detail: str            # the delivery detail, or why it failed
+    seconds: float
+    manifest: dict
+    delivery: object       # DeliveryResult or None
+
+
+def _cache_path(cfg: dict, cache_dir: str, name: str) -> str:
+    filename = cfg["manifest"]["filename"]
+    if not name:
+        return os.path.join(cache_dir, filename)
+    return os.path.join(cache_dir, "targets", name, filename)
+
+
+def _staging_dirname(name: str) -> str:
+    return STAGING_DIRNAME if not name else "%s_%s" % (STAGING_DIRNAME, name)
+
+
+class _Quiet:
+    """Stands in for the recorder on a fan-out thread: the shared recorder
+    times the fan-out as one stage, each target times itself."""
+
+    def __init__(self, summary: dict):
+        self._summary = summary
+
+    def mark(self, name):
+        pass
+
+    def note(self, **counts):
+        pass
+
+    def end(self):
+        pass
+
+    def summary(self) -> dict:
+        return dict(self._summary)
+
+
+def _fan_out(targets: list, rec, add, common: dict) -> list:
+    """Ship to every target at once; wall time is the slowest one's."""
+    rec.mark("deliver")
+    snapshot = rec.summary()
+    buffers = [[] for _ in targets]
+    with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="target") as pool:
+        futures = [
+            pool.submit(_ship, t, rec=_Quiet(snapshot), add=buf.append, **common)
+            for t, buf in zip(targets, buffers)
+        ]
+        shipped = []
+        for t, future, buf in zip(targets, futures, buffers):
+            try:
+                shipped.append(future.result())
+            except Exception as exc:
+                buf.append("  ! crashed: %s" % exc)
+                shipped.append(TargetResult(
+                    t.name, manifest.destination_of(t.cfg), False, False,
+                    manifest.Diff([], [], [], []), "crashed: %s" % exc, 0.0, {}, None,
+                ))
+    for result, buf in zip(shipped, buffers):
+        add("  target '%s' -> %s: %s in %.2fs" % (
+            result.name, result.destination,
+            ("delivered" if result.delivered else "up to date") if result.ok else "FAILED",
+            result.seconds,
+        ))
+        for line in buf:
+            add("  " + line)
+    rec.note(files=sum(len(r.diff.added) + len(r.diff.changed) + len(r.diff.removed)
+                       for r in shipped))
+    rec.end()
+    return shipped
+
+
+def _ship(target: _Target, *, man, files, generated, hist, reason, force, rec, add):
+    """diff -> stage -> deliver -> remember, for one destination."""
+    started = time.perf_counter()
+    cfg = target.cfg
+    dry = bool(cfg["delivery"].get("dry_run"))
+    destination = manifest.destination_of(cfg)
+    man = dict(man, destination=destination)
+    generated = dict(generated)
+    previous = target.previous
+
+    def done(ok, delivered, change, detail, result=None):
+        return TargetResult(
+            target.name, destination, ok, delivered, change, detail,
+            time.perf_counter() - started, man, result,
+        )
+
+    rec.mark("diff")
+
+    remote = {}
+    delta_wanted = (
+        cfg["delivery"]["backend"] == "rclone"
+        and cfg["delivery"]["rclone"].get("delta")
+    )
+    if cfg["delivery"]["backend"] == "rclone" and (delta_wanted or not previous):
+        remote = _fetch_remote_manifest(cfg)
+    if not previous:
+        previous = remote
+    change = None
+    if target.baseline_id is not None:
+        try:
+            change = hist.diff(target.baseline_id, man)
+        except history.HistoryError as exc:
+            add("  ! history: %s - diffing the JSON baseline instead" % exc)
+    if change is None:
+        change = manifest.diff(previous, man)
     add("  changes: %s" % change.summary())
     for dest in change.added:
         add("      + %s" % dest)
@@ -260,6 +772,11 @@ def publish(
     for dest in change.removed:
         add("      - %s" % dest)
 
+    rec.note(files=len(change.added) + len(change.changed) + len(change.removed))
+    rec.end()
+    # The delivered manifest stays free of wall-clock timings so that an
+    # unchanged library republishes byte-identical; only the local cache copy
+    # below records them.
     if cfg["manifest"].get("enabled"):
         generated[cfg["manifest"]["filename"]] = manifest.dumps(man)
     if cfg["manifest"].get("write_version_txt"):
@@ -267,63 +784,225 @@ def publish(
     if cfg["manifest"].get("write_readme"):
         generated["README_DO_NOT_EDIT.txt"] = manifest.readme_txt(man, cfg)
 
-    if not change.has_changes and not force:
-        add("  nothing changed - delivery skipped (use --force to publish anyway)")
-        return PublishResult(
-            True, "up to date", lines, man, change, verdict, sel, False, None, skipped
+    # Only rclone delta deliveries are journaled; the other backends compare
+    # the destination for themselves.
+    journal = None
+    if delta_wanted and cfg["delivery"].get("journal") and not dry:
+        journal = delivery.Journal(
+            os.path.join(os.path.dirname(target.cache_path), delivery.JOURNAL_FILENAME),
+            destination,
         )
+    unfinished = journal is not None and len(journal) > 0
+
+    if not change.has_changes and not force and not unfinished:
+        add("  nothing changed - delivery skipped (use --force to publish anyway)")
+        return done(True, False, change, "up to date")
 
     # --- stage + deliver -----------------------------------------------------
-    staging_root = os.path.join(tool_root, STAGING_DIRNAME)
-    staged = delivery.build_staging(files, generated, staging_root)
+    rec.mark("stage")
+    staging_root = target.staging_root
+    digests = {dest: meta["sha256"] for dest, meta in man["files"].items()}
+    staged = delivery.build_staging(files, generated, staging_root, hashes=digests)
     for err in staged.errors:
         add("  ! %s" % err)
     if staged.errors:
-        return _fail("staging failed - nothing was delivered", lines, sel, verdict)
-    add("  staged %d file(s) (%d hardlinked, %d copied, %d generated) at %s" % (
-        staged.copied + staged.linked + staged.generated,
-        staged.linked, staged.copied, staged.generated, staging_root,
-    ))
+        return done(False, False, change, "staging failed - nothing was delivered")
+    add("  staged %d file(s) (%d hardlinked, %d copied, %d generated, %d kept, "
+        "%d removed) at %s" % (
+            staged.copied + staged.linked + staged.generated + staged.kept,
+            staged.linked, staged.copied, staged.generated, staged.kept,
+            staged.removed, staging_root,
+        ))
+    rec.note(files=staged.linked + staged.copied + staged.generated, cache_hits=staged.kept)
+
+    rec.mark("deliver")
 
-    result = delivery.deliver(cfg, staging_root)
+    plan = None
+    if delta_wanted:
+        plan, why = _delta_plan(cfg, previous, remote, change, generated, force)
+        if plan is not None and unfinished:
+            plan = _widen_for_journal(cfg, plan, journal, man, generated)
+        add("  delivery mode: %s" % (
+            "delta (%d upload, %d delete)" % (len(plan.upload) + len(plan.last), len(plan.remove))
+            if plan else "full checksum sync (%s)" % why
+        ))
+    if unfinished:
+        add("  resuming: %d file(s) confirmed at the destination by an interrupted "
+            "delivery" % len(journal))
+    result = delivery.deliver(
+        cfg, staging_root, delta=plan, hashes=digests, generated=list(generated),
+        journal=journal,
+    )
     add("  delivery: %s" % result.detail)
     if not result.ok:
-        return _fail("delivery failed", lines, sel, verdict)
+        return done(False, False, change, "delivery failed", result)
+
+    if plan is not None:
+        rec.note(files=len(plan.upload) + len(plan.remove) + len(plan.last))
+    rec.end()
+    man["timings"] = rec.summary()
 
     if not dry:
-        os.makedirs(cache_dir, exist_ok=True)
-        with open(cache_path, "w", encoding="utf-8") as fh:
+        os.makedirs(os.path.dirname(target.cache_path), exist_ok=True)
+        tmp = target.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
             fh.write(manifest.dumps(man))
-        shutil.rmtree(staging_root, ignore_errors=True)
+        os.replace(tmp, target.cache_path)
+        # The new baseline covers everything the journal vouched for.
+        if journal is not None:
+            journal.clear()
+        # The staging tree is kept: the next publish reconciles it in place.
+        if hist is not None:
+            try:
+                publish_id = hist.record(man, reason, history.stat_signature(target.cache_path))
+                add("  history: recorded as publish #%d" % publish_id)
+            except history.HistoryError as exc:
+                add("  ! history: not recorded (%s)" % exc)
 
-    add("  done: %d file(s) published as '%s'" % (man["counts"]["files"], lib_name))
-    return PublishResult(
-        True, "", lines, man, change, verdict, sel, True, result, skipped
+    return done(True, True, change, result.detail, result)
+
+
+class GitDelta(NamedTuple):
+    changed: list   # repo-relative paths that may differ from the baseline
+    dirty: list     # uncommitted paths right now (recorded for the next run)
+
+
+def _git_delta(cfg: dict, git: dict, previous: dict, rehash: bool):
+    """(GitDelta, note) when git can say what changed since `previous`, else
+    (None, why-not). The note is "" when there is simply nothing to compare.
+
+    The baseline's own dirty paths are folded in: they were published with
+    uncommitted content that may since have been reverted without a trace in
+    `git diff`. A baseline with withheld files is not reused either, because a
+    withheld file is absent from its list yet must be re-checked every run.
+    """
+    if not git.get("commit") or not previous:
+        return None, ""
+    base = previous.get("git", {}).get("commit", "")
+    if rehash:
+        return None, "selection: full scan (--rehash)"
+    if not base:
+        return None, "selection: full scan (baseline has no commit)"
+    info = previous.get("selection") or {}
+    if info.get("fingerprint") != selection.fingerprint(cfg):
+        return None, "selection: full scan (scope config changed since the baseline)"
+    if previous.get("skipped"):
+        return None, "selection: full scan (baseline withheld files)"
+    found = shell.git_changes_since(cfg["source"]["repo_root"], base)
+    if found is None:
+        return None, "selection: full scan (git cannot diff against %s)" % base[:9]
+    changed, dirty = found
+    paths = sorted(set(changed) | set(dirty) | set(info.get("dirty") or []))
+    return GitDelta(paths, dirty), "selection: git delta since %s, %d path(s) to re-check" % (
+        base[:9], len(paths),
     )
 
 
-def _previous_manifest(cfg: dict, cache_path: str) -> dict:
-    """The cached manifest, but only if it describes the SAME destination.
+def _watch_delta(cfg: dict, git: dict, previous: dict, changed: list, rehash: bool):
+    """`_git_delta` for a caller that saw every touched path itself."""
+    if not previous:
+        return None, "selection: full scan (no baseline yet)"
+    if rehash:
+        return None, "selection: full scan (--rehash)"
+    if (previous.get("selection") or {}).get("fingerprint") != selection.fingerprint(cfg):
+        return None, "selection: full scan (scope config changed since the baseline)"
+    if previous.get("skipped"):
+        return None, "selection: full scan (baseline withheld files)"
+    paths = sorted(set(changed))
+    return GitDelta(paths, _dirty_paths(git, cfg)), (
+        "selection: %d watched path(s) to re-check" % len(paths)
+    )
+
+
+def _dirty_paths(git: dict, cfg: dict) -> list:
+    """Uncommitted paths now, for the manifest; [] outside a git checkout."""
+    if not git.get("commit"):
+        return []
+    found = shell.git_changes_since(cfg["source"]["repo_root"], git["commit"])
+    return found[1] if found else []
+
+
+def _previous_manifest(cfg: dict, cache_path: str, hist=None):
+    """(manifest, history id or None, note): the cached baseline, but only if it
+    describes the SAME destination.
 
     Publishing to a new target must not diff against the old target's baseline,
     or an unchanged file would be reported as already delivered when the new
-    destination has never seen it.
+    destination has never seen it. The history index is read instead of the
+    JSON while it still vouches for that exact file.
     """
+    here = manifest.destination_of(cfg)
+    note = ""
+    if hist is not None:
+        try:
+            baseline_id = hist.baseline(here, history.stat_signature(cache_path))
+            if baseline_id is not None:
+                return hist.manifest(baseline_id), baseline_id, ""
+        except history.HistoryError as exc:
+            note = "history: %s - reading the JSON baseline instead" % exc
     cached = manifest.load(cache_path)
     if not cached:
-        return {}
-    here = manifest.destination_of(cfg)
+        return {}, None, note
     there = cached.get("destination", "")
     if there and there != here:
-        return {}
-    return cached
+        return {}, None, note
+    return cached, None, note
+
+
+def _delta_plan(cfg, previous, remote, change, generated, force):
+    """(Delta, "") when only the change set needs to travel, else (None, why).
+
+    The diff is only a safe transfer list if it was taken against what the drive
+    actually holds: the drive's own manifest must exist, name this destination,
+    and agree file-for-file with the baseline we diffed against.
+    """
+    if force:
+        return None, "--force"
+    if not remote:
+        return None, "no manifest on the drive"
+    if remote.get("destination", "") not in ("", manifest.destination_of(cfg)):
+        return None, "drive manifest is for another destination"
+    if _digests(remote) != _digests(previous):
+        return None, "drive manifest differs from the last publish"
+    name = cfg["manifest"]["filename"] if cfg["manifest"].get("enabled") else ""
+    upload = set(change.added) | set(change.changed)
+    upload |= {dest for dest in generated if dest != name}
+    remove = list(change.removed) if cfg["delivery"].get("delete_extraneous") else []
+    return delivery.Delta(sorted(upload), sorted(remove), [name] if name else []), ""
+
+
+def _widen_for_journal(cfg, plan, journal, man, generated):
+    """`plan` plus every path an interrupted delivery touched.
+
+    The diff is taken against the old baseline, but the destination may hold
+    journaled content newer than it - even content the sources have since gone
+    back on. Journaled paths are re-sent (the journal skips those already
+    holding this manifest's hash) and journaled files no longer published are
+    removed again.
+    """
+    files = man["files"]
+    touched = journal.touched()
+    upload = set(plan.upload) | {dest for dest in touched if dest in files}
+    remove = set(plan.remove)
+    if cfg["delivery"].get("delete_extraneous"):
+        remove |= {dest for dest in touched if dest not in files and dest not in generated}
+    return plan._replace(upload=sorted(upload), remove=sorted(remove))
+
+
+def _digests(man: dict) -> dict:
+    return {
+        dest: meta.get("sha256")
+        for dest, meta in (man.get("files") or {}).items()
+        if isinstance(meta, dict)
+    }
 
 
 def _fetch_remote_manifest(cfg: dict) -> dict:
     """Best-effort read of the manifest already on the Shared Drive.
 
-    Only used when the local cache is missing (fresh clone, CI runner). A failure
-    here just means a full re-upload comparison, never a broken publish.
+    Used when the local cache is missing (fresh clone, CI runner) and, for delta
+    delivery, to confirm the baseline. A failure here just means a full
+    checksum comparison, never a broken publish.
     """
     rc = cfg["delivery"]["rclone"]
     exe = delivery.rclone_exe(cfg)
@@ -10,6 +10,9 @@ bpy-free and filesystem-read-only.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
 import os
 import re
 from typing import NamedTuple
@@ -29,13 +32,16 @@ class Selection(NamedTuple):
     per_scope: dict  # scope name -> file count
 
 
-def _glob_to_regex(pattern: str) -> re.Pattern:
-    """Compile a glob with `**` support into a regex matched against a posix path.
+_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+def _glob_body(pattern: str) -> str:
+    """A glob with `**` support as an (unanchored) regex for a posix path.
 
     `**` crosses directory separators, `*` and `?` do not - the usual gitignore
     reading, which is what the config patterns are written against.
     """
-    out = ["^"]
+    out = []
     i = 0
     n = len(pattern)
     while i < n:
@@ -58,8 +64,12 @@ def _glob_to_regex(pattern: str) -> re.Pattern:
             continue
         out.append(re.escape(ch))
         i += 1
-    out.append("$")
-    return re.compile("".join(out), re.IGNORECASE if os.name == "nt" else 0)
+    return "".join(out)
+
+
+@functools.lru_cache(maxsize=None)
+def _glob_to_regex(pattern: str) -> re.Pattern:
+    return re.compile("^%s$" % _glob_body(pattern), _FLAGS)
 
 
 def matches(rel_posix: str, pattern: str) -> bool:
@@ -74,26 +84,187 @@ def matches(rel_posix: str, pattern: str) -> bool:
 
 
 def matches_any(rel_posix: str, patterns: list) -> bool:
-    return any(matches(rel_posix, p) for p in patterns or [])
-
-
-def _walk_files(base: str, recursive: bool) -> list:
-    """Relative posix paths of every file under `base`."""
-    found = []
-    if not os.path.isdir(base):
-        return found
-    if not recursive:
-        for name in sorted(os.listdir(base)):
-            if os.path.isfile(os.path.join(base, name)):
-                found.append(name)
-        return found
-    for root, dirnames, filenames in os.walk(base):
-        dirnames.sort()
-        for name in sorted(filenames):
-            abs_path = os.path.join(root, name)
-            rel = os.path.relpath(abs_path, base).replace(os.sep, "/")
-            found.append(rel)
-    return found
+    return compile_patterns(patterns).match(rel_posix)
+
+
+def _alternation(bodies: list):
+    if not bodies:
+        return None
+    return re.compile("^(?:%s)$" % "|".join("(?:%s)" % b for b in bodies), _FLAGS)
+
+
+class PatternSet(NamedTuple):
+    """A list of globs compiled once per scope instead of once per file.
+
+    `full` holds the patterns with a `/` (matched against the whole relative
+    path), `base` the bare ones (matched against the basename). The other two
+    let a walk skip whole directories unread: `dirs` matches a directory every
+    path under which is covered (the `X/**` patterns minus `/**`), `prefixes`
+    holds the per-segment folder regexes of fixed-depth patterns (None when a
+    bare or `**` pattern can match at any depth).
+    """
+
+    full: object
+    base: object
+    dirs: object
+    prefixes: object
+
+    def match(self, rel_posix: str) -> bool:
+        if self.full is not None and self.full.match(rel_posix):
+            return True
+        return self.base is not None and self.base.match(rel_posix.rsplit("/", 1)[-1]) is not None
+
+    def covers_dir(self, rel_posix: str) -> bool:
+        return self.dirs is not None and self.dirs.match(rel_posix) is not None
+
+    def reaches_into(self, rel_posix: str) -> bool:
+        """Whether some pattern could match a path inside folder `rel_posix`."""
+        if self.prefixes is None:
+            return True
+        parts = rel_posix.split("/")
+        return any(
+            len(parts) <= len(folders) and all(r.match(p) for r, p in zip(folders, parts))
+            for folders in self.prefixes
+        )
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(patterns: tuple) -> PatternSet:
+    full = [_glob_body(p) for p in patterns if "/" in p]
+    base = [_glob_body(p) for p in patterns if "/" not in p]
+    dirs = [_glob_body(p[:-3]) for p in patterns if p.endswith("/**") and len(p) > 3]
+    prefixes = None
+    if patterns and all("/" in p and "**" not in p for p in patterns):
+        prefixes = tuple(
+            tuple(re.compile("^%s$" % _glob_body(seg), _FLAGS) for seg in p.split("/")[:-1])
+            for p in patterns
+        )
+    return PatternSet(_alternation(full), _alternation(base), _alternation(dirs), prefixes)
+
+
+def compile_patterns(patterns) -> PatternSet:
+    return _compile(tuple(patterns or ()))
+
+
+def _walk_files(base: str, recursive: bool, include: PatternSet = None,
+                exclude: PatternSet = None):
+    """(relative posix path, DirEntry) for every file under `base`.
+
+    Folders no `include` pattern can reach into, or that `exclude` rules out as
+    a whole, are never listed, and each DirEntry carries the stat the listing
+    already paid for. Symlinked folders are not followed, as with `os.walk`.
+    """
+    stack = [("", base)]
+    while stack:
+        prefix, folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield rel, entry
+            elif recursive and not entry.is_symlink():
+                if include is not None and not include.reaches_into(rel):
+                    continue
+                if exclude is not None and exclude.covers_dir(rel):
+                    continue
+                subdirs.append((rel + "/", entry.path))
+        stack.extend(reversed(subdirs))
+
+
+def fingerprint(cfg: dict) -> str:
+    """A digest of everything that decides what `select` picks.
+
+    Stored in the manifest so a later run knows whether that manifest's file
+    list is still a valid starting point (see `select_changed`).
+    """
+    basis = {
+        "repo_root": os.path.normcase(os.path.abspath(cfg["source"]["repo_root"])),
+        "entries": [e for e in cfg.get("scope", {}).get("entries", []) if e.get("enabled")],
+    }
+    blob = json.dumps(basis, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _dest_for(entry: dict, rel: str) -> str:
+    """The destination of scope-relative `rel` under `entry`, or "" if unclaimed."""
+    if not entry.get("recursive") and "/" in rel:
+        return ""
+    if not compile_patterns(entry.get("include")).match(rel):
+        return ""
+    if compile_patterns(entry.get("exclude")).match(rel):
+        return ""
+    dest_root = (entry.get("dest") or "").strip("/")
+    leaf = rel.rsplit("/", 1)[-1] if entry.get("flatten") else rel
+    return "%s/%s" % (dest_root, leaf) if dest_root else leaf
+
+
+def claims(cfg: dict, path: str) -> bool:
+    """Whether repo-relative `path` falls under some enabled scope's rules
+    (whether or not it exists right now)."""
+    for entry in cfg.get("scope", {}).get("entries", []):
+        if not entry.get("enabled"):
+            continue
+        base = (entry.get("src") or "").replace(os.sep, "/").strip("/")
+        if base and not path.startswith(base + "/"):
+            continue
+        if _dest_for(entry, path[len(base) + 1:] if base else path):
+            return True
+    return False
+
+
+def select_changed(cfg: dict, previous: dict, changed: list) -> Selection:
+    """`select`, recomputed only for `changed` repo-relative paths.
+
+    Every file of the `previous` manifest whose source is not in `changed` is
+    carried over as-is (size from the manifest, no stat); each changed path is
+    stat'ed and run through the scope rules, so edits, additions and deletions
+    land exactly where a full walk would put them. The caller guarantees that
+    `previous` was selected with the same `fingerprint` and that `changed`
+    covers every path that could differ.
+    """
+    repo_root = cfg["source"]["repo_root"]
+    touched = set(changed)
+    entries = [e for e in cfg.get("scope", {}).get("entries", []) if e.get("enabled")]
+    files = []
+    warnings = []
+
+    for dest, meta in (previous.get("files") or {}).items():
+        source = meta.get("source")
+        if not source or meta.get("scope") == "generated" or source in touched:
+            continue
+        src_abs = os.path.join(repo_root, source.replace("/", os.sep))
+        files.append(SelectedFile(src_abs, dest, meta.get("scope", ""), meta.get("size", 0), 0.0))
+
+    for path in sorted(touched):
+        src_abs = os.path.join(repo_root, path.replace("/", os.sep))
+        for entry in entries:
+            base = (entry.get("src") or "").replace(os.sep, "/").strip("/")
+            if base and not path.startswith(base + "/"):
+                continue
+            dest = _dest_for(entry, path[len(base) + 1:] if base else path)
+            if not dest:
+                continue
+            try:
+                stat = os.stat(src_abs)
+            except OSError:
+                break      # deleted since: simply no longer selected
+            files.append(SelectedFile(
+                src_abs, dest, entry.get("name") or "<unnamed>", stat.st_size, stat.st_mtime
+            ))
+
+    per_scope = {e.get("name") or "<unnamed>": 0 for e in entries}
+    for item in files:
+        per_scope[item.scope] = per_scope.get(item.scope, 0) + 1
+    return _finish(files, warnings, per_scope)
 
 
 def select(cfg: dict) -> Selection:
@@ -113,27 +284,22 @@ def select(cfg: dict) -> Selection:
             per_scope[name] = 0
             continue
 
-        include = entry.get("include") or []
-        exclude = entry.get("exclude") or []
-        dest_root = (entry.get("dest") or "").strip("/")
-        flatten = bool(entry.get("flatten"))
-
         count = 0
-        for rel in _walk_files(base, bool(entry.get("recursive"))):
-            if not matches_any(rel, include):
-                continue
-            if matches_any(rel, exclude):
+        walk = _walk_files(
+            base, bool(entry.get("recursive")),
+            compile_patterns(entry.get("include")), compile_patterns(entry.get("exclude")),
+        )
+        for rel, dir_entry in walk:
+            dest_rel = _dest_for(entry, rel)
+            if not dest_rel:
                 continue
-            src_abs = os.path.join(base, rel.replace("/", os.sep))
-            leaf = rel.rsplit("/", 1)[-1] if flatten else rel
-            dest_rel = "%s/%s" % (dest_root, leaf) if dest_root else leaf
             try:
-                stat = os.stat(src_abs)
+                stat = dir_entry.stat()
             except OSError as exc:
-                warnings.append("scope '%s': cannot stat %s (%s)" % (name, src_abs, exc))
+                warnings.append("scope '%s': cannot stat %s (%s)" % (name, dir_entry.path, exc))
                 continue
             files.append(
-                SelectedFile(src_abs, dest_rel, name, stat.st_size, stat.st_mtime)
+                SelectedFile(dir_entry.path, dest_rel, name, stat.st_size, stat.st_mtime)
             )
             count += 1
 
@@ -144,6 +310,10 @@ def select(cfg: dict) -> Selection:
             )
         per_scope[name] = count
 
+    return _finish(files, warnings, per_scope)
+
+
+def _finish(files: list, warnings: list, per_scope: dict) -> Selection:
     files.sort(key=lambda f: f.dest.lower())
 
     # Flatten can silently collapse two sources onto one destination; that would
@@ -6,12 +6,19 @@ through `run` so that dry-run, logging and error handling behave identically.
 
 from __future__ import annotations
 
+import json
 import os
 import re
 import shutil
+import signal
+import socket
 import subprocess
+import time
 from typing import NamedTuple
 
+# Exit code for "no daemon answered", distinct from a command's own failures.
+UNREACHABLE = 111
+
 
 class Completed(NamedTuple):
     code: int
@@ -44,6 +51,79 @@ def run(cmd: list, *, cwd: str = None, env: dict = None, timeout: int = None) ->
     return Completed(proc.returncode, proc.stdout or "", proc.stderr or "", list(cmd))
 
 
+def spawn_detached(cmd: list, log_path: str) -> subprocess.Popen:
+    """Fire and forget: the child outlives this process and its console."""
+    kwargs = {}
+    if os.name == "nt":
+        kwargs["creationflags"] = (
+            getattr(subprocess, "DETACHED_PROCESS", 0)
+            | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)
+        )
+    else:
+        kwargs["start_new_session"] = True
+    with open(log_path, "w", encoding="utf-8") as log:
+        return subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT, **kwargs
+        )
+
+
+def terminate(pid: int) -> None:
+    """Best-effort kill of a process we started earlier (maybe long gone)."""
+    try:
+        os.kill(int(pid), signal.SIGTERM)
+    except (OSError, ValueError, TypeError):
+        pass
+
+
+# --- persistent-worker client --------------------------------------------------
+
+def read_state(state_path: str) -> dict:
+    """The state file a daemon writes on startup ({} if absent or unreadable)."""
+    try:
+        with open(state_path, "r", encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) and data.get("port") else {}
+
+
+def request(state_path: str, message: dict, *, timeout: int = None) -> Completed:
+    """Send one JSON request to a localhost daemon and collect its whole reply.
+
+    The daemon is described by its state file (port + token). Returns the same
+    `Completed` shape as `run`, so callers parse the output identically: code
+    UNREACHABLE when no daemon is listening, 124 on timeout, 0 otherwise.
+    """
+    state = read_state(state_path)
+    cmd = ["daemon", state_path]
+    if not state:
+        return Completed(UNREACHABLE, "", "no daemon state at %s" % state_path, cmd)
+    deadline = time.monotonic() + timeout if timeout else None
+    chunks = []
+    try:
+        with socket.create_connection(("127.0.0.1", int(state["port"])), timeout=5) as conn:
+            line = json.dumps(dict(message, token=state.get("token", ""))) + "\n"
+            conn.sendall(line.encode("utf-8"))
+            while True:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise socket.timeout()
+                    conn.settimeout(remaining)
+                else:
+                    conn.settimeout(None)
+                data = conn.recv(65536)
+                if not data:
+                    break
+                chunks.append(data)
+    except socket.timeout:
+        out = b"".join(chunks).decode("utf-8", "replace")
+        return Completed(124, out, "timed out after %ss" % timeout, cmd)
+    except (OSError, ValueError) as exc:
+        return Completed(UNREACHABLE, "", "daemon unreachable: %s" % exc, cmd)
+    return Completed(0, b"".join(chunks).decode("utf-8", "replace"), "", cmd)
+
+
 def which(name: str) -> str:
     return shutil.which(name) or ""
 
@@ -96,6 +176,34 @@ def git_info(repo_root: str) -> dict:
     return info
 
 
+def git_changes_since(repo_root: str, commit: str):
+    """(changed, dirty) repo-relative posix paths since `commit`, or None.
+
+    `changed` covers commits between `commit` and HEAD; `dirty` is what
+    `git status` reports now, untracked and ignored files included - a scope may
+    well select a file `.gitignore` matches. None whenever git cannot
+    vouch for the answer - no baseline, a baseline that is no longer an ancestor
+    of HEAD (rebase, reset, force-push), or submodules, whose contents a
+    superproject diff does not list.
+    """
+    if not commit or not os.path.isdir(os.path.join(repo_root, ".git")):
+        return None
+    if os.path.isfile(os.path.join(repo_root, ".gitmodules")):
+        return None
+    if not run(["git", "merge-base", "--is-ancestor", commit, "HEAD"], cwd=repo_root).ok:
+        return None
+    diff = run(["git", "diff", "--name-only", "--no-renames", "-z", commit, "HEAD"],
+               cwd=repo_root)
+    status = run(["git", "status", "--porcelain", "-z", "--no-renames",
+                  "--untracked-files=all", "--ignored"], cwd=repo_root)
+    if not diff.ok or not status.ok:
+        return None
+    changed = sorted(p for p in diff.out.split("\0") if p)
+    # Porcelain v1 with -z: "XY <path>\0" per entry, no quoting.
+    dirty = sorted(entry[3:] for entry in status.out.split("\0") if len(entry) > 3)
+    return changed, dirty
+
+
 def current_branch(repo_root: str) -> str:
     res = run(["git", "rev-parse", "--abbrev-ref", "HEAD"], cwd=repo_root)
     return res.out.strip() if res.ok else ""
@@ -0,0 +1,458 @@
+"""Watch mode: publish within seconds of a save instead of at the next push.
+
+`library-publisher watch` stays running, watches every enabled scope folder and
+turns each burst of saves into one publish of just the touched paths:
+
+- on Linux the folders are watched with inotify (through ctypes - no extra
+  dependency); anywhere else, or when inotify is unavailable, the scope trees
+  are re-stat'ed every `triggers.watch.poll_interval` seconds;
+- paths no scope claims (`.blend1` backups, `archive/`, addon source) never
+  wake the publisher;
+- a burst is published once it has been quiet for `debounce_seconds`, or
+  `max_delay_seconds` after its first save, whichever comes first - a long
+  batch save cannot starve the drive;
+- the publish is given the touched paths (`publish(changed=...)`) and one hash
+  cache kept in memory, so it neither walks the scopes nor re-stats the library.
+
+Queue depth and last-publish latency are printed and kept in
+`.last_publish/watch_status.json` for anything that wants to show them.
+
+bpy-free.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+from . import manifest, publish, selection
+
+WATCH_STATUS_FILENAME = "watch_status.json"
+
+BACKENDS = ("auto", "inotify", "poll")
+
+# A full rescan is needed (inotify queue overflow, a watched root vanished).
+RESCAN = None
+
+
+def _rel(repo_root: str, path: str) -> str:
+    return os.path.relpath(path, repo_root).replace(os.sep, "/")
+
+
+def _catalog_rel(cfg: dict) -> str:
+    return _rel(cfg["source"]["repo_root"], publish.catalog_source_path(cfg))
+
+
+class _Root:
+    """One watched scope folder and the rules for descending into it."""
+
+    def __init__(self, path: str, recursive: bool, include, exclude):
+        self.path = path
+        self.recursive = recursive
+        self.include = include
+        self.exclude = exclude
+
+    def wants_dir(self, path: str) -> bool:
+        """Whether folder `path` (at or below this root) is worth watching."""
+        if path == self.path:
+            return True
+        if not self.recursive or not path.startswith(self.path + os.sep):
+            return False
+        rel = _rel(self.path, path)
+        return self.include.reaches_into(rel) and not self.exclude.covers_dir(rel)
+
+
+def watch_roots(cfg: dict) -> list:
+    repo_root = cfg["source"]["repo_root"]
+    roots = []
+    for entry in cfg.get("scope", {}).get("entries", []):
+        if not entry.get("enabled"):
+            continue
+        roots.append(_Root(
+            os.path.normpath(os.path.join(repo_root, entry.get("src", ""))),
+            bool(entry.get("recursive")),
+            selection.compile_patterns(entry.get("include")),
+            selection.compile_patterns(entry.get("exclude")),
+        ))
+    # The catalog file is republished on every run; its folder is watched
+    # (not recursively) so a catalog-only edit still triggers one.
+    roots.append(_Root(
+        os.path.dirname(publish.catalog_source_path(cfg)), False,
+        selection.compile_patterns([]), selection.compile_patterns([]),
+    ))
+    return roots
+
+
+def _dirs_under(root: _Root, start: str):
+    """`start` and every folder below it that `root` wants watched."""
+    stack = [start]
+    while stack:
+        folder = stack.pop()
+        if not root.wants_dir(folder):
+            continue
+        yield folder
+        if not root.recursive:
+            continue
+        try:
+            with os.scandir(folder) as it:
+                stack.extend(e.path for e in it if e.is_dir() and not e.is_symlink())
+        except OSError:
+            pass
+
+
+class Relevance:
+    """Decides which touched paths can change what gets published."""
+
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        self.catalog = _catalog_rel(cfg)
+
+    def __call__(self, path: str) -> bool:
+        return path == self.catalog or selection.claims(self.cfg, path)
+
+
+# --- watchers ----------------------------------------------------------------
+
+class PollWatcher:
+    """Re-stat the scope trees every `interval` seconds and report differences."""
+
+    name = "poll"
+
+    def __init__(self, cfg: dict, interval: float = 2.0):
+        self.repo_root = cfg["source"]["repo_root"]
+        self.roots = watch_roots(cfg)
+        self.interval = interval
+        self._next = time.monotonic() + interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> dict:
+        found = {}
+        for root in self.roots:
+            for folder in _dirs_under(root, root.path):
+                try:
+                    with os.scandir(folder) as it:
+                        for entry in it:
+                            try:
+                                if entry.is_dir():
+                                    continue
+                                st = entry.stat()
+                            except OSError:
+                                continue
+                            found[_rel(self.repo_root, entry.path)] = (
+                                st.st_size, st.st_mtime_ns, st.st_ino
+                            )
+                except OSError:
+                    continue
+        return found
+
+    def wait(self, timeout: float):
+        """Paths that changed, waiting up to `timeout` seconds for a rescan."""
+        delay = self._next - time.monotonic()
+        if delay > timeout:
+            time.sleep(max(0.0, timeout))
+            return set()
+        time.sleep(max(0.0, delay))
+        self._next = time.monotonic() + self.interval
+        now = self._scan()
+        before, self._snapshot = self._snapshot, now
+        return {p for p in set(before) | set(now) if before.get(p) != now.get(p)}
+
+    def close(self) -> None:
+        pass
+
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MASK = (_IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+            | _IN_DELETE_SELF | _IN_MOVE_SELF)
+_IN_EVENT = struct.Struct("iIII")
+
+
+def _libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def inotify_available() -> bool:
+    return _libc() is not None
+
+
+class InotifyWatcher:
+    """Kernel change notifications for every folder a scope can select from.
+
+    Blender saves by writing `name.blend@` and renaming it over the original,
+    so both close-after-write and moved-in count as a save. A folder created
+    inside a recursive scope is watched from then on, and files already in it
+    are reported. A queue overflow reports RESCAN.
+    """
+
+    name = "inotify"
+
+    def __init__(self, cfg: dict):
+        self.repo_root = cfg["source"]["repo_root"]
+        self.roots = watch_roots(cfg)
+        self._libc = _libc()
+        if self._libc is None:
+            raise OSError("inotify is not available on this platform")
+        self.fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs = {}       # watch descriptor -> folder
+        for root in self.roots:
+            for folder in _dirs_under(root, root.path):
+                self._add(folder)
+
+    def _add(self, folder: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(folder), _IN_MASK)
+        if wd >= 0:
+            self._dirs[wd] = folder
+
+    def _new_dir(self, path: str, touched: set) -> None:
+        for root in self.roots:
+            if not root.wants_dir(path):
+                continue
+            for folder in _dirs_under(root, path):
+                self._add(folder)
+                try:
+                    with os.scandir(folder) as it:
+                        touched.update(
+                            _rel(self.repo_root, e.path) for e in it if e.is_file()
+                        )
+                except OSError:
+                    pass
+
+    def wait(self, timeout: float):
+        ready, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if not ready:
+            return set()
+        touched = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _IN_EVENT.unpack_from(data, offset)
+                offset += _IN_EVENT.size
+                name = data[offset:offset + length].split(b"\0", 1)[0]
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    return RESCAN
+                folder = self._dirs.get(wd)
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if folder is None:
+                    continue
+                if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                    if any(folder == r.path for r in self.roots):
+                        return RESCAN
+                    continue
+                path = os.path.join(folder, os.fsdecode(name))
+                if mask & _IN_ISDIR:
+                    if mask & (_IN_CREATE | _IN_MOVED_TO):
+                        self._new_dir(path, touched)
+                    elif mask & (_IN_MOVED_FROM | _IN_DELETE):
+                        # Whatever was published from in there is gone now.
+                        return RESCAN
+                    continue
+                if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_MOVED_FROM | _IN_DELETE):
+                    touched.add(_rel(self.repo_root, path))
+        return touched
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def make_watcher(cfg: dict):
+    conf = cfg.get("triggers", {}).get("watch", {})
+    backend = conf.get("backend", "auto")
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(cfg)
+        except OSError:
+            if backend == "inotify":
+                raise
+    return PollWatcher(cfg, float(conf.get("poll_interval", 2.0)))
+
+
+# --- debouncing --------------------------------------------------------------
+
+class Debouncer:
+    """Collects touched paths until a burst is over.
+
+    Due once nothing new arrived for `quiet` seconds, or `max_delay` seconds
+    after the burst's first path, whichever is sooner.
+    """
+
+    def __init__(self, quiet: float, max_delay: float):
+        self.quiet = quiet
+        self.max_delay = max_delay
+        self.paths = set()
+        self.full = False
+        self.first = None
+        self.last = None
+
+    @property
+    def depth(self) -> int:
+        return len(self.paths) + (1 if self.full and not self.paths else 0)
+
+    def add(self, paths, now: float) -> None:
+        if paths is RESCAN:
+            self.full = True
+        elif not paths:
+            return
+        else:
+            self.paths.update(paths)
+        if self.first is None:
+            self.first = now
+        self.last = now
+
+    def timeout(self, now: float, idle: float) -> float:
+        """How long the watcher may block before the burst falls due."""
+        if self.first is None:
+            return idle
+        due = min(self.last + self.quiet, self.first + self.max_delay)
+        return max(0.0, due - now)
+
+    def due(self, now: float) -> bool:
+        return self.first is not None and self.timeout(now, 0.0) <= 0.0
+
+    def carry_over(self, paths) -> None:
+        """Hold a failed burst's paths for the next one without making it due:
+        the next save publishes them too, instead of a retry loop against an
+        unreachable destination."""
+        if paths is RESCAN:
+            self.full = True
+        else:
+            self.paths.update(paths)
+
+    def drain(self):
+        """(sorted paths or RESCAN, time of the first event)"""
+        paths = RESCAN if self.full else sorted(self.paths)
+        first = self.first
+        self.paths, self.full, self.first, self.last = set(), False, None, None
+        return paths, first
+
+
+# --- the loop ----------------------------------------------------------------
+
+def status_path(tool_root: str) -> str:
+    return os.path.join(tool_root, publish.CACHE_DIRNAME, WATCH_STATUS_FILENAME)
+
+
+def _write_status(tool_root: str, status: dict) -> None:
+    path = status_path(tool_root)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(status, fh, indent=1)
+            fh.write("\n")
+        os.replace(tmp, path)
+    except OSError:
+        pass      # status is for display only
+
+
+def run(cfg: dict, tool_root: str, *, watcher=None, out=print, max_publishes: int = 0,
+        clock=time.monotonic) -> int:
+    """Publish once, then after every burst of relevant saves, until interrupted
+    (or after `max_publishes` runs, for tests)."""
+    conf = cfg.get("triggers", {}).get("watch", {})
+    debounce = Debouncer(
+        float(conf.get("debounce_seconds", 2.0)), float(conf.get("max_delay_seconds", 20.0))
+    )
+    relevant = Relevance(cfg)
+    watcher = watcher or make_watcher(cfg)
+    hashes = manifest.HashCache(
+        os.path.join(tool_root, publish.CACHE_DIRNAME, manifest.HASH_CACHE_FILENAME)
+    )
+    status = {"backend": watcher.name, "state": "starting", "queue_depth": 0,
+              "publishes": 0, "last": {}}
+
+    def publish_now(paths, first):
+        status.update(state="publishing", queue_depth=0)
+        _write_status(tool_root, status)
+        started = clock()
+        result = publish.publish(
+            cfg, tool_root, reason="watch", hashes=hashes,
+            changed=None if paths is RESCAN else paths,
+        )
+        finished = clock()
+        status["publishes"] += 1
+        status["last"] = {
+            "finished_utc": manifest.utc_stamp(),
+            "ok": result.ok,
+            "delivered": result.delivered,
+            "paths": "all" if paths is RESCAN else len(paths),
+            "summary": result.diff.summary() if result.ok else result.reason,
+            "publish_seconds": round(finished - started, 3),
+            # What an artist waits for: first save of the burst -> on the drive.
+            "latency_seconds": round(finished - first, 3),
+        }
+        status.update(state="watching")
+        _write_status(tool_root, status)
+        out("[watch] %s in %.2fs, %.2fs after the first save (%s)" % (
+            ("published" if result.delivered else "up to date") if result.ok else "FAILED",
+            finished - started, finished - first, status["last"]["summary"],
+        ))
+        if not result.ok:
+            out("\n".join(result.lines))
+            # The baseline did not move, and the next incremental run re-checks
+            # only the paths it is given - so this burst's paths go with it.
+            debounce.carry_over(paths)
+            status.update(queue_depth=debounce.depth)
+            _write_status(tool_root, status)
+
+    try:
+        out("[watch] %s watcher on %d folder root(s); debounce %.1fs, max delay %.1fs" % (
+            watcher.name, len(watcher.roots), debounce.quiet, debounce.max_delay,
+        ))
+        publish_now(RESCAN, clock())
+        while not max_publishes or status["publishes"] < max_publishes:
+            touched = watcher.wait(debounce.timeout(clock(), 1.0))
+            if touched is not RESCAN:
+                touched = {p for p in touched if relevant(p)}
+            depth = debounce.depth
+            debounce.add(touched, clock())
+            if debounce.depth != depth:
+                status.update(state="waiting", queue_depth=debounce.depth)
+                _write_status(tool_root, status)
+                out("[watch] queue depth %d" % debounce.depth)
+            if debounce.due(clock()):
+                publish_now(*debounce.drain())
+    except KeyboardInterrupt:
+        out("[watch] stopped")
+    finally:
+        watcher.close()
+        status.update(state="stopped", queue_depth=debounce.depth)
+        _write_status(tool_root, status)
+    return 0
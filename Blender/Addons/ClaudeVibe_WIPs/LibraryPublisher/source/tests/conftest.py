@@ -1,8 +1,129 @@
-"""Put `source/` on sys.path so tests import `core.*` without installing anything."""
+"""Put `source/` on sys.path so tests import `core.*` without installing anything,
+and build the synthetic .blend files the reader tests need."""
 
+import gzip
 import os
+import struct
 import sys
 
+import pytest
+
 SOURCE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if SOURCE_DIR not in sys.path:
     sys.path.insert(0, SOURCE_DIR)
+
+
+# --- synthetic .blend files ----------------------------------------------------
+
+_BLEND_STRUCTS = (
+    ("ListBase", (("void", "*first"), ("void", "*last"))),
+    ("ID", (
+        ("void", "*next"), ("void", "*prev"), ("Library", "*lib"),
+        ("AssetMetaData", "*asset_data"), ("void", "*override_library"), ("char", "name[66]"),
+    )),
+    ("Library", (("ID", "id"), ("char", "name[1024]"))),
+    ("bUUID", (("char", "bytes[16]"),)),
+    ("AssetMetaData", (("bUUID", "catalog_id"), ("char", "catalog_simple_name[64]"))),
+    ("Image", (
+        ("ID", "id"), ("char", "filepath[1024]"), ("PackedFile", "*packedfile"),
+        ("ListBase", "packedfiles"),
+    )),
+)
+
+
+def _blend_sdna(endian, ptr):
+    types = ["char", "void", "PackedFile"] + [name for name, _ in _BLEND_STRUCTS]
+    lengths = {"char": 1, "void": 0, "PackedFile": 0}
+    names = []
+    strc = []
+    for name, fields in _BLEND_STRUCTS:
+        size = 0
+        pairs = []
+        for ftype, fname in fields:
+            if fname not in names:
+                names.append(fname)
+            pairs += [types.index(ftype), names.index(fname)]
+            count = int(fname.split("[")[1][:-1]) if "[" in fname else 1
+            size += (ptr if fname.startswith("*") else lengths[ftype]) * count
+        lengths[name] = size
+        strc.append(struct.pack("%s%dh" % (endian, 2 + len(pairs)), types.index(name),
+                                len(fields), *pairs))
+
+    def block(tag, items):
+        raw = b"".join(s.encode() + b"\0" for s in items)
+        raw = tag + struct.pack(endian + "i", len(items)) + raw
+        return raw + b"\0" * (-len(raw) % 4)
+
+    tlen = struct.pack("%s%dh" % (endian, len(types)), *(lengths[t] for t in types))
+    tlen += b"\0" * (-len(tlen) % 4)
+    sdna = b"SDNA" + block(b"NAME", names) + block(b"TYPE", types) + b"TLEN" + tlen
+    sdna += b"STRC" + struct.pack(endian + "i", len(strc)) + b"".join(strc)
+    return sdna, lengths
+
+
+def make_blend(path, *, assets=(), libraries=(), images=(), large=False,
+               compress="", endian="<"):
+    """Write a minimal .blend the `core.blendfile` reader can parse.
+
+    assets: (code, name, catalog_uuid_or_"", linked); libraries: filepaths;
+    images: (filepath, packed).
+    """
+    ptr = 8
+    sdna, lengths = _blend_sdna(endian, ptr)
+    if large:
+        head = b"BLENDER17-01" + (b"v" if endian == "<" else b"V") + b"0500"
+        bhead = struct.Struct(endian + "4siQqq")
+    else:
+        head = b"BLENDER-" + (b"v" if endian == "<" else b"V") + b"405"
+        bhead = struct.Struct(endian + "4siQii")
+
+    def block(code, payload, old):
+        if large:
+            return bhead.pack(code, 0, old, len(payload), 1) + payload
+        return bhead.pack(code, len(payload), old, 0, 1) + payload
+
+    def pointer(value):
+        return struct.pack(endian + "Q", value)
+
+    def id_struct(name, lib=0, asset=0):
+        raw = pointer(0) + pointer(0) + pointer(lib) + pointer(asset) + pointer(0)
+        return raw + name.encode().ljust(66, b"\0")
+
+    out = [head, block(b"REND", b"\0" * 32, 1), block(b"GLOB", b"\0" * 4096, 2)]
+    old = 0x1000
+    for filepath in libraries:
+        old += 0x100
+        out.append(block(b"LI\0\0", id_struct("LI" + os.path.basename(filepath))
+                         + filepath.encode().ljust(1024, b"\0"), old))
+    for code, name, catalog, linked in assets:
+        old += 0x100
+        meta = old + 0x10
+        out.append(block(code.encode() + b"\0\0", id_struct(
+            code + name, lib=0x1100 if linked else 0, asset=meta
+        ) + b"\0" * 256, old))
+        uuid = bytes.fromhex(catalog.replace("-", "")) if catalog else b"\0" * 16
+        if catalog:
+            low, mid, hi = struct.unpack(">IHH", uuid[:8])
+            uuid = struct.pack(endian + "IHH", low, mid, hi) + uuid[8:]
+        out.append(block(b"DATA", uuid + b"simple".ljust(64, b"\0"), meta))
+    for filepath, packed in images:
+        old += 0x100
+        out.append(block(b"IM\0\0", id_struct("IMimage") + filepath.encode().ljust(1024, b"\0")
+                         + pointer(0x9000 if packed else 0) + pointer(0) + pointer(0), old))
+    out.append(block(b"DATA", os.urandom(200_000), 3))  # a mesh-sized payload to skip
+    out.append(block(b"DNA1", sdna, 4))
+    out.append(block(b"ENDB", b"", 0))
+    data = b"".join(out)
+    if compress == "gzip":
+        data = gzip.compress(data)
+    elif compress == "zstd":
+        import zstandard
+        data = zstandard.ZstdCompressor().compress(data)
+    with open(path, "wb") as fh:
+        fh.write(data)
+    return str(path)
+
+
+@pytest.fixture()
+def blend_writer():
+    return make_blend
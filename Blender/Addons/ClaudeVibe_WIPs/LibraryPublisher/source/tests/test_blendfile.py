@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from core import blendfile
+
+CAT = "f9ab2fa9-3a4e-491a-abaa-558cd5c029d0"
+
+
+def _sample(tmp_path, blend_writer, **kw):
+    (tmp_path / "textures").mkdir()
+    (tmp_path / "textures" / "here.png").write_bytes(b"png")
+    (tmp_path / "libs").mkdir()
+    (tmp_path / "libs" / "shared.blend").write_bytes(b"blend")
+    return blend_writer(
+        tmp_path / "GN_Sample.blend",
+        assets=[
+            ("NT", "GN_Bend", CAT, False),
+            ("MA", "M_Plain", "", False),
+            ("NT", "GN_Linked", CAT, True),
+        ],
+        libraries=[
+            "//libs/shared.blend",
+            "/abs/elsewhere.blend",
+            "/opt/blender/5.0/datafiles/assets/nodes/essentials.blend",
+        ],
+        images=[
+            ("//textures/here.png", False),
+            ("/lp-missing/textures/gone.png", False),
+            ("/abs/packed.png", True),
+        ],
+        **kw,
+    )
+
+
+def test_reads_assets_libraries_and_missing_files(tmp_path, blend_writer):
+    path = _sample(tmp_path, blend_writer)
+    report = blendfile.inspect_file(path, checks=["asset_marked", "no_external_deps"])
+
+    assert report["assets"] == [
+        {"name": "M_Plain", "collection": "materials", "catalog_id": "",
+         "catalog_simple_name": "simple", "tags": [], "description": ""},
+        {"name": "GN_Bend", "collection": "node_groups", "catalog_id": CAT,
+         "catalog_simple_name": "simple", "tags": [], "description": ""},
+    ]
+    libs = {lib["filepath"]: lib for lib in report["libraries"]}
+    assert libs["//libs/shared.blend"]["exists"] and not libs["//libs/shared.blend"]["is_absolute"]
+    assert libs["/abs/elsewhere.blend"]["is_absolute"] and not libs["/abs/elsewhere.blend"]["exists"]
+    assert libs["/opt/blender/5.0/datafiles/assets/nodes/essentials.blend"]["is_bundled"]
+    assert report["missing_files"] == ["/lp-missing/textures/gone.png"]
+
+
+def test_dependency_facts_only_when_asked_for(tmp_path, blend_writer):
+    report = blendfile.inspect_file(_sample(tmp_path, blend_writer), checks=["asset_marked"])
+    assert set(report) == {"assets"}
+
+
+@pytest.mark.parametrize("variant", [
+    {"large": True},
+    {"compress": "gzip"},
+    {"endian": ">"},
+])
+def test_header_and_compression_variants_read_the_same(tmp_path, blend_writer, variant):
+    (tmp_path / "plain").mkdir()
+    (tmp_path / "other").mkdir()
+    plain = blendfile.inspect_file(
+        _sample(tmp_path / "plain", blend_writer), checks=["no_external_deps"]
+    )
+    other = blendfile.inspect_file(
+        _sample(tmp_path / "other", blend_writer, **variant), checks=["no_external_deps"]
+    )
+    assert other["assets"] == plain["assets"]
+    assert [lib["filepath"] for lib in other["libraries"]] == [
+        lib["filepath"] for lib in plain["libraries"]
+    ]
+    assert [os.path.basename(p) for p in other["missing_files"]] == ["gone.png"]
+
+
+def test_zstd_files_read_when_a_zstd_module_is_available(tmp_path, blend_writer):
+    pytest.importorskip("zstandard")
+    if not blendfile.zstd_available():
+        pytest.skip("no zstd reader")
+    report = blendfile.inspect_file(_sample(tmp_path, blend_writer, compress="zstd"))
+    assert [a["name"] for a in report["assets"]] == ["M_Plain", "GN_Bend"]
+
+
+@pytest.mark.parametrize("content", [b"", b"not a blend at all", b"BLENDER-v405"])
+def test_unreadable_files_raise_for_the_blender_fallback(tmp_path, content):
+    path = tmp_path / "broken.blend"
+    path.write_bytes(content)
+    with pytest.raises(blendfile.BlendFileError):
+        blendfile.inspect_file(str(path))
@@ -159,3 +159,62 @@ def test_criteria_defaults_cover_the_asset_scopes(tmp_path):
     # Addon zips must never pull Blender into a publish.
     for check in crit.values():
         assert "addon_zips" not in check["applies_to"]
+
+
+def test_hash_workers_must_be_a_non_negative_integer(cfg):
+    cfg["manifest"]["hash_workers"] = -1
+    assert any("hash_workers" in p for p in config.validate(cfg))
+    cfg["manifest"]["hash_workers"] = 4
+    assert config.validate(cfg) == []
+
+
+def test_blender_workers_and_timeout_must_be_positive(cfg):
+    cfg["blender"]["workers"] = 0
+    cfg["blender"]["timeout_per_file"] = "slow"
+    problems = config.validate(cfg)
+    assert any("blender.workers" in p for p in problems)
+    assert any("blender.timeout_per_file" in p for p in problems)
+
+
+def test_copy_workers_must_be_a_non_negative_integer(cfg):
+    cfg["delivery"]["local"]["workers"] = True
+    assert any("delivery.local.workers" in p for p in config.validate(cfg))
+
+
+def test_delivery_targets_inherit_the_base_block(cfg):
+    assert config.delivery_targets(cfg) == [("", cfg)]
+    cfg["delivery"]["dry_run"] = True
+    cfg["delivery"]["targets"] = [
+        {"name": "nas", "backend": "copy", "local": {"path": "/mnt/nas/ST3E_Ext"}},
+        {"name": "gdrive", "backend": "rclone"},
+    ]
+    assert config.validate(cfg) == []
+    (nas, nas_cfg), (gd, gd_cfg) = config.delivery_targets(cfg)
+    assert (nas, gd) == ("nas", "gdrive")
+    assert nas_cfg["delivery"]["local"]["path"] == "/mnt/nas/ST3E_Ext"
+    assert nas_cfg["delivery"]["local"]["workers"] == cfg["delivery"]["local"]["workers"]
+    assert gd_cfg["delivery"]["backend"] == "rclone"
+    assert nas_cfg["delivery"]["dry_run"] and gd_cfg["delivery"]["targets"] == []
+
+
+def test_delivery_targets_need_unique_names(cfg):
+    cfg["delivery"]["targets"] = [{"name": "a"}, {"name": "a"}, {}]
+    problems = config.validate(cfg)
+    assert any("unique" in p or "name" in p for p in problems)
+
+
+@pytest.mark.parametrize("name", ["../elsewhere", "a/b", "a\\b", "..", ".", 7])
+def test_delivery_target_names_must_be_safe_folder_names(cfg, name):
+    cfg["delivery"]["targets"] = [{"name": name, "local": {"path": "/mnt/nas/ST3E_Ext"}}]
+    assert any("delivery.targets name" in p for p in config.validate(cfg))
+
+
+def test_delivery_targets_must_not_share_a_destination(cfg):
+    cfg["delivery"]["targets"] = [
+        {"name": "nas", "backend": "copy", "local": {"path": "/mnt/nas/ST3E_Ext"}},
+        {"name": "nas2", "backend": "robocopy", "local": {"path": "/mnt/nas/ST3E_Ext/"}},
+    ]
+    assert any("same place" in p for p in config.validate(cfg))
+    cfg["delivery"]["targets"][1]["local"]["path"] = "/mnt/nas2/ST3E_Ext"
+    assert not any("same place" in p for p in config.validate(cfg))
+
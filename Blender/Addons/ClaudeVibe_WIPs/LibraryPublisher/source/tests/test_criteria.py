@@ -73,6 +73,13 @@ def test_applies_to_narrows_the_inspection(cfg):
     assert [f.dest for f in criteria.files_to_inspect(cfg, files)] == ["Geonodes/a.blend"]
 
 
+def test_only_the_layout_audit_needs_a_live_blender(cfg):
+    assert criteria.needs_blender(cfg, "geonodes")
+    assert not criteria.needs_blender(cfg, "shading")
+    cfg["criteria"]["geonode_layout"]["mode"] = "off"
+    assert not criteria.needs_blender(cfg, "geonodes")
+
+
 def test_build_batch_carries_checks_uuids_and_audit_dir(cfg):
     files = [_file("Geonodes/a.blend", "geonodes", "a.blend")]
     batch = criteria.build_batch(cfg, files, {"uuid-1", "uuid-2"})
@@ -88,6 +95,105 @@ def test_build_command_is_headless_and_factory_startup(cfg):
     assert cmd[-2:] == ["--", "batch.json"]
 
 
+def test_build_batch_leaves_out_cached_files(cfg):
+    files = [_file("Geonodes/a.blend", "geonodes", "a.blend"),
+             _file("Geonodes/b.blend", "geonodes", "b.blend")]
+    batch = criteria.build_batch(cfg, files, set(), {"Geonodes/a.blend": _report()})
+    assert [f["dest"] for f in batch["files"]] == ["Geonodes/b.blend"]
+
+
+# --- sharding -------------------------------------------------------------------
+
+def _sized(dest, size):
+    return selection.SelectedFile("D:/repo/" + dest, dest, "geonodes", size, 0.0)
+
+
+def test_plan_shards_balances_bytes_not_file_counts():
+    files = [_sized("huge.blend", 900)] + [_sized("s%d.blend" % i, 100) for i in range(9)]
+    shards = criteria.plan_shards(files, 2)
+    assert sorted(sum(f.size for f in shard) for shard in shards) == [900, 900]
+
+
+def test_plan_shards_is_deterministic_and_loses_nothing():
+    files = [_sized("f%02d.blend" % i, (i * 37) % 11) for i in range(20)]
+    first = criteria.plan_shards(files, 3)
+    assert first == criteria.plan_shards(list(reversed(files)), 3)
+    assert sorted(f.dest for shard in first for f in shard) == sorted(f.dest for f in files)
+
+
+def test_plan_shards_never_makes_empty_shards():
+    assert len(criteria.plan_shards([_sized("a.blend", 1)], 8)) == 1
+
+
+def test_a_failed_shard_becomes_per_file_errors():
+    batches = [{"files": [{"dest": "a.blend", "scope": "geonodes"}]},
+               {"files": [{"dest": "b.blend", "scope": "geonodes"}]}]
+    outcomes = [({"reports": [{"dest": "a.blend", "assets": []}]}, ""),
+                (None, "timed out after 600s")]
+    merged = criteria.merge_shard_payloads(batches, outcomes)
+    assert [r["dest"] for r in merged["reports"]] == ["a.blend", "b.blend"]
+    assert "timed out" in merged["reports"][1]["error"]
+
+
+# --- inspection cache ----------------------------------------------------------
+
+def test_inspect_context_moves_with_checks_uuids_and_driver(cfg):
+    base = criteria.inspect_context(cfg, {"u1"}, "driver-1")
+    assert criteria.inspect_context(cfg, {"u1"}, "driver-1") == base
+    assert criteria.inspect_context(cfg, {"u1", "u2"}, "driver-1") != base
+    assert criteria.inspect_context(cfg, {"u1"}, "driver-2") != base
+    assert criteria.inspect_context(cfg, {"u1"}, "driver-1", "audit-2") != base
+    cfg["criteria"]["asset_marked"]["mode"] = "off"
+    assert criteria.inspect_context(cfg, {"u1"}, "driver-1") != base
+
+
+def test_inspect_context_ignores_a_warn_to_block_flip(cfg):
+    # Modes are policy, applied by interpret - the raw facts do not change.
+    base = criteria.inspect_context(cfg, set(), "d")
+    cfg["criteria"]["asset_marked"]["mode"] = "block"
+    assert criteria.inspect_context(cfg, set(), "d") == base
+
+
+def test_inspect_cache_round_trip_restamps_placement(cfg, tmp_path):
+    path = str(tmp_path / criteria.INSPECT_CACHE_FILENAME)
+    cache = criteria.InspectCache(path)
+    cache.put("k", _report(assets=[{"name": "a"}]))
+    cache.save()
+    again = criteria.InspectCache(path)
+    item = _file("Renamed/GN_Bend.blend", "shading", "renamed.blend")
+    report = again.get("k", item)
+    assert report["dest"] == "Renamed/GN_Bend.blend"
+    assert report["scope"] == "shading"
+    assert report["assets"] == [{"name": "a"}]
+    assert again.get("other", item) is None
+
+
+def test_inspect_cache_never_keeps_a_failed_open(cfg, tmp_path):
+    cache = criteria.InspectCache(str(tmp_path / criteria.INSPECT_CACHE_FILENAME))
+    cache.put("k", _report(error="open failed: locked"))
+    cache.save()
+    again = criteria.InspectCache(cache.path)
+    assert again.get("k", _file("a", "geonodes")) is None
+
+
+def test_interpret_merges_cached_and_fresh_reports(cfg):
+    cfg["criteria"]["asset_marked"]["mode"] = "block"
+    fresh = _report(dest="Geonodes/b.blend", assets=[])
+    cached = {"Geonodes/a.blend": _report(dest="Geonodes/a.blend", assets=[{"name": "a"}])}
+    verdict = criteria.interpret(cfg, _payload(fresh), set(), cached)
+    marked = [r for r in verdict.results if r.check == "asset_marked"]
+    assert [r.dest for r in marked] == ["Geonodes/a.blend", "Geonodes/b.blend"]
+    assert verdict.blocked == {"Geonodes/b.blend"}
+    assert verdict.cached == 1
+
+
+def test_build_command_in_serve_mode_starts_a_daemon(cfg):
+    cfg["blender"]["daemon"]["idle_timeout"] = 120
+    cmd = criteria.build_command(cfg, "blender.exe", "driver.py", "", serve="state.json")
+    assert "--background" in cmd
+    assert cmd[-4:] == ["--", "--serve", "state.json", "120"]
+
+
 # --- payload extraction ------------------------------------------------------
 
 def test_extract_json_ignores_blender_startup_noise():
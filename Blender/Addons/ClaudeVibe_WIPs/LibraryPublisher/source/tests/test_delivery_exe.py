@@ -91,3 +91,17 @@ def test_service_account_flag_only_appears_when_the_env_var_is_set(cfg, fake_exe
     assert "--drive-service-account-file" not in delivery._rclone_command(cfg, "C:/s")
     monkeypatch.setenv("ST3E_GDRIVE_SA_JSON", str(tmp_path / "sa.json"))
     assert "--drive-service-account-file" in delivery._rclone_command(cfg, "C:/s")
+
+
+def test_delta_steps_upload_then_delete_then_the_manifest(cfg, fake_exe):
+    cfg["delivery"]["rclone"]["executable"] = str(fake_exe)
+    cfg["delivery"]["dry_run"] = True
+    delta = delivery.Delta(["a.blend"], ["gone.blend"], ["publish_manifest.json"])
+    steps = delivery._rclone_delta_commands(cfg, "C:/staging", delta)
+    assert [label for label, *_rest in steps] == ["upload", "delete", "manifest"]
+    upload = steps[0][1]
+    assert upload[1] == "copy" and "--files-from" in upload and "--no-traverse" in upload
+    assert steps[1][1][1] == "delete"
+    assert all("--dry-run" in cmd for _label, cmd, *_rest in steps)
+    # The lists live beside the staging tree, never inside what gets delivered.
+    assert not any(listing.startswith("C:/staging/") for _l, _c, listing, _p in steps)
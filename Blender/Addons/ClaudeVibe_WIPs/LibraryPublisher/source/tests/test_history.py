@@ -0,0 +1,72 @@
+"""The SQLite publish history: a faithful copy of every delivered manifest."""
+
+import pytest
+
+from core import history, manifest
+
+pytestmark = pytest.mark.skipif(not history.available(), reason="no sqlite3")
+
+
+def _man(files, commit="c1", dest="copy:/drive"):
+    return {
+        "schema_version": 1,
+        "library_name": "ST3E_Ext",
+        "destination": dest,
+        "generated_utc": "2026-10-17T10:00:00Z",
+        "git": {"commit": commit, "branch": "main"},
+        "selection": {"fingerprint": "f", "dirty": []},
+        "counts": {"files": len(files)},
+        "files": {
+            d: {"sha256": h, "size": len(h), "scope": "geonodes", "source": "Blender/" + d}
+            for d, h in files.items()
+        },
+    }
+
+
+@pytest.fixture()
+def hist(tmp_path):
+    return history.History(str(tmp_path / "cache" / history.HISTORY_FILENAME))
+
+
+def test_a_recorded_manifest_comes_back_identical(hist):
+    man = _man({"Geonodes/B.blend": "bb", "Geonodes/A.blend": "aa"})
+    man["files"]["blender_assets.cats.txt"] = {"sha256": "cc", "size": 3, "scope": "generated"}
+    publish_id = hist.record(man, "manual")
+    assert hist.manifest(publish_id) == man
+    assert hist.publishes()[0].reason == "manual"
+
+
+def test_sql_diff_matches_the_in_memory_diff(hist):
+    old = _man({"a": "1", "b": "2", "c": "3"})
+    new = _man({"b": "2", "c": "9", "d": "4"})
+    publish_id = hist.record(old)
+    assert hist.diff(publish_id, new) == manifest.diff(old, new)
+    second = hist.record(new)
+    assert hist.diff_publishes(publish_id, second) == manifest.diff(old, new)
+
+
+def test_file_history_folds_publishes_that_left_it_alone(hist):
+    hist.record(_man({"a": "1"}, "c1"))
+    hist.record(_man({"a": "1", "b": "1"}, "c2"))
+    hist.record(_man({"a": "2"}, "c3"))
+    hist.record(_man({"b": "1"}, "c4"))
+    changes = hist.file_history("a")
+    assert [(c.publish.commit, c.sha256) for c in changes] == [
+        ("c1", "1"), ("c3", "2"), ("c4", ""),
+    ]
+    assert hist.file_history("never") == []
+
+
+def test_baseline_only_while_the_json_cache_is_the_file_it_wrote(hist):
+    hist.record(_man({"a": "1"}), cache_stat="10:1:1")
+    assert hist.baseline("copy:/drive", "10:1:1") is not None
+    assert hist.baseline("copy:/drive", "10:2:1") is None      # rewritten since
+    assert hist.baseline("copy:/drive", "") is None            # deleted
+    assert hist.baseline("copy:/other", "10:1:1") is None
+
+
+def test_a_corrupt_database_raises_history_error(tmp_path):
+    path = tmp_path / history.HISTORY_FILENAME
+    path.write_bytes(b"this is not sqlite" * 100)
+    with pytest.raises(history.HistoryError):
+        history.History(str(path)).publishes()
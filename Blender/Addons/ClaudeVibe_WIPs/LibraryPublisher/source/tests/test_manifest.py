@@ -1,6 +1,7 @@
 """Manifest hashing, incremental diffing and the provenance stamps."""
 
 import json
+import os
 
 from core import manifest, selection
 
@@ -76,6 +77,96 @@ def test_files_are_sorted_for_a_stable_diffable_manifest(tmp_path):
     ]
 
 
+def test_hash_many_matches_serial_hashing_in_input_order(tmp_path):
+    paths = [str(_mk(tmp_path, "f%02d.blend" % i, "x" * (i * 997))) for i in range(12)]
+    expected = [manifest.hash_file(p) for p in paths]
+    assert manifest.hash_many(paths, workers=4) == expected
+    assert manifest.hash_many(paths, workers=1) == expected
+
+
+def test_hash_file_chunk_size_does_not_change_the_digest(tmp_path):
+    path = str(_mk(tmp_path, "a.blend", "abc" * 50000))
+    assert manifest.hash_file(path, 4096) == manifest.hash_file(path)
+
+
+def test_hash_workers_auto_is_at_least_one():
+    assert manifest.hash_workers(0) >= 1
+    assert manifest.hash_workers(3) == 3
+
+
+# --- hash cache --------------------------------------------------------------
+
+def _age(path, seconds=60):
+    """Backdate a file so it is outside the racy-clean window."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+def test_hash_cache_reuses_a_digest_when_the_stat_is_unchanged(tmp_path):
+    path = _mk(tmp_path, "a.blend", "geometry")
+    _age(path)
+    cache_path = str(tmp_path / "cache" / manifest.HASH_CACHE_FILENAME)
+    first = manifest.HashCache(cache_path)
+    assert first.digest(str(path)) == manifest.hash_text("geometry")
+    first.save()
+    second = manifest.HashCache(cache_path)
+    assert second.digest(str(path)) == manifest.hash_text("geometry")
+    assert (second.hits, second.misses) == (1, 0)
+
+
+def test_hash_cache_rehashes_a_file_whose_stat_moved(tmp_path):
+    path = _mk(tmp_path, "a.blend", "geometry")
+    _age(path)
+    cache_path = str(tmp_path / manifest.HASH_CACHE_FILENAME)
+    first = manifest.HashCache(cache_path)
+    first.digest(str(path))
+    first.save()
+    path.write_text("geometry-v2", encoding="utf-8")
+    second = manifest.HashCache(cache_path)
+    assert second.digest(str(path)) == manifest.hash_text("geometry-v2")
+    assert (second.hits, second.misses) == (0, 1)
+
+
+def test_rehash_ignores_the_recorded_digests(tmp_path):
+    path = _mk(tmp_path, "a.blend", "geometry")
+    _age(path)
+    cache_path = str(tmp_path / manifest.HASH_CACHE_FILENAME)
+    first = manifest.HashCache(cache_path)
+    first.digest(str(path))
+    first.save()
+    forced = manifest.HashCache(cache_path, rehash=True)
+    forced.digest(str(path))
+    assert (forced.hits, forced.misses) == (0, 1)
+
+
+def test_a_just_written_file_is_not_remembered(tmp_path):
+    # Same-tick edits after hashing would otherwise be invisible next run.
+    path = _mk(tmp_path, "a.blend", "geometry")
+    cache_path = str(tmp_path / manifest.HASH_CACHE_FILENAME)
+    first = manifest.HashCache(cache_path)
+    first.digest(str(path))
+    first.save()
+    second = manifest.HashCache(cache_path)
+    second.digest(str(path))
+    assert second.misses == 1
+
+
+def test_corrupt_hash_cache_only_costs_the_speed_up(tmp_path):
+    path = _mk(tmp_path, "a.blend", "geometry")
+    cache_path = _mk(tmp_path, manifest.HASH_CACHE_FILENAME, "{{{ nope")
+    cache = manifest.HashCache(str(cache_path))
+    assert cache.digest(str(path)) == manifest.hash_text("geometry")
+
+
+def test_build_with_a_cache_matches_build_without(tmp_path):
+    _mk(tmp_path, "a.blend", "x")
+    files = [_sel(tmp_path, "a.blend", "Geonodes/a.blend")]
+    cache = manifest.HashCache(str(tmp_path / manifest.HASH_CACHE_FILENAME))
+    cached = manifest.build(_cfg(tmp_path), files, hash_cache=cache)
+    plain = manifest.build(_cfg(tmp_path), files)
+    assert cached["files"] == plain["files"]
+
+
 # --- diffing -----------------------------------------------------------------
 
 def _man(files):
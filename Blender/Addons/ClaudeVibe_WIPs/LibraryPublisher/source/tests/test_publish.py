@@ -9,7 +9,7 @@ import os
 
 import pytest
 
-from core import config, delivery, publish, selection
+from core import config, delivery, history, manifest, publish, selection, shell
 
 CATS = """# Asset Catalog Definition file
 VERSION 1
@@ -155,6 +155,36 @@ def test_an_edited_asset_shows_up_as_changed(cfg, tool_root):
     assert second.delivered is True
 
 
+def test_every_delivered_publish_lands_in_the_history(cfg, tool_root):
+    first = publish.publish(cfg, tool_root)
+    assert "history: recorded as publish #1" in "\n".join(first.lines)
+    path = os.path.join(str(cfg["source"]["repo_root"]), "Blender", "Geonodes", "GN_Bend.blend")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("bend-data-v2")
+    second = publish.publish(cfg, tool_root)
+    hist = history.History(os.path.join(tool_root, publish.CACHE_DIRNAME, history.HISTORY_FILENAME))
+    assert [p.id for p in hist.publishes()] == [2, 1]
+    assert hist.manifest(2)["files"] == second.manifest["files"]
+    assert [c.publish.id for c in hist.file_history("Geonodes/GN_Bend.blend")] == [1, 2]
+
+
+def test_a_deleted_json_cache_still_means_a_full_publish(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    os.remove(os.path.join(tool_root, publish.CACHE_DIRNAME, cfg["manifest"]["filename"]))
+    again = publish.publish(cfg, tool_root)
+    assert again.delivered and again.diff.unchanged == []
+
+
+def test_a_broken_history_never_breaks_a_publish(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    with open(os.path.join(tool_root, publish.CACHE_DIRNAME, history.HISTORY_FILENAME), "wb") as fh:
+        fh.write(b"garbage" * 200)
+    again = publish.publish(cfg, tool_root)
+    text = "\n".join(again.lines)
+    assert again.ok and not again.delivered
+    assert "reading the JSON baseline instead" in text
+
+
 def test_a_deleted_asset_is_pruned_from_the_drive(cfg, tool_root):
     publish.publish(cfg, tool_root)
     os.remove(os.path.join(str(cfg["source"]["repo_root"]),
@@ -173,6 +203,70 @@ def test_delete_extraneous_off_leaves_stale_files_alone(cfg, tool_root):
     assert "Geonodes/GN_Twist.blend" in _published(cfg)
 
 
+def test_copy_backend_skips_files_the_target_already_holds(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    result = publish.publish(cfg, tool_root, force=True)
+    assert result.delivery.detail.startswith("copied 0 file(s)")
+
+
+def test_copy_backend_trusts_the_hash_when_only_the_mtime_drifted(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    bend = os.path.join(_target(cfg), "Geonodes", "GN_Bend.blend")
+    os.utime(bend, (1_000_000, 1_000_000))
+    twist = os.path.join(_target(cfg), "Geonodes", "GN_Twist.blend")
+    with open(twist, "w", encoding="utf-8") as fh:
+        fh.write("TWIST-DATA")                       # same size, other bytes
+    os.utime(twist, (1_000_000, 1_000_000))
+    result = publish.publish(cfg, tool_root, force=True)
+    assert result.delivery.detail.startswith("copied 1 file(s)")
+    with open(twist, encoding="utf-8") as fh:
+        assert fh.read() == "twist-data"
+    assert os.stat(bend).st_mtime > 1_000_000       # corrected, not re-copied
+
+
+def test_copy_backend_prunes_emptied_folders(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    os.remove(os.path.join(str(cfg["source"]["repo_root"]),
+                           "Blender", "Shading", "SH_Cavity.blend"))
+    publish.publish(cfg, tool_root)
+    assert not os.path.exists(os.path.join(_target(cfg), "Shading"))
+
+
+# --- stage timings and the event stream -------------------------------------
+
+def test_every_stage_is_timed_in_the_result_and_the_cached_manifest(cfg, tool_root):
+    result = publish.publish(cfg, tool_root)
+    names = [t.name for t in result.stages]
+    assert names == ["select", "catalog", "criteria", "hash", "diff", "stage", "deliver"]
+    assert result.stages[0].files == 4 and result.stages[0].bytes > 0
+    cached = os.path.join(tool_root, publish.CACHE_DIRNAME, cfg["manifest"]["filename"])
+    with open(cached, encoding="utf-8") as fh:
+        assert [s["name"] for s in json.load(fh)["timings"]["stages"]] == names
+    # The delivered copy carries no timings, so it stays byte-identical.
+    with open(os.path.join(_target(cfg), cfg["manifest"]["filename"]), encoding="utf-8") as fh:
+        assert "timings" not in json.load(fh)
+
+
+def test_second_run_reports_hash_cache_hits(cfg, tool_root):
+    _backdate_sources(cfg)
+    publish.publish(cfg, tool_root)
+    result = publish.publish(cfg, tool_root)
+    hashed = [t for t in result.stages if t.name == "hash"][0]
+    assert hashed.cache_hits == hashed.files == 4
+    assert result.stages[-1].name == "diff"        # nothing changed: no staging
+
+
+def test_events_stream_is_json_lines_in_order(cfg, tool_root, tmp_path):
+    events = tmp_path / "out" / "events.jsonl"
+    publish.publish(cfg, tool_root, events=str(events))
+    records = [json.loads(line) for line in events.read_text(encoding="utf-8").splitlines()]
+    assert records[0]["event"] == "publish_start"
+    assert records[-1]["event"] == "publish_end" and records[-1]["ok"] is True
+    ends = [r["stage"] for r in records if r["event"] == "stage_end"]
+    assert ends[0] == "select" and ends[-1] == "deliver"
+    assert any(r["event"] == "log" and "done:" in r["text"] for r in records)
+
+
 # --- dry run and gates -------------------------------------------------------
 
 def test_dry_run_writes_nothing_and_leaves_no_cached_state(cfg, tool_root):
@@ -268,6 +362,58 @@ def test_staging_starts_from_a_clean_slate(tmp_path):
     assert not os.path.exists(os.path.join(staged.root, "stale.blend"))
 
 
+def _stage(tmp_path, sources, generated=None):
+    items, hashes = [], {}
+    for dest, text in sources.items():
+        src = tmp_path / "src" / dest
+        src.parent.mkdir(parents=True, exist_ok=True)
+        src.write_text(text, encoding="utf-8")
+        items.append(selection.SelectedFile(str(src), dest, "geonodes", len(text), 0.0))
+        hashes[dest] = manifest.hash_file(str(src))
+    return delivery.build_staging(
+        items, generated or {}, str(tmp_path / "staging"), hashes=hashes
+    )
+
+
+def test_staging_reconciles_the_previous_tree_in_place(tmp_path):
+    first = _stage(tmp_path, {"a.blend": "a", "sub/b.blend": "b"}, {"note.txt": "v1"})
+    assert first.errors == [] and first.kept == 0
+    second = _stage(tmp_path, {"a.blend": "a", "c.blend": "c"}, {"note.txt": "v2"})
+    assert second.errors == []
+    assert second.kept == 1                        # a.blend untouched
+    assert second.linked + second.copied == 1      # c.blend
+    assert second.generated == 1                   # note.txt rewritten
+    assert second.removed == 1                     # sub/b.blend dropped ...
+    assert not os.path.exists(os.path.join(second.root, "sub"))   # ... with its dir
+    with open(os.path.join(second.root, "note.txt"), encoding="utf-8") as fh:
+        assert fh.read() == "v2"
+
+
+def test_staging_restages_an_entry_damaged_on_disk(tmp_path):
+    _stage(tmp_path, {"a.blend": "data"})
+    os.remove(tmp_path / "staging" / "a.blend")
+    again = _stage(tmp_path, {"a.blend": "data"})
+    assert again.kept == 0 and again.linked + again.copied == 1
+    assert os.path.isfile(os.path.join(again.root, "a.blend"))
+
+
+def test_staging_rebuilds_when_its_index_is_unusable(tmp_path):
+    _stage(tmp_path, {"a.blend": "a"})
+    (tmp_path / "staging" / "stray.blend").write_text("x", encoding="utf-8")
+    (tmp_path / ("staging" + delivery.STAGING_INDEX_SUFFIX)).write_text("{", encoding="utf-8")
+    again = _stage(tmp_path, {"a.blend": "a"})
+    assert again.kept == 0
+    assert not os.path.exists(os.path.join(again.root, "stray.blend"))
+
+
+def test_staging_tree_survives_a_publish_for_the_next_one(cfg, tool_root):
+    publish.publish(cfg, tool_root)
+    result = publish.publish(cfg, tool_root, force=True)
+    assert os.path.isdir(os.path.join(tool_root, publish.STAGING_DIRNAME))
+    staged = [l for l in result.lines if "staged" in l][0]
+    assert "(0 hardlinked, 0 copied" in staged
+
+
 def test_atomic_swap_replaces_the_target_wholesale(cfg, tool_root):
     cfg["delivery"]["atomic"] = True
     publish.publish(cfg, tool_root)
@@ -280,6 +426,51 @@ def test_atomic_swap_replaces_the_target_wholesale(cfg, tool_root):
     assert not os.path.exists(stale)
 
 
+def test_atomic_swap_clones_payload_files_and_copies_generated_ones(cfg, tool_root):
+    cfg["delivery"]["atomic"] = True
+    result = publish.publish(cfg, tool_root)
+    # catalog, manifest, LIBRARY_VERSION and README are the only bytes written.
+    assert " 4 copied;" in result.delivery.detail
+    staged = os.path.join(tool_root, publish.STAGING_DIRNAME)
+    bend = os.path.join(_target(cfg), "Geonodes", "GN_Bend.blend")
+    assert os.path.samefile(bend, os.path.join(staged, "Geonodes", "GN_Bend.blend"))
+    readme = os.path.join(_target(cfg), "README_DO_NOT_EDIT.txt")
+    assert not os.path.samefile(readme, os.path.join(staged, "README_DO_NOT_EDIT.txt"))
+
+
+def test_atomic_swap_falls_back_to_copies_across_devices(cfg, tool_root, monkeypatch):
+    import errno
+
+    def cross_device(src, dst):
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    cfg["delivery"]["atomic"] = True
+    publish.publish(cfg, tool_root)            # staging built with real links
+    monkeypatch.setattr(delivery, "_reflink", lambda src, dst: False)
+    monkeypatch.setattr(delivery.os, "link", cross_device)
+    result = publish.publish(cfg, tool_root, force=True)
+    assert result.ok, "\n".join(result.lines)
+    assert "0 reflinked, 0 hardlinked" in result.delivery.detail
+    assert "Geonodes/GN_Bend.blend" in _published(cfg)
+
+
+def test_atomic_swap_stops_trying_reflinks_where_there_are_none(cfg, tool_root, monkeypatch):
+    import errno
+
+    calls = []
+
+    def unsupported(src, dst):
+        calls.append(dst)
+        raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+    cfg["delivery"]["atomic"] = True
+    monkeypatch.setattr(delivery, "_reflink", unsupported)
+    result = publish.publish(cfg, tool_root)
+    assert result.ok, "\n".join(result.lines)
+    assert len(calls) == 1
+    assert "0 reflinked, 4 hardlinked" in result.delivery.detail
+
+
 # --- the cached baseline must belong to the destination being published to ---
 
 def test_switching_destination_invalidates_the_cached_baseline(cfg, tool_root, tmp_path):
@@ -300,6 +491,50 @@ def test_same_destination_still_uses_the_cache(cfg, tool_root):
     assert second.diff.unchanged
 
 
+# --- several destinations in one run -----------------------------------------
+
+def _two_targets(cfg, tmp_path):
+    cfg["delivery"]["targets"] = [
+        {"name": "nas", "local": {"path": str(tmp_path / "nas" / "ST3E_Ext")}},
+        {"name": "laptop", "local": {"path": str(tmp_path / "laptop" / "ST3E_Ext")}},
+    ]
+    return [t["local"]["path"] for t in cfg["delivery"]["targets"]]
+
+
+def test_every_target_gets_the_library_and_its_own_baseline(cfg, tool_root, tmp_path):
+    paths = _two_targets(cfg, tmp_path)
+    result = publish.publish(cfg, tool_root)
+    assert result.ok and result.delivered, "\n".join(result.lines)
+    assert [t.name for t in result.targets] == ["nas", "laptop"]
+    for path in paths:
+        assert os.path.isfile(os.path.join(path, "Geonodes", "GN_Bend.blend"))
+        man = json.load(open(os.path.join(path, "publish_manifest.json"), encoding="utf-8"))
+        assert man["destination"] == "copy:" + os.path.abspath(path)
+    for name in ("nas", "laptop"):
+        assert os.path.isfile(os.path.join(
+            tool_root, publish.CACHE_DIRNAME, "targets", name, "publish_manifest.json"))
+    assert "target 'nas'" in "\n".join(result.lines)
+
+    again = publish.publish(cfg, tool_root)
+    assert again.ok and not again.delivered
+    assert all(t.detail == "up to date" for t in again.targets)
+
+
+def test_a_failing_target_does_not_hold_back_the_others(cfg, tool_root, tmp_path):
+    paths = _two_targets(cfg, tmp_path)
+    blocker = tmp_path / "blocked"
+    blocker.write_text("a file where a folder should be", encoding="utf-8")
+    cfg["delivery"]["targets"][0]["local"]["path"] = str(blocker / "ST3E_Ext")
+    result = publish.publish(cfg, tool_root)
+    assert not result.ok and "nas" in result.reason
+    nas, laptop = result.targets
+    assert not nas.ok and laptop.ok and laptop.delivered
+    assert os.path.isfile(os.path.join(paths[1], "Geonodes", "GN_Bend.blend"))
+    # Only the target that made it remembers a baseline.
+    cache = os.path.join(tool_root, publish.CACHE_DIRNAME, "targets")
+    assert sorted(os.listdir(cache)) == ["laptop"]
+
+
 def test_manifest_records_its_destination(cfg, tool_root):
     result = publish.publish(cfg, tool_root)
     assert result.manifest["destination"].startswith("copy:")
@@ -310,3 +545,565 @@ def test_withheld_files_are_recorded_in_the_manifest(cfg, tool_root):
     result = publish.publish(cfg, tool_root)
     assert "skipped" in result.manifest
     assert result.manifest["skipped"] == []  # nothing blocked with criteria off
+
+
+# --- hash cache ---------------------------------------------------------------
+
+def _backdate_sources(cfg):
+    for base, _dirs, names in os.walk(cfg["source"]["repo_root"]):
+        for name in names:
+            path = os.path.join(base, name)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 60 * 10**9))
+
+
+def test_a_no_op_publish_reuses_every_recorded_hash(cfg, tool_root):
+    _backdate_sources(cfg)
+    publish.publish(cfg, tool_root)
+    second = publish.publish(cfg, tool_root)
+    assert "hashes: 4 reused, 0 hashed" in "\n".join(second.lines)
+
+
+def test_rehash_reads_every_file_again(cfg, tool_root):
+    _backdate_sources(cfg)
+    publish.publish(cfg, tool_root)
+    second = publish.publish(cfg, tool_root, rehash=True)
+    assert "hashes: 0 reused, 4 hashed (--rehash)" in "\n".join(second.lines)
+
+
+# --- criteria inspection cache -------------------------------------------------
+
+FAKE_BLENDER = """#!%s
+import json, sys
+batch = json.load(open(sys.argv[sys.argv.index("--") + 1], encoding="utf-8"))
+with open(%r, "a", encoding="utf-8") as log:
+    log.write("%%d\\n" %% len(batch["files"]))
+if any("Twist" in f["dest"] for f in batch["files"]) and "HANG" in open(
+        %r, encoding="utf-8").read():
+    import time
+    time.sleep(30)
+reports = [dict(f, assets=[{"name": "A", "collection": "node_groups",
+                            "catalog_id": "f9ab2fa9-3a4e-491a-abaa-558cd5c029d0"}],
+                libraries=[], missing_files=[])
+           for f in batch["files"]]
+print("<<<ST3E_INSPECT_JSON>>>")
+print(json.dumps({"reports": reports, "audit_error": ""}))
+print("<<<ST3E_INSPECT_END>>>")
+"""
+
+
+def driver_path(tool_root):
+    return os.path.join(tool_root, "source", "checks", "blender_inspect.py")
+
+
+@pytest.fixture()
+def fake_blender(cfg, tool_root, tmp_path):
+    """A stand-in Blender that logs how many files each launch was handed."""
+    if os.name == "nt":
+        pytest.skip("the fake Blender is a shebang script")
+    import sys
+    log = tmp_path / "blender_launches.log"
+    exe = tmp_path / "fake_blender"
+    exe.write_text(FAKE_BLENDER % (sys.executable, str(log), str(driver_path(tool_root))),
+                   encoding="utf-8")
+    exe.chmod(0o755)
+    with open(driver_path(tool_root), "w", encoding="utf-8") as fh:
+        fh.write("# driver v1\n")
+    cfg["blender"]["executable"] = str(exe)
+    for key in ("asset_marked", "catalog_assigned", "no_external_deps"):
+        cfg["criteria"][key]["mode"] = "warn"
+    return log
+
+
+def _launches(log):
+    return [int(n) for n in log.read_text(encoding="utf-8").split()] if log.exists() else []
+
+
+def test_unchanged_files_never_relaunch_blender(cfg, tool_root, fake_blender):
+    first = publish.publish(cfg, tool_root)
+    assert first.verdict.ran and first.verdict.cached == 0
+    assert _launches(fake_blender) == [3]
+    second = publish.publish(cfg, tool_root)
+    assert second.verdict.cached == 3
+    assert _launches(fake_blender) == [3]
+    assert second.verdict.summary() == first.verdict.summary()
+
+
+def test_only_the_edited_file_goes_back_to_blender(cfg, tool_root, fake_blender):
+    publish.publish(cfg, tool_root)
+    path = os.path.join(str(cfg["source"]["repo_root"]), "Blender", "Geonodes", "GN_Bend.blend")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("bend-data-v2")
+    second = publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [3, 1]
+    assert second.verdict.cached == 2
+
+
+def test_an_edited_driver_invalidates_every_cached_report(cfg, tool_root, fake_blender):
+    publish.publish(cfg, tool_root)
+    driver = os.path.join(tool_root, "source", "checks", "blender_inspect.py")
+    with open(driver, "w", encoding="utf-8") as fh:
+        fh.write("# driver v2\n")
+    publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [3, 3]
+
+
+def _real_blends(cfg, blend_writer):
+    root = str(cfg["source"]["repo_root"])
+    for rel in ("Blender/Geonodes/GN_Bend.blend", "Blender/Geonodes/GN_Twist.blend",
+                "Blender/Shading/SH_Cavity.blend"):
+        name = os.path.splitext(os.path.basename(rel))[0]
+        blend_writer(os.path.join(root, rel),
+                     assets=[("NT", name, "f9ab2fa9-3a4e-491a-abaa-558cd5c029d0", False)])
+
+
+def test_cheap_checks_read_the_blend_without_blender(cfg, tool_root, fake_blender, blend_writer):
+    _real_blends(cfg, blend_writer)
+    first = publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == []
+    assert first.verdict.ran and first.verdict.direct == 3
+    assert "3 read without Blender" in "\n".join(first.lines)
+    assert not first.verdict.blocked
+
+    # Reader reports are cached on the reader's version, not the driver's.
+    with open(driver_path(tool_root), "w", encoding="utf-8") as fh:
+        fh.write("# driver v2\n")
+    second = publish.publish(cfg, tool_root)
+    assert second.verdict.cached == 3 and second.verdict.direct == 0
+
+
+def test_the_reader_can_be_turned_off_and_unreadable_files_fall_back(
+    cfg, tool_root, fake_blender, blend_writer
+):
+    _real_blends(cfg, blend_writer)
+    cfg["blender"]["python_reader"] = False
+    publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [3]
+
+    cfg["blender"]["python_reader"] = True
+    path = os.path.join(str(cfg["source"]["repo_root"]), "Blender", "Shading", "SH_Cavity.blend")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("not a blend")
+    result = publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [3, 1]
+    assert result.verdict.cached == 2
+
+
+def test_reader_reports_are_not_cached_as_blender_reports(
+    cfg, tool_root, fake_blender, blend_writer
+):
+    _real_blends(cfg, blend_writer)
+    path = os.path.join(str(cfg["source"]["repo_root"]), "Blender", "Shading", "SH_Cavity.blend")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("not a blend")
+    first = publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [1] and first.verdict.direct == 2
+
+    # The two files the reader handled have no Blender report to fall back on.
+    cfg["blender"]["python_reader"] = False
+    second = publish.publish(cfg, tool_root)
+    assert _launches(fake_blender) == [1, 2]
+    assert second.verdict.cached == 1
+
+
+# --- sharded inspection ---------------------------------------------------------
+
+def test_sharded_inspection_matches_a_single_pass(cfg, tool_root, fake_blender, tmp_path):
+    single = publish.run_criteria(cfg, tool_root, publish.selection.select(cfg).files, set())[0]
+    os.remove(os.path.join(tool_root, publish.CACHE_DIRNAME, "inspect_cache.json"))
+    cfg["blender"]["workers"] = 3
+    sharded = publish.run_criteria(cfg, tool_root, publish.selection.select(cfg).files, set())[0]
+    assert sorted(_launches(fake_blender)) == [1, 1, 1, 3]
+    assert sharded.results == single.results
+    assert sharded.blocked == single.blocked
+
+
+def test_a_hung_shard_only_costs_its_own_files(cfg, tool_root, fake_blender):
+    with open(driver_path(tool_root), "a", encoding="utf-8") as fh:
+        fh.write("# HANG\n")
+    cfg["blender"]["workers"] = 3
+    cfg["blender"]["timeout_per_file"] = 1
+    verdict, _ = publish.run_criteria(cfg, tool_root, publish.selection.select(cfg).files, set())
+    errors = [r for r in verdict.results if r.check == "inspect"]
+    assert [r.dest for r in errors] == ["Geonodes/GN_Twist.blend"]
+    assert "timed out" in errors[0].detail
+    assert verdict.blocked == {"Geonodes/GN_Twist.blend"}
+    assert len([r for r in verdict.results if r.check == "asset_marked"]) == 2
+
+
+# --- persistent inspection daemon -----------------------------------------------
+
+FAKE_DAEMON = """#!%s
+import hashlib, json, os, socket, sys
+args = sys.argv[sys.argv.index("--") + 1:]
+driver = sys.argv[sys.argv.index("--python") + 1]
+log = open(%r, "a", encoding="utf-8")
+log.write("start\\n"); log.flush()
+state_path, idle = args[1], float(args[2])
+server = socket.socket(); server.bind(("127.0.0.1", 0)); server.listen(4)
+server.settimeout(idle)
+state = {"pid": os.getpid(), "port": server.getsockname()[1], "token": "t0k",
+         "driver_sha256": hashlib.sha256(open(driver, "rb").read()).hexdigest(),
+         "blender": os.path.abspath(sys.argv[0])}
+json.dump(state, open(state_path + ".tmp", "w")); os.replace(state_path + ".tmp", state_path)
+while True:
+    try:
+        conn, _ = server.accept()
+    except socket.timeout:
+        break
+    buf = b""
+    while not buf.endswith(b"\\n"):
+        buf += conn.recv(65536)
+    req = json.loads(buf)
+    if req.get("op") == "shutdown":
+        conn.close(); break
+    files = req["batch"]["files"]
+    log.write("job %%d\\n" %% len(files)); log.flush()
+    reports = [dict(f, assets=[{"name": "A", "collection": "node_groups",
+                                "catalog_id": "f9ab2fa9-3a4e-491a-abaa-558cd5c029d0"}],
+                    libraries=[], missing_files=[]) for f in files]
+    conn.sendall(("<<<ST3E_INSPECT_JSON>>>\\n%%s\\n<<<ST3E_INSPECT_END>>>\\n"
+                  %% json.dumps({"reports": reports, "audit_error": ""})).encode())
+    conn.close()
+os.remove(state_path)
+"""
+
+
+@pytest.fixture()
+def fake_daemon(cfg, tool_root, tmp_path):
+    if os.name == "nt":
+        pytest.skip("the fake Blender is a shebang script")
+    import sys
+    from core import shell
+    log = tmp_path / "daemon.log"
+    exe = tmp_path / "fake_blender_daemon"
+    exe.write_text(FAKE_DAEMON % (sys.executable, str(log)), encoding="utf-8")
+    exe.chmod(0o755)
+    with open(driver_path(tool_root), "w", encoding="utf-8") as fh:
+        fh.write("# driver v1\n")
+    cfg["blender"]["executable"] = str(exe)
+    cfg["blender"]["daemon"]["enabled"] = True
+    cfg["blender"]["daemon"]["idle_timeout"] = 30
+    for key in ("asset_marked", "catalog_assigned", "no_external_deps"):
+        cfg["criteria"][key]["mode"] = "warn"
+    state_path = os.path.join(tool_root, publish.CACHE_DIRNAME, "inspect_daemon_00.json")
+    yield log, state_path
+    shell.terminate(shell.read_state(state_path).get("pid"))
+
+
+def _daemon_log(log):
+    return log.read_text(encoding="utf-8").split("\n")[:-1] if log.exists() else []
+
+
+def _inspect_fresh(cfg, tool_root):
+    """A criteria pass with the content cache cleared, so the daemon gets work."""
+    cache = os.path.join(tool_root, publish.CACHE_DIRNAME, "inspect_cache.json")
+    if os.path.exists(cache):
+        os.remove(cache)
+    return publish.run_criteria(cfg, tool_root, publish.selection.select(cfg).files, set())[0]
+
+
+def test_the_daemon_is_started_once_and_reused(cfg, tool_root, fake_daemon):
+    log, _state = fake_daemon
+    first = _inspect_fresh(cfg, tool_root)
+    second = _inspect_fresh(cfg, tool_root)
+    assert _daemon_log(log) == ["start", "job 3", "job 3"]
+    assert first.results == second.results
+    assert len([r for r in first.results if r.check == "asset_marked"]) == 3
+
+
+def test_a_dead_daemon_is_restarted(cfg, tool_root, fake_daemon):
+    from core import shell
+    import time
+    log, state = fake_daemon
+    _inspect_fresh(cfg, tool_root)
+    shell.terminate(shell.read_state(state)["pid"])
+    time.sleep(0.3)
+    verdict = _inspect_fresh(cfg, tool_root)
+    assert _daemon_log(log) == ["start", "job 3", "start", "job 3"]
+    assert verdict.ran and not verdict.inspect_error
+
+
+def test_an_edited_driver_replaces_the_running_daemon(cfg, tool_root, fake_daemon):
+    log, _state = fake_daemon
+    _inspect_fresh(cfg, tool_root)
+    with open(driver_path(tool_root), "a", encoding="utf-8") as fh:
+        fh.write("# v2\n")
+    _inspect_fresh(cfg, tool_root)
+    assert _daemon_log(log).count("start") == 2
+
+
+def test_an_idle_daemon_exits_by_itself(cfg, tool_root, fake_daemon):
+    import time
+    log, state = fake_daemon
+    cfg["blender"]["daemon"]["idle_timeout"] = 1
+    _inspect_fresh(cfg, tool_root)
+    deadline = time.monotonic() + 5
+    while os.path.exists(state) and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not os.path.exists(state)
+
+
+# --- rclone delta delivery ---------------------------------------------------
+
+FAKE_RCLONE = """#!%s
+import os, shutil, sys
+DRIVE, LOG = %r, %r
+args = sys.argv[1:]
+verb = args[0]
+def local(spec):
+    return os.path.join(DRIVE, spec.partition(":")[2])
+listed = None
+if "--files-from" in args:
+    with open(args[args.index("--files-from") + 1], encoding="utf-8") as fh:
+        listed = [line.strip() for line in fh if line.strip()]
+with open(LOG, "a", encoding="utf-8") as log:
+    log.write("%%s %%s\\n" %% (verb, "all" if listed is None else len(listed)))
+if verb == "cat":
+    if not os.path.isfile(local(args[1])):
+        sys.exit(3)
+    sys.stdout.write(open(local(args[1]), encoding="utf-8").read())
+elif verb in ("copy", "sync"):
+    src, dst = args[1], local(args[2])
+    if listed and os.environ.get("FAKE_RCLONE_DIE_ON") in listed:
+        sys.exit(9)
+    if listed is None:
+        listed = [os.path.relpath(os.path.join(b, n), src).replace(os.sep, "/")
+                  for b, _d, ns in os.walk(src) for n in ns]
+    if verb == "sync" and os.path.isdir(dst):
+        for b, _d, ns in os.walk(dst):
+            for n in ns:
+                rel = os.path.relpath(os.path.join(b, n), dst).replace(os.sep, "/")
+                if rel not in listed:
+                    os.remove(os.path.join(b, n))
+    for rel in listed:
+        os.makedirs(os.path.dirname(os.path.join(dst, rel)), exist_ok=True)
+        shutil.copy2(os.path.join(src, rel), os.path.join(dst, rel))
+elif verb == "delete":
+    for rel in listed:
+        os.remove(os.path.join(local(args[1]), rel))
+"""
+
+
+@pytest.fixture()
+def fake_rclone(cfg, tmp_path):
+    """An rclone whose remote `gd:` is a local folder; logs verb + list size."""
+    if os.name == "nt":
+        pytest.skip("the stand-in rclone is a shebang script")
+    import sys
+
+    exe = tmp_path / "tools" / "rclone"
+    log = tmp_path / "rclone.log"
+    exe.parent.mkdir(parents=True, exist_ok=True)
+    exe.write_text(FAKE_RCLONE % (sys.executable, str(tmp_path / "drive"), str(log)),
+                   encoding="utf-8")
+    exe.chmod(0o755)
+    cfg["delivery"]["backend"] = "rclone"
+    cfg["delivery"]["rclone"].update(executable=str(exe), remote="gd", path="ST3E_Ext")
+    return log
+
+
+def _rclone_calls(log):
+    calls = log.read_text(encoding="utf-8").splitlines()
+    log.write_text("", encoding="utf-8")
+    return calls
+
+
+def test_cold_drive_gets_a_full_sync_then_deltas(cfg, tool_root, repo, fake_rclone):
+    first = publish.publish(cfg, tool_root)
+    assert first.ok, "\n".join(first.lines)
+    assert "full checksum sync (no manifest on the drive)" in "\n".join(first.lines)
+    assert "sync all" in _rclone_calls(fake_rclone)
+
+    (repo / "Blender" / "Geonodes" / "GN_Bend.blend").write_text("bent", encoding="utf-8")
+    (repo / "Blender" / "Shading" / "SH_Cavity.blend").unlink()
+    second = publish.publish(cfg, tool_root)
+    assert second.ok, "\n".join(second.lines)
+    calls = _rclone_calls(fake_rclone)
+    assert not any(c.startswith("sync") for c in calls)
+    # GN_Bend plus the generated catalog/readme/version; one delete; manifest last.
+    assert calls[-3:] == ["copy 4", "delete 1", "copy 1"]
+    drive = os.path.join(str(repo.parent), "drive", "ST3E_Ext")
+    with open(os.path.join(drive, "Geonodes", "GN_Bend.blend"), encoding="utf-8") as fh:
+        assert fh.read() == "bent"
+    assert not os.path.exists(os.path.join(drive, "Shading", "SH_Cavity.blend"))
+
+
+def test_a_drive_manifest_that_disagrees_forces_a_full_sync(cfg, tool_root, repo, fake_rclone):
+    publish.publish(cfg, tool_root)
+    remote = os.path.join(str(repo.parent), "drive", "ST3E_Ext", cfg["manifest"]["filename"])
+    with open(remote, encoding="utf-8") as fh:
+        data = json.load(fh)
+    data["files"]["Geonodes/GN_Bend.blend"]["sha256"] = "0" * 64   # someone else published
+    with open(remote, "w", encoding="utf-8") as fh:
+        json.dump(data, fh)
+    _rclone_calls(fake_rclone)
+    (repo / "Blender" / "Geonodes" / "GN_Twist.blend").write_text("twisted", encoding="utf-8")
+    result = publish.publish(cfg, tool_root)
+    assert "drive manifest differs from the last publish" in "\n".join(result.lines)
+    assert "sync all" in _rclone_calls(fake_rclone)
+
+
+def test_force_always_takes_the_full_sync(cfg, tool_root, fake_rclone):
+    publish.publish(cfg, tool_root)
+    _rclone_calls(fake_rclone)
+    result = publish.publish(cfg, tool_root, force=True)
+    assert "full checksum sync (--force)" in "\n".join(result.lines)
+    assert "sync all" in _rclone_calls(fake_rclone)
+
+
+def test_a_killed_delta_delivery_resumes_with_the_remainder(
+    cfg, tool_root, repo, fake_rclone, monkeypatch
+):
+    cfg["delivery"]["rclone"]["batch_files"] = 1
+    publish.publish(cfg, tool_root)
+    for rel in ("Geonodes/GN_Bend.blend", "Geonodes/GN_Twist.blend", "Shading/SH_Cavity.blend"):
+        (repo / "Blender" / rel).write_text("edited", encoding="utf-8")
+    _rclone_calls(fake_rclone)
+
+    monkeypatch.setenv("FAKE_RCLONE_DIE_ON", "Shading/SH_Cavity.blend")
+    killed = publish.publish(cfg, tool_root)
+    assert not killed.ok
+    journal = os.path.join(tool_root, publish.CACHE_DIRNAME, delivery.JOURNAL_FILENAME)
+    assert os.path.isfile(journal)
+
+    monkeypatch.delenv("FAKE_RCLONE_DIE_ON")
+    _rclone_calls(fake_rclone)
+    resumed = publish.publish(cfg, tool_root)
+    text = "\n".join(resumed.lines)
+    assert resumed.ok, text
+    assert "resuming:" in text and "already delivered by an interrupted run" in text
+    # The diff still lists every edit (the baseline was never replaced), but
+    # the two Geonodes files that landed before the kill are not sent again.
+    assert len(resumed.diff.changed) == 3
+    # SH_Cavity and the catalog (not reached before the kill), the version and
+    # readme files (never journaled: no manifest hash), then the manifest.
+    assert _rclone_calls(fake_rclone)[1:] == ["copy 1"] * 5
+    drive = os.path.join(str(repo.parent), "drive", "ST3E_Ext")
+    with open(os.path.join(drive, "Shading", "SH_Cavity.blend"), encoding="utf-8") as fh:
+        assert fh.read() == "edited"
+    assert not os.path.exists(journal)
+
+
+def test_a_killed_delivery_is_finished_even_when_the_sources_went_back(
+    cfg, tool_root, repo, fake_rclone, monkeypatch
+):
+    cfg["delivery"]["rclone"]["batch_files"] = 1
+    publish.publish(cfg, tool_root)
+    originals = {}
+    for rel in ("Geonodes/GN_Bend.blend", "Geonodes/GN_Twist.blend", "Shading/SH_Cavity.blend"):
+        originals[rel] = (repo / "Blender" / rel).read_text(encoding="utf-8")
+        (repo / "Blender" / rel).write_text("edited", encoding="utf-8")
+    monkeypatch.setenv("FAKE_RCLONE_DIE_ON", "Shading/SH_Cavity.blend")
+    assert not publish.publish(cfg, tool_root).ok
+    monkeypatch.delenv("FAKE_RCLONE_DIE_ON")
+
+    # Back to the published content: the diff is empty, the drive is not.
+    for rel, text in originals.items():
+        (repo / "Blender" / rel).write_text(text, encoding="utf-8")
+    resumed = publish.publish(cfg, tool_root)
+    assert resumed.ok and resumed.delivered, "\n".join(resumed.lines)
+    assert not resumed.diff.has_changes
+    drive = os.path.join(str(repo.parent), "drive", "ST3E_Ext")
+    for rel, text in originals.items():
+        with open(os.path.join(drive, *rel.split("/")), encoding="utf-8") as fh:
+            assert fh.read() == text
+    assert not os.path.exists(
+        os.path.join(tool_root, publish.CACHE_DIRNAME, delivery.JOURNAL_FILENAME))
+
+
+def test_the_copy_backend_keeps_no_journal(cfg, tool_root, repo):
+    publish.publish(cfg, tool_root)
+    (repo / "Blender" / "Geonodes" / "GN_Bend.blend").write_text("bent", encoding="utf-8")
+    assert publish.publish(cfg, tool_root).delivered
+    assert not os.path.exists(
+        os.path.join(tool_root, publish.CACHE_DIRNAME, delivery.JOURNAL_FILENAME))
+
+
+def test_the_journal_only_vouches_for_its_own_destination(tmp_path):
+    path = str(tmp_path / delivery.JOURNAL_FILENAME)
+    journal = delivery.Journal(path, "copy:/a")
+    journal.confirm([("x.blend", "h1"), ("y.blend", "h2")])
+    journal.confirm_removed(["old.blend"])
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write('{"dest": "z.blend", "sha')            # torn by the kill
+    again = delivery.Journal(path, "copy:/a")
+    assert again.landed("x.blend", "h1") and not again.landed("x.blend", "h9")
+    assert again.gone("old.blend") and len(again) == 3
+    other = delivery.Journal(path, "copy:/b")
+    assert len(other) == 0
+    other.confirm([("x.blend", "h1")])               # starts its own journal
+    assert len(delivery.Journal(path, "copy:/a")) == 0
+
+
+# --- git-delta selection -----------------------------------------------------
+
+def _git(repo, *args):
+    import subprocess
+
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=str(repo), check=True, capture_output=True,
+    )
+
+
+@pytest.fixture()
+def git_repo(repo):
+    if not shell.which("git"):
+        pytest.skip("git is not installed")
+    _git(repo, "init", "-q")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", "base")
+    return repo
+
+
+def test_git_delta_rechecks_only_what_changed(cfg, tool_root, git_repo):
+    first = publish.publish(cfg, tool_root)
+    assert not any("git delta" in line for line in first.lines)
+    (git_repo / "Blender" / "Geonodes" / "GN_Bend.blend").write_text("bent", encoding="utf-8")
+    (git_repo / "Blender" / "Geonodes" / "GN_Wave.blend").write_text("wave", encoding="utf-8")
+    _git(git_repo, "add", "-A")
+    _git(git_repo, "commit", "-q", "-m", "edit")
+    second = publish.publish(cfg, tool_root)
+    text = "\n".join(second.lines)
+    assert "selection: git delta since" in text and "2 path(s) to re-check" in text
+    # The catalog's header stamps the commit, so it changes with every commit.
+    assert second.diff.changed == ["Geonodes/GN_Bend.blend", "blender_assets.cats.txt"]
+    assert second.diff.added == ["Geonodes/GN_Wave.blend"]
+    hashed = [t for t in second.stages if t.name == "hash"][0]
+    assert hashed.cache_hits >= 3          # the untouched files came from the baseline
+
+
+def test_git_delta_sees_a_reverted_dirty_edit(cfg, tool_root, git_repo):
+    bend = git_repo / "Blender" / "Geonodes" / "GN_Bend.blend"
+    bend.write_text("uncommitted", encoding="utf-8")
+    publish.publish(cfg, tool_root)                  # published dirty content
+    _git(git_repo, "checkout", "--", "Blender/Geonodes/GN_Bend.blend")
+    result = publish.publish(cfg, tool_root)
+    assert "git delta" in "\n".join(result.lines)
+    assert result.diff.changed == ["Geonodes/GN_Bend.blend"]
+
+
+def test_git_delta_sees_files_git_ignores(cfg, tool_root, git_repo):
+    (git_repo / ".gitignore").write_text("*_local.blend\n", encoding="utf-8")
+    _git(git_repo, "add", "-A")
+    _git(git_repo, "commit", "-q", "-m", "ignore local files")
+    publish.publish(cfg, tool_root)
+    local = git_repo / "Blender" / "Geonodes" / "GN_Wave_local.blend"
+    local.write_text("wave", encoding="utf-8")
+    added = publish.publish(cfg, tool_root)
+    assert "git delta" in "\n".join(added.lines)
+    assert added.diff.added == ["Geonodes/GN_Wave_local.blend"]
+    local.unlink()                                   # gone again: still noticed
+    removed = publish.publish(cfg, tool_root)
+    assert "git delta" in "\n".join(removed.lines)
+    assert removed.diff.removed == ["Geonodes/GN_Wave_local.blend"]
+
+
+def test_rewritten_history_falls_back_to_a_full_scan(cfg, tool_root, git_repo):
+    _git(git_repo, "commit", "-q", "--allow-empty", "-m", "second")
+    publish.publish(cfg, tool_root)
+    _git(git_repo, "reset", "-q", "--hard", "HEAD~1")
+    _git(git_repo, "commit", "-q", "--allow-empty", "-m", "rewritten")
+    result = publish.publish(cfg, tool_root)
+    assert "full scan (git cannot diff against" in "\n".join(result.lines)
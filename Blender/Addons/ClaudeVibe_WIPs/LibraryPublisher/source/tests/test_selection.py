@@ -89,6 +89,22 @@ def test_addon_zips_take_current_builds_and_skip_archive(repo):
     ]
 
 
+def test_the_walk_never_lists_folders_the_patterns_rule_out(repo, monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.relpath(path, str(repo)).replace(os.sep, "/"))
+        return real_scandir(path)
+
+    monkeypatch.setattr(selection.os, "scandir", recording_scandir)
+    result = selection.select(_cfg(repo, [ADDON_ZIPS]))
+    assert len(result.files) == 2
+    # archive/** is excluded whole; source/ is deeper than */distribution/*.zip reaches.
+    assert not any(p.endswith(("/archive", "/source")) for p in listed)
+    assert "Blender/Addons/ClaudeVibe_WIPs/MassExporter/distribution" in listed
+
+
 def test_flatten_drops_the_intermediate_folders(repo):
     result = selection.select(_cfg(repo, [ADDON_ZIPS]))
     assert all(f.dest.count("/") == 1 for f in result.files)
@@ -150,6 +166,44 @@ def test_selected_files_carry_real_size_and_source(repo):
     assert item.scope == "geonodes"
 
 
+# --- recomputing only what changed -------------------------------------------
+
+def _as_manifest(result, repo):
+    return {"files": {
+        f.dest: {"sha256": "x", "size": f.size, "scope": f.scope,
+                 "source": os.path.relpath(f.src, str(repo)).replace(os.sep, "/")}
+        for f in result.files
+    }}
+
+
+def test_select_changed_matches_a_full_walk(repo):
+    cfg = _cfg(repo, [GEONODES, ADDON_ZIPS])
+    before = _as_manifest(selection.select(cfg), repo)
+    os.remove(repo / "Blender/Geonodes/GN_Mosaic.blend")
+    (repo / "Blender/Geonodes/GN_New.blend").write_text("new", encoding="utf-8")
+    (repo / "Blender/Geonodes/GN_New_fixed.blend").write_text("junk", encoding="utf-8")
+    (repo / "Blender/Geonodes/GN_Bend.blend").write_text("bent", encoding="utf-8")
+    changed = [
+        "Blender/Geonodes/GN_Mosaic.blend",
+        "Blender/Geonodes/GN_New.blend",
+        "Blender/Geonodes/GN_New_fixed.blend",
+        "Blender/Geonodes/GN_Bend.blend",
+        "Blender/Shading/SH_Cavity.blend",       # outside every enabled scope
+    ]
+    fast = selection.select_changed(cfg, before, changed)
+    full = selection.select(cfg)
+    assert [(f.dest, f.size, f.scope) for f in fast.files] == \
+        [(f.dest, f.size, f.scope) for f in full.files]
+    assert fast.per_scope == full.per_scope
+
+
+def test_fingerprint_follows_the_scope_rules(repo):
+    cfg = _cfg(repo, [dict(GEONODES)])
+    before = selection.fingerprint(cfg)
+    cfg["scope"]["entries"][0]["exclude"] = []
+    assert selection.fingerprint(cfg) != before
+
+
 # --- the pattern matcher itself ---------------------------------------------
 
 @pytest.mark.parametrize(
@@ -172,3 +226,19 @@ def test_selected_files_carry_real_size_and_source(repo):
 )
 def test_glob_matching(rel, pattern, expected):
     assert selection.matches(rel, pattern) is expected
+
+
+@pytest.mark.parametrize("patterns", [
+    ["*.blend", "*/distribution/*.zip"],
+    ["_backup*/**", "*_fixed.blend", "TreeGenDocu/**"],
+    ["**/c.blend", "a/*/c.blend"],
+])
+def test_compiled_pattern_sets_agree_with_single_patterns(patterns):
+    paths = [
+        "GN_Bend.blend", "sub/GN_Bend.blend", "GN_x_fixed.blend", "_backup_1/GN.blend",
+        "TreeGenDocu/deep/GN.blend", "Tool/distribution/a.zip", "Tool/distribution/archive/a.zip",
+        "a/b/c.blend", "c.blend", "a/b/d/c.blend",
+    ]
+    compiled = selection.compile_patterns(patterns)
+    for rel in paths:
+        assert compiled.match(rel) is any(selection.matches(rel, p) for p in patterns), rel
@@ -0,0 +1,244 @@
+"""Watch mode: which saves wake the publisher, how bursts are batched, and the
+loop that turns a batch into one incremental publish."""
+
+import json
+import os
+import time
+
+import pytest
+
+from core import config, publish, watch
+
+CATS = """VERSION 1
+
+f9ab2fa9-3a4e-491a-abaa-558cd5c029d0:ST3E:ST3E
+"""
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    layout = {
+        "Blender/blender_assets.cats.txt": CATS,
+        "Blender/Geonodes/GN_Bend.blend": "bend-data",
+        "Blender/Geonodes/GN_Twist.blend": "twist-data",
+        "Blender/Shading/SH_Cavity.blend": "cavity-data",
+        "Blender/Addons/ClaudeVibe_WIPs/MassExporter/distribution/MassExporter_v13.7.0.zip": "zip",
+        "Blender/Addons/ClaudeVibe_WIPs/MassExporter/distribution/archive/old.zip": "junk",
+        "Blender/Addons/ClaudeVibe_WIPs/MassExporter/source/__init__.py": "src",
+    }
+    for rel, text in layout.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return root
+
+
+@pytest.fixture()
+def cfg(repo, tmp_path):
+    conf = config.default_config(str(repo))
+    conf["delivery"]["backend"] = "copy"
+    conf["delivery"]["local"]["path"] = str(tmp_path / "drive" / "ST3E_Ext")
+    conf["delivery"]["atomic"] = False
+    for check in conf["criteria"].values():
+        check["mode"] = "off"
+    return conf
+
+
+@pytest.fixture()
+def tool_root(tmp_path):
+    root = tmp_path / "tool"
+    (root / "source" / "checks").mkdir(parents=True)
+    return str(root)
+
+
+# --- what wakes the publisher ------------------------------------------------
+
+def test_only_paths_a_scope_claims_are_relevant(cfg):
+    relevant = watch.Relevance(cfg)
+    assert relevant("Blender/Geonodes/GN_Bend.blend")
+    assert relevant("Blender/blender_assets.cats.txt")
+    assert not relevant("Blender/Geonodes/GN_Bend.blend1")
+    assert not relevant("Blender/Addons/ClaudeVibe_WIPs/MassExporter/distribution/archive/old.zip")
+    assert not relevant("Blender/Addons/ClaudeVibe_WIPs/MassExporter/source/__init__.py")
+
+
+def test_poll_watcher_reports_edits_additions_and_deletions(cfg, repo):
+    watcher = watch.PollWatcher(cfg, interval=0.01)
+    (repo / "Blender/Geonodes/GN_Bend.blend").write_text("bend-data-v2", encoding="utf-8")
+    (repo / "Blender/Geonodes/GN_New.blend").write_text("new", encoding="utf-8")
+    os.remove(repo / "Blender/Shading/SH_Cavity.blend")
+    assert watcher.wait(1.0) == {
+        "Blender/Geonodes/GN_Bend.blend",
+        "Blender/Geonodes/GN_New.blend",
+        "Blender/Shading/SH_Cavity.blend",
+    }
+    assert watcher.wait(1.0) == set()
+
+
+def test_poll_watcher_never_walks_pruned_folders(cfg, repo):
+    watcher = watch.PollWatcher(cfg, interval=0.01)
+    (repo / "Blender/Addons/ClaudeVibe_WIPs/MassExporter/source/mod.py").write_text("x")
+    assert watcher.wait(1.0) == set()
+
+
+@pytest.mark.skipif(not watch.inotify_available(), reason="inotify is Linux-only")
+def test_inotify_sees_blender_style_saves_and_new_folders(cfg, repo):
+    watcher = watch.InotifyWatcher(cfg)
+    try:
+        geo = repo / "Blender" / "Geonodes"
+        # Blender writes `name.blend@` and renames it over the original.
+        (geo / "GN_Bend.blend@").write_text("bend-data-v2", encoding="utf-8")
+        os.replace(geo / "GN_Bend.blend@", geo / "GN_Bend.blend")
+        touched = watcher.wait(1.0)
+        assert "Blender/Geonodes/GN_Bend.blend" in touched
+
+        tool = repo / "Blender/Addons/ClaudeVibe_WIPs/NewTool/distribution"
+        tool.mkdir(parents=True)
+        time.sleep(0.05)
+        (tool / "NewTool_v1.zip").write_text("zip", encoding="utf-8")
+        seen = set()
+        deadline = time.monotonic() + 2
+        while "Blender/Addons/ClaudeVibe_WIPs/NewTool/distribution/NewTool_v1.zip" not in seen:
+            assert time.monotonic() < deadline
+            seen |= watcher.wait(0.2) or set()
+    finally:
+        watcher.close()
+
+
+# --- batching ----------------------------------------------------------------
+
+def test_a_burst_is_published_once_it_goes_quiet():
+    deb = watch.Debouncer(quiet=2.0, max_delay=20.0)
+    deb.add({"a"}, now=0.0)
+    deb.add({"b"}, now=1.5)
+    assert not deb.due(3.0)
+    assert deb.due(3.5) and deb.depth == 2
+    assert deb.drain() == (["a", "b"], 0.0)
+    assert deb.depth == 0 and not deb.due(100.0)
+
+
+def test_a_never_ending_burst_is_published_at_the_max_delay():
+    deb = watch.Debouncer(quiet=2.0, max_delay=5.0)
+    for t in range(6):
+        deb.add({"f%d" % t}, now=float(t))
+    assert deb.due(5.0)
+
+
+def test_a_rescan_takes_over_the_whole_batch():
+    deb = watch.Debouncer(quiet=1.0, max_delay=5.0)
+    deb.add({"a"}, now=0.0)
+    deb.add(watch.RESCAN, now=0.5)
+    assert deb.drain()[0] is watch.RESCAN
+
+
+# --- the loop ----------------------------------------------------------------
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class _Scripted:
+    """A watcher replaying batches of touched paths, one per wait(). A callable
+    batch is run first (the "save") and returns its paths."""
+
+    name = "scripted"
+    roots = ()
+
+    def __init__(self, clock, batches):
+        self.clock = clock
+        self.batches = list(batches)
+        self.closed = False
+
+    def wait(self, timeout):
+        if self.batches:
+            self.clock.now += 0.5
+            batch = self.batches.pop(0)
+            return batch() if callable(batch) else batch
+        self.clock.now += timeout
+        return set()
+
+    def close(self):
+        self.closed = True
+
+
+def test_watch_publishes_a_burst_as_one_incremental_run(cfg, repo, tool_root):
+    clock = _Clock()
+    bend = "Blender/Geonodes/GN_Bend.blend"
+
+    def save():
+        (repo / bend).write_text("bend-data-v2", encoding="utf-8")
+        return {bend}
+
+    watcher = _Scripted(clock, [
+        save,
+        {"Blender/Geonodes/GN_Bend.blend1"},          # Blender's backup: ignored
+        {bend},
+    ])
+    out = []
+    assert watch.run(cfg, tool_root, watcher=watcher, out=out.append,
+                     max_publishes=2, clock=clock) == 0
+    assert watcher.closed
+    text = "\n".join(out)
+    assert text.count("[watch] published") == 2          # the start-up run + one burst
+    assert "queue depth 1" in text
+
+    status = json.loads(open(watch.status_path(tool_root), encoding="utf-8").read())
+    assert status["publishes"] == 2 and status["queue_depth"] == 0
+    assert status["last"]["paths"] == 1
+    assert status["last"]["summary"].startswith("0 added, 1 changed")
+    drive = os.path.join(cfg["delivery"]["local"]["path"], "Geonodes", "GN_Bend.blend")
+    assert open(drive, encoding="utf-8").read() == "bend-data-v2"
+
+
+def test_a_watched_publish_matches_a_full_one(cfg, repo, tool_root):
+    publish.publish(cfg, tool_root)
+    (repo / "Blender/Geonodes/GN_Bend.blend").write_text("bend-data-v2", encoding="utf-8")
+    (repo / "Blender/Geonodes/GN_Wave.blend").write_text("wave", encoding="utf-8")
+    os.remove(repo / "Blender/Geonodes/GN_Twist.blend")
+    fast = publish.publish(cfg, tool_root, force=True, changed=[
+        "Blender/Geonodes/GN_Bend.blend", "Blender/Geonodes/GN_Wave.blend",
+        "Blender/Geonodes/GN_Twist.blend",
+    ])
+    assert "3 watched path(s) to re-check" in "\n".join(fast.lines)
+    full = publish.publish(cfg, tool_root, force=True)
+    assert fast.manifest["files"].keys() == full.manifest["files"].keys()
+    assert fast.diff.added == ["Geonodes/GN_Wave.blend"]
+    assert fast.diff.removed == ["Geonodes/GN_Twist.blend"]
+
+
+def test_a_failed_burst_is_published_with_the_next_one(cfg, repo, tool_root, monkeypatch):
+    clock = _Clock()
+    bend, twist = "Blender/Geonodes/GN_Bend.blend", "Blender/Geonodes/GN_Twist.blend"
+
+    def save(rel, text):
+        def run():
+            (repo / rel).write_text(text, encoding="utf-8")
+            return {rel}
+        return run
+
+    real_deliver = publish.delivery.deliver
+    calls = []
+
+    def flaky_deliver(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:                              # the first burst
+            return publish.delivery.DeliveryResult("copy", False, "drive offline", [], "")
+        return real_deliver(*args, **kwargs)
+
+    monkeypatch.setattr(publish.delivery, "deliver", flaky_deliver)
+    watcher = _Scripted(clock, [save(bend, "bend-data-v2"), set(), set(), set(), set(),
+                                save(twist, "twist-data-v2")])
+    out = []
+    watch.run(cfg, tool_root, watcher=watcher, out=out.append, max_publishes=3, clock=clock)
+    text = "\n".join(out)
+    assert "[watch] FAILED" in text
+    status = json.loads(open(watch.status_path(tool_root), encoding="utf-8").read())
+    assert status["last"]["ok"] and status["last"]["paths"] == 2
+    drive = os.path.join(cfg["delivery"]["local"]["path"], "Geonodes")
+    assert open(os.path.join(drive, "GN_Bend.blend"), encoding="utf-8").read() == "bend-data-v2"
+    assert open(os.path.join(drive, "GN_Twist.blend"), encoding="utf-8").read() == "twist-data-v2"
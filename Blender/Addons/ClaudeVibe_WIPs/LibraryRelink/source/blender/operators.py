@@ -1,18 +1,29 @@
 """Operators for Library Relink — orchestrate core.relink against bpy.data."""
 
 import os
+import tempfile
 
 import bpy
 from bpy.props import BoolProperty
 from bpy.types import Operator
 
-from ..core import relink
+from ..core import file_index, relink
 
 
 def _gather_libraries():
     return [(lib.name, bpy.path.abspath(lib.filepath)) for lib in bpy.data.libraries]
 
 
+def _index_cache_path(root, filename=""):
+    """Per-root index cache (or `filename`) in the extension's user folder,
+    temp for legacy installs."""
+    try:
+        folder = bpy.utils.extension_path_user(__package__.rpartition(".")[0], create=True)
+    except (AttributeError, ValueError):
+        folder = os.path.join(tempfile.gettempdir(), "library_relink")
+    return os.path.join(folder, filename or file_index.cache_filename(root))
+
+
 def _run_scan(settings):
     """Rebuild the plan collection from the current libraries. Returns (plan, error)."""
     new_dir = bpy.path.abspath(settings.new_dir) if settings.new_dir else ""
@@ -20,8 +31,28 @@ def _run_scan(settings):
         return None, "New Folder is not an existing directory"
 
     old_filter = bpy.path.abspath(settings.old_dir_filter) if settings.old_dir_filter else ""
-    available = [f for f in os.listdir(new_dir) if f.lower().endswith(".blend")]
-    plan = relink.plan_relink(_gather_libraries(), new_dir, available, old_filter)
+    if settings.search_subfolders:
+        plan, stats = relink.plan_relink_tree(
+            _gather_libraries(), new_dir, old_filter, _index_cache_path(new_dir),
+            match_content=settings.match_content,
+            hash_cache_path=_index_cache_path("", "content_hashes.json"))
+        folders = stats["dirs_scanned"] + stats["dirs_reused"]
+        settings.index_info = (
+            f"{stats['files']} files in {folders} folders "
+            f"({stats['dirs_reused']} cached) · index {stats['seconds']:.2f} s · "
+            f"lookup {stats['lookup_seconds'] * 1000:.1f} ms")
+        if "renamed" in stats:
+            settings.index_info += f" · content {stats['hash_seconds']:.2f} s"
+        print(f"[Library Relink] {settings.index_info}, "
+              f"{stats['ambiguous']} with several matches")
+        if "renamed" in stats:
+            print(f"[Library Relink] {stats['renamed']} renamed by content "
+                  f"({stats['partial_hashed']} partial + {stats['full_hashed']} full "
+                  f"hashes, {stats['reused']} cached)")
+    else:
+        available = [f for f in os.listdir(new_dir) if f.lower().endswith(".blend")]
+        plan = relink.plan_relink(_gather_libraries(), new_dir, available, old_filter)
+        settings.index_info = ""
 
     settings.plan.clear()
     for entry in plan:
@@ -30,7 +61,8 @@ def _run_scan(settings):
         item.current_path = entry["current"]
         item.target_path = entry["target"]
         item.status = entry["status"]
-        item.enabled = entry["status"] == relink.STATUS_RELINK
+        item.candidates = len(entry.get("candidates", ()))
+        item.enabled = entry["status"] in relink.RELINKABLE
     settings.plan_index = max(0, min(settings.plan_index, len(settings.plan) - 1))
     return plan, ""
 
@@ -50,7 +82,8 @@ class LIBRELINK_OT_scan(Operator):
         counts = relink.summarize(plan)
         self.report(
             {'INFO'},
-            f"{counts[relink.STATUS_RELINK]} to relink, "
+            f"{counts[relink.STATUS_RELINK] + counts[relink.STATUS_RENAMED]} to relink "
+            f"({counts[relink.STATUS_RENAMED]} renamed), "
             f"{counts[relink.STATUS_MISSING]} missing, "
             f"{counts[relink.STATUS_FILTERED] + counts[relink.STATUS_SAME]} skipped")
         return {'FINISHED'}
@@ -66,7 +99,7 @@ class LIBRELINK_OT_apply(Operator):
     def poll(cls, context):
         settings = getattr(context.scene, "library_relink", None)
         return settings is not None and any(
-            item.status == relink.STATUS_RELINK and item.enabled
+            item.status in relink.RELINKABLE and item.enabled
             for item in settings.plan)
 
     def invoke(self, context, event):
@@ -83,7 +116,7 @@ class LIBRELINK_OT_apply(Operator):
 
         done, failed = 0, []
         for item in settings.plan:
-            if item.status != relink.STATUS_RELINK or not item.enabled:
+            if item.status not in relink.RELINKABLE or not item.enabled:
                 continue
             lib = bpy.data.libraries.get(item.lib_name)
             if lib is None:
@@ -124,7 +157,7 @@ class LIBRELINK_OT_set_all(Operator):
 
     def execute(self, context):
         for item in context.scene.library_relink.plan:
-            if item.status == relink.STATUS_RELINK:
+            if item.status in relink.RELINKABLE:
                 item.enabled = self.enable
         return {'FINISHED'}
 
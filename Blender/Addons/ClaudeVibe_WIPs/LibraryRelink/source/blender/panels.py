@@ -4,6 +4,7 @@ from bpy.types import Panel, UIList
 
 STATUS_ICONS = {
     'RELINK': 'FILE_REFRESH',
+    'RENAMED': 'DUPLICATE',
     'MISSING': 'ERROR',
     'FILTERED': 'FILTER',
     'SAME': 'CHECKMARK',
@@ -14,7 +15,7 @@ class LIBRELINK_UL_plan(UIList):
     def draw_item(self, context, layout, data, item, icon, active_data,
                   active_property, index=0, flt_flag=0):
         row = layout.row(align=True)
-        if item.status == 'RELINK':
+        if item.status in {'RELINK', 'RENAMED'}:
             row.prop(item, "enabled", text="")
         else:
             row.label(icon='BLANK1')
@@ -34,6 +35,10 @@ class LIBRELINK_PT_panel(Panel):
         col = layout.column(align=True)
         col.prop(settings, "new_dir")
         col.prop(settings, "old_dir_filter")
+        layout.prop(settings, "search_subfolders")
+        sub = layout.row()
+        sub.active = settings.search_subfolders
+        sub.prop(settings, "match_content")
         layout.prop(settings, "make_relative")
 
         row = layout.row(align=True)
@@ -48,8 +53,11 @@ class LIBRELINK_PT_panel(Panel):
         for item in settings.plan:
             counts[item.status] += 1
         layout.label(
-            text=f"{counts['RELINK']} to relink · {counts['MISSING']} missing · "
+            text=f"{counts['RELINK'] + counts['RENAMED']} to relink "
+                 f"({counts['RENAMED']} renamed) · {counts['MISSING']} missing · "
                  f"{counts['FILTERED'] + counts['SAME']} skipped")
+        if settings.index_info:
+            layout.label(text=settings.index_info, icon='TIME')
 
         row = layout.row()
         row.template_list("LIBRELINK_UL_plan", "", settings, "plan",
@@ -63,8 +71,13 @@ class LIBRELINK_PT_panel(Panel):
             box = layout.box()
             box.label(text=item.lib_name, icon=STATUS_ICONS.get(item.status, 'QUESTION'))
             box.label(text=f"From: {item.current_path}")
-            if item.status in {'RELINK', 'MISSING'}:
+            if item.status in {'RELINK', 'RENAMED', 'MISSING'}:
                 box.label(text=f"To: {item.target_path}")
+            if item.status == 'RENAMED':
+                box.label(text="Same content under another name", icon='DUPLICATE')
+            if item.candidates > 1:
+                box.label(text=f"Closest of {item.candidates} files with this name",
+                          icon='INFO')
 
 
 classes = (
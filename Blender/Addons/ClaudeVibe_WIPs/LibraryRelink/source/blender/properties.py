@@ -11,6 +11,8 @@ from bpy.types import PropertyGroup
 
 STATUS_ITEMS = [
     ('RELINK', "Relink", "File found in the new folder — will be relinked"),
+    ('RENAMED', "Renamed", "A file with the same content but another name was found "
+                           "in the new folder — will be relinked to it"),
     ('MISSING', "Missing", "No file with this name in the new folder — left untouched"),
     ('FILTERED', "Filtered", "Outside the source-folder filter — left untouched"),
     ('SAME', "Unchanged", "Already points at the new folder"),
@@ -25,6 +27,9 @@ class LIBRELINK_PG_plan_item(PropertyGroup):
     enabled: BoolProperty(
         name="Include", default=True,
         description="Include this library when relinking")
+    candidates: IntProperty(
+        name="Matches", default=0,
+        description="Files with this name found under the new folder")
 
 
 class LIBRELINK_PG_settings(PropertyGroup):
@@ -35,11 +40,22 @@ class LIBRELINK_PG_settings(PropertyGroup):
         name="Only From", subtype='DIR_PATH',
         description="Only touch libraries currently inside this folder "
                     "(empty = consider all linked libraries)")
+    search_subfolders: BoolProperty(
+        name="Search Subfolders", default=True,
+        description="Find each library anywhere below the new folder, not only "
+                    "directly inside it (the folder index is cached between sessions)")
+    match_content: BoolProperty(
+        name="Match Renamed Files", default=True,
+        description="For libraries whose filename is not found, look for a file with "
+                    "the same content under another name (needs the old file to "
+                    "still be readable; hashes are cached between sessions)")
     make_relative: BoolProperty(
         name="Relative Paths", default=False,
         description="Store the new library paths relative to this .blend file")
     plan: CollectionProperty(type=LIBRELINK_PG_plan_item)
     plan_index: IntProperty(default=0)
+    index_info: StringProperty(
+        name="Index", description="How the last Preview found its files")
 
 
 classes = (
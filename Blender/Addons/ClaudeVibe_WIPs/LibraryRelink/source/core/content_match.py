@@ -0,0 +1,175 @@
+"""Find a renamed copy of a library by its content. Pure Python, no bpy.
+
+A library whose filename no longer exists under the new folder may simply have
+been renamed there. Its old file, where it is still readable, says what to look
+for, in three steps that get more expensive as the field narrows:
+
+  1. size    - only files of exactly the same size are candidates (a stat each);
+  2. partial - size plus the first and last 64 KiB, hashed;
+  3. full    - the whole file, hashed, but only when step 2 left more than one
+               candidate standing.
+
+A single partial match is accepted as it is, which in practice is decisive for
+.blend files. Every digest is cached on disk against the file's size and mtime,
+so later runs hash only the files that changed, never the whole drive.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+HASH_CACHE_VERSION = 1
+PARTIAL_BLOCK = 64 * 1024
+_FULL_CHUNK = 1024 * 1024
+
+# A file written this recently may still be changing within the same mtime
+# tick; its digests are used but not persisted.
+_RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def partial_digest(path, size):
+    h = hashlib.blake2b(digest_size=16)
+    h.update(b"%d:" % size)
+    with open(path, "rb") as fh:
+        h.update(fh.read(PARTIAL_BLOCK))
+        if size > 2 * PARTIAL_BLOCK:
+            fh.seek(size - PARTIAL_BLOCK)
+        h.update(fh.read(PARTIAL_BLOCK))
+    return h.hexdigest()
+
+
+def full_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(_FULL_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class HashCache:
+    """path -> (size, mtime_ns, partial, full) digests, persisted as JSON.
+
+    `stats` counts digests computed vs served from the cache in this session.
+    """
+
+    def __init__(self, path=""):
+        self.path = path
+        self._entries = self._load() if path else {}
+        self._dirty = False
+        self.stats = {"partial_hashed": 0, "full_hashed": 0, "reused": 0}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != HASH_CACHE_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def _entry(self, path, st):
+        key = os.path.normcase(os.path.abspath(path))
+        entry = self._entries.get(key)
+        if not entry or entry[0] != st.st_size or entry[1] != st.st_mtime_ns:
+            entry = [st.st_size, st.st_mtime_ns, "", ""]
+            if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+                self._entries[key] = entry
+        return entry
+
+    def partial(self, path, st):
+        entry = self._entry(path, st)
+        if entry[2]:
+            self.stats["reused"] += 1
+        else:
+            entry[2] = partial_digest(path, st.st_size)
+            self.stats["partial_hashed"] += 1
+            self._dirty = True
+        return entry[2]
+
+    def full(self, path, st):
+        entry = self._entry(path, st)
+        if entry[3]:
+            self.stats["reused"] += 1
+        else:
+            entry[3] = full_digest(path)
+            self.stats["full_hashed"] += 1
+            self._dirty = True
+        return entry[3]
+
+    def save(self):
+        """Write the cache atomically when anything new was hashed; failures only
+        cost the next session time."""
+        if not self.path or not self._dirty:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"version": HASH_CACHE_VERSION, "entries": self._entries}, fh,
+                          separators=(",", ":"))
+            os.replace(tmp, self.path)
+            self._dirty = False
+        except OSError:
+            pass
+
+
+class SizeIndex:
+    """The files of a `FileIndex` grouped by size, stat'ed once and only when
+    the first renamed library is looked for."""
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._by_size = None
+
+    def same_size(self, size):
+        if self._by_size is None:
+            self._by_size = {}
+            for path in self._paths:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                self._by_size.setdefault(st.st_size, []).append((path, st))
+        return list(self._by_size.get(size, ()))
+
+
+def find_copies(source, sizes, cache):
+    """Paths among `sizes` (a SizeIndex) whose content matches `source`.
+
+    Empty when the source is unreadable or nothing matches. More than one path
+    only when several files are byte-identical copies.
+    """
+    try:
+        src_st = os.stat(source)
+    except OSError:
+        return []
+    norm = os.path.normcase(os.path.abspath(source))
+    field = [(p, st) for p, st in sizes.same_size(src_st.st_size)
+             if os.path.normcase(os.path.abspath(p)) != norm]
+    if not field:
+        return []
+    try:
+        want = cache.partial(source, src_st)
+    except OSError:
+        return []
+    hits = []
+    for path, st in field:
+        try:
+            if cache.partial(path, st) == want:
+                hits.append((path, st))
+        except OSError:
+            continue
+    if len(hits) > 1:
+        want = cache.full(source, src_st)
+        confirmed = []
+        for path, st in hits:
+            try:
+                if cache.full(path, st) == want:
+                    confirmed.append((path, st))
+            except OSError:
+                continue
+        hits = confirmed
+    return [path for path, _st in hits]
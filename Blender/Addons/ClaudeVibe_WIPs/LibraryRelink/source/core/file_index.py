@@ -0,0 +1,176 @@
+"""Filename index of a folder tree, persisted between sessions. Pure Python, no bpy.
+
+Relinking against a deep asset tree needs "where under this root is a file
+called X?" for every library at once. One `os.scandir` walk answers all of them.
+
+The walk is cached on disk per directory together with that directory's mtime.
+Adding, removing or renaming an entry bumps the mtime of the directory that
+holds it, so a later session only has to stat each cached directory and re-list
+the ones whose mtime moved. Nothing else is re-read. It is the same trick git's
+untracked cache uses.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+INDEX_VERSION = 1
+
+# A directory modified this close to the moment it was listed may still change
+# within the same mtime tick; such entries are stored as never-valid so the next
+# session lists them again (the "racy" case git guards against the same way).
+_RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+
+
+def cache_filename(root, ext=".blend"):
+    """A stable cache file name for one indexed root."""
+    key = "%s|%s" % (os.path.normcase(os.path.abspath(root)), ext.casefold())
+    return "file_index_%s.json" % hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class FileIndex:
+    """Every file ending in `ext` under `root`, looked up by name.
+
+    `stats` reports how the index was obtained: directories listed vs reused
+    from the cache, file count and the build time in seconds.
+    """
+
+    def __init__(self, root, ext=".blend"):
+        self.root = os.path.abspath(root)
+        self.ext = ext.casefold()
+        self._dirs = {}      # rel dir ("" = root) -> (mtime_ns, files, subdirs)
+        self._by_name = {}
+        self.stats = {"dirs_scanned": 0, "dirs_reused": 0, "files": 0, "seconds": 0.0}
+
+    # --- building ------------------------------------------------------------
+
+    @classmethod
+    def load_or_build(cls, root, cache_path="", ext=".blend"):
+        """The index of `root`, reusing `cache_path` where it is still valid and
+        writing the refreshed index back to it. No cache path = always a full walk."""
+        index = cls(root, ext)
+        started = time.perf_counter()
+        index._walk(index._load(cache_path) if cache_path else {})
+        index.stats["seconds"] = time.perf_counter() - started
+        if cache_path:
+            index.save(cache_path)
+        return index
+
+    def _load(self, cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if (not isinstance(data, dict) or data.get("version") != INDEX_VERSION
+                or data.get("root") != os.path.normcase(self.root)
+                or data.get("ext") != self.ext):
+            return {}
+        dirs = data.get("dirs")
+        return dirs if isinstance(dirs, dict) else {}
+
+    def _walk(self, cached):
+        pending = [""]
+        while pending:
+            rel = pending.pop()
+            path = os.path.join(self.root, rel) if rel else self.root
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            entry = cached.get(rel)
+            if entry and entry[0] == mtime:
+                files, subdirs = entry[1], entry[2]
+                self.stats["dirs_reused"] += 1
+            else:
+                files, subdirs = self._list(path)
+                self.stats["dirs_scanned"] += 1
+            self._dirs[rel] = (mtime, files, subdirs)
+            for name in files:
+                full = os.path.join(path, name)
+                self._by_name.setdefault(name.casefold(), []).append(full)
+            pending.extend(sub if not rel else rel + "/" + sub for sub in subdirs)
+        self.stats["files"] = sum(len(paths) for paths in self._by_name.values())
+
+    def _list(self, path):
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.name.casefold().endswith(self.ext) and entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return sorted(files), sorted(subdirs)
+
+    def save(self, cache_path):
+        """Write the index atomically; failures only cost the next session time."""
+        now = time.time_ns()
+        dirs = {
+            rel: [mtime if now - mtime > _RACY_WINDOW_NS else -1, files, subdirs]
+            for rel, (mtime, files, subdirs) in self._dirs.items()
+        }
+        data = {
+            "version": INDEX_VERSION,
+            "root": os.path.normcase(self.root),
+            "ext": self.ext,
+            "dirs": dirs,
+        }
+        tmp = cache_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, separators=(",", ":"))
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+
+    # --- lookup --------------------------------------------------------------
+
+    def paths(self):
+        """Every indexed file, as absolute paths."""
+        for paths in self._by_name.values():
+            yield from paths
+
+    def lookup(self, filename):
+        """Absolute paths of every indexed file with this name (case-insensitive)."""
+        return list(self._by_name.get(filename.casefold(), ()))
+
+    def __len__(self):
+        return self.stats["files"]
+
+
+def _dir_parts(path):
+    return [part for part in os.path.normcase(os.path.normpath(os.path.dirname(path))).split(os.sep)
+            if part]
+
+
+def similarity(current, candidate):
+    """Sort key (lower = closer) for how well `candidate` continues `current`.
+
+    A moved tree keeps its inner layout, so the number of trailing folder names
+    the two share counts most (".../Assets/Geonodes/X.blend" prefers
+    ".../Assets/Geonodes/" over ".../Backup/"); then the common leading folders,
+    then the shallower path, then the name for a stable order.
+    """
+    cur, cand = _dir_parts(current), _dir_parts(candidate)
+    suffix = 0
+    while suffix < min(len(cur), len(cand)) and cur[-1 - suffix] == cand[-1 - suffix]:
+        suffix += 1
+    prefix = 0
+    while prefix < min(len(cur), len(cand)) and cur[prefix] == cand[prefix]:
+        prefix += 1
+    return (-suffix, -prefix, len(cand), os.path.normcase(candidate))
+
+
+def rank_matches(current, candidates):
+    """`candidates` ordered best match first for the library at `current`."""
+    return sorted(candidates, key=lambda candidate: similarity(current, candidate))
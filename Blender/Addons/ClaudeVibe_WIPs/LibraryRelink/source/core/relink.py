@@ -4,19 +4,32 @@ A "plan" classifies every linked library against a destination folder before
 anything is touched, so the UI can show a dry-run preview:
 
   RELINK   - a file with the same name exists in the new folder, path differs
+  RENAMED  - no file with this name, but one with the same content (tree
+             planning with content matching only; relinked like RELINK)
   MISSING  - no file with this name in the new folder (left untouched)
   FILTERED - library lives outside the source-folder filter (left untouched)
   SAME     - already points at the new folder
+
+`plan_relink` matches against the files of one folder; `plan_relink_tree`
+searches a whole folder tree through a persisted `file_index.FileIndex` and
+ranks several same-named hits by path similarity.
 """
 
 import os
+import time
+
+from . import content_match, file_index
 
 STATUS_RELINK = "RELINK"
+STATUS_RENAMED = "RENAMED"
 STATUS_MISSING = "MISSING"
 STATUS_FILTERED = "FILTERED"
 STATUS_SAME = "SAME"
 
-ALL_STATUSES = (STATUS_RELINK, STATUS_MISSING, STATUS_FILTERED, STATUS_SAME)
+ALL_STATUSES = (STATUS_RELINK, STATUS_RENAMED, STATUS_MISSING, STATUS_FILTERED, STATUS_SAME)
+
+# Statuses the apply step repoints.
+RELINKABLE = (STATUS_RELINK, STATUS_RENAMED)
 
 
 def normalize(path):
@@ -73,6 +86,71 @@ def plan_relink(libraries, new_dir, available_files, old_dir_filter=""):
     return plan
 
 
+def plan_relink_tree(libraries, new_root, old_dir_filter="", cache_path="",
+                     match_content=False, hash_cache_path=""):
+    """Build a relink plan against every .blend anywhere under new_root.
+
+    Same statuses as `plan_relink`; SAME means the library already sits in the
+    tree. Each item also carries "candidates": every same-named file in the
+    tree, best match first (see `file_index.similarity`), with the target being
+    the first. cache_path persists the index between sessions ("" = no cache).
+
+    With match_content, libraries that would be MISSING but whose old file is
+    still readable are looked for by content (`content_match.find_copies`) and
+    become RENAMED when a copy turns up; hash_cache_path persists the digests.
+
+    Returns (plan, stats): stats is the index's build stats plus
+    "lookup_seconds", "ambiguous" (libraries with more than one candidate) and,
+    with match_content, "renamed", "hash_seconds" and the hash cache counters.
+    """
+    index = file_index.FileIndex.load_or_build(new_root, cache_path)
+    started = time.perf_counter()
+    plan = []
+    ambiguous = 0
+    for name, current in libraries:
+        base = os.path.basename(current)
+        candidates = file_index.rank_matches(current, index.lookup(base))
+        ambiguous += len(candidates) > 1
+        here = [c for c in candidates if normalize(c) == normalize(current)]
+        if here:
+            status, target = STATUS_SAME, here[0]
+        elif not is_under(current, old_dir_filter):
+            status, target = STATUS_FILTERED, candidates[0] if candidates else current
+        elif not candidates:
+            status, target = STATUS_MISSING, os.path.join(new_root, base)
+        else:
+            status, target = STATUS_RELINK, candidates[0]
+        plan.append({
+            "name": name,
+            "current": current,
+            "target": target,
+            "status": status,
+            "candidates": candidates,
+        })
+    stats = dict(index.stats, lookup_seconds=time.perf_counter() - started, ambiguous=ambiguous)
+    if match_content:
+        stats.update(_match_renamed(plan, index, hash_cache_path))
+    return plan, stats
+
+
+def _match_renamed(plan, index, hash_cache_path):
+    started = time.perf_counter()
+    cache = content_match.HashCache(hash_cache_path)
+    sizes = content_match.SizeIndex(list(index.paths()))
+    renamed = 0
+    for item in plan:
+        if item["status"] != STATUS_MISSING:
+            continue
+        copies = content_match.find_copies(item["current"], sizes, cache)
+        if copies:
+            item["candidates"] = file_index.rank_matches(item["current"], copies)
+            item["target"] = item["candidates"][0]
+            item["status"] = STATUS_RENAMED
+            renamed += 1
+    cache.save()
+    return dict(cache.stats, renamed=renamed, hash_seconds=time.perf_counter() - started)
+
+
 def summarize(plan):
     """Status -> count for a plan; every status key is always present."""
     counts = {status: 0 for status in ALL_STATUSES}
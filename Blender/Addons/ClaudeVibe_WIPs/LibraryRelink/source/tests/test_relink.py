@@ -4,7 +4,7 @@ import sys
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from core import relink
+from core import content_match, file_index, relink
 
 OLD = os.path.normpath("D:/Old/Geonodes")
 NEW = os.path.normpath("D:/New/Geonodes")
@@ -103,3 +103,126 @@ class TestSummarize:
     def test_empty_plan(self):
         counts = relink.summarize([])
         assert all(value == 0 for value in counts.values())
+
+
+def touch(root, *rels):
+    for rel in rels:
+        path = root.joinpath(*rel.split("/"))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"BLENDER")
+
+
+class TestFileIndex:
+    def test_finds_blends_at_any_depth(self, tmp_path):
+        touch(tmp_path, "a/GN_Wave.blend", "a/b/c/GN_Bend.blend", "a/GN_Wave.blend1",
+              ".git/x.blend", "notes.txt")
+        index = file_index.FileIndex.load_or_build(str(tmp_path))
+        assert index.lookup("gn_bend.BLEND") == [str(tmp_path / "a" / "b" / "c" / "GN_Bend.blend")]
+        assert len(index) == 2
+
+    def test_cache_reuses_unchanged_folders_and_sees_new_files(self, tmp_path):
+        tree, cache = tmp_path / "tree", str(tmp_path / "index.json")
+        touch(tree, "a/x/GN_A.blend", "b/GN_B.blend")
+        file_index.FileIndex.load_or_build(str(tree), cache)
+        # Age the folders past the racy window, as a later session would see them.
+        for folder in (tree, tree / "a", tree / "a" / "x", tree / "b"):
+            os.utime(folder, ns=(0, os.stat(folder).st_mtime_ns - 10 * 10**9))
+        file_index.FileIndex.load_or_build(str(tree), cache)
+
+        touch(tree, "b/GN_New.blend")
+        index = file_index.FileIndex.load_or_build(str(tree), cache)
+        assert index.lookup("GN_New.blend")
+        assert index.stats["dirs_scanned"] == 1          # only b/ was listed again
+        assert index.stats["dirs_reused"] == 3
+
+    def test_a_broken_cache_means_a_full_walk(self, tmp_path):
+        cache = tmp_path / "index.json"
+        cache.write_text("{not json", encoding="utf-8")
+        touch(tmp_path, "t/GN_A.blend")
+        index = file_index.FileIndex.load_or_build(str(tmp_path / "t"), str(cache))
+        assert index.lookup("GN_A.blend") and index.stats["dirs_reused"] == 0
+
+    def test_ranking_prefers_the_same_inner_layout(self):
+        current = os.path.normpath("D:/Old/Assets/Geonodes/GN_Wave.blend")
+        near = os.path.normpath("E:/New/Assets/Geonodes/GN_Wave.blend")
+        far = os.path.normpath("E:/New/Backup/GN_Wave.blend")
+        assert file_index.rank_matches(current, [far, near]) == [near, far]
+
+
+class TestPlanRelinkTree:
+    def test_resolves_scattered_libraries_in_one_pass(self, tmp_path):
+        new = tmp_path / "New"
+        touch(new, "Geonodes/GN_Wave.blend", "Shading/Deep/SH_Cavity.blend",
+              "Backup/GN_Wave.blend", "Here/GN_Here.blend")
+        libs = [
+            ("GN_Wave", os.path.join(OLD, "GN_Wave.blend")),
+            ("SH_Cavity", os.path.normpath("D:/Old/Shading/SH_Cavity.blend")),
+            ("GN_Gone", os.path.join(OLD, "GN_Gone.blend")),
+            ("GN_Here", str(new / "Here" / "GN_Here.blend")),
+        ]
+        plan, stats = relink.plan_relink_tree(libs, str(new), cache_path=str(tmp_path / "c.json"))
+        assert [item["status"] for item in plan] == [
+            relink.STATUS_RELINK, relink.STATUS_RELINK, relink.STATUS_MISSING, relink.STATUS_SAME]
+        assert plan[0]["target"] == str(new / "Geonodes" / "GN_Wave.blend")
+        assert len(plan[0]["candidates"]) == 2 and stats["ambiguous"] == 1
+        assert plan[1]["target"] == str(new / "Shading" / "Deep" / "SH_Cavity.blend")
+        assert stats["files"] == 4 and stats["lookup_seconds"] >= 0
+
+    def test_filter_still_applies(self, tmp_path):
+        touch(tmp_path, "essentials.blend")
+        plan, _stats = relink.plan_relink_tree(
+            [("ess", "C:/Blender/assets/essentials.blend")], str(tmp_path), old_dir_filter=OLD)
+        assert plan[0]["status"] == relink.STATUS_FILTERED
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    st = os.stat(path)
+    # Older than the racy window, like any file a previous session saw.
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns - 10 * 10**9))
+    return str(path)
+
+
+class TestContentMatch:
+    def test_renamed_library_is_found_by_content(self, tmp_path):
+        old = write(tmp_path / "Old" / "GN_Wave.blend", b"W" * 1000)
+        write(tmp_path / "New" / "Geonodes" / "GN_Wave_v2.blend", b"W" * 1000)
+        write(tmp_path / "New" / "GN_Other.blend", b"X" * 1000)
+        plan, stats = relink.plan_relink_tree(
+            [("GN_Wave", old)], str(tmp_path / "New"), match_content=True)
+        assert plan[0]["status"] == relink.STATUS_RENAMED
+        assert plan[0]["target"] == str(tmp_path / "New" / "Geonodes" / "GN_Wave_v2.blend")
+        assert stats["renamed"] == 1 and stats["full_hashed"] == 0
+        assert relink.summarize(plan)[relink.STATUS_RENAMED] == 1
+
+    def test_off_by_default_and_unreadable_sources_stay_missing(self, tmp_path):
+        old = write(tmp_path / "Old" / "GN_Wave.blend", b"W" * 10)
+        write(tmp_path / "New" / "GN_Wave_v2.blend", b"W" * 10)
+        plan, _stats = relink.plan_relink_tree([("GN_Wave", old)], str(tmp_path / "New"))
+        assert plan[0]["status"] == relink.STATUS_MISSING
+        gone = str(tmp_path / "Old" / "GN_Gone.blend")
+        plan, _stats = relink.plan_relink_tree(
+            [("GN_Gone", gone)], str(tmp_path / "New"), match_content=True)
+        assert plan[0]["status"] == relink.STATUS_MISSING
+
+    def test_same_head_and_tail_needs_the_full_hash(self, tmp_path):
+        block = content_match.PARTIAL_BLOCK
+        body = b"A" * block + b"middle-1" + b"Z" * block
+        old = write(tmp_path / "Old" / "GN_Wave.blend", body)
+        write(tmp_path / "New" / "a" / "GN_Renamed.blend", body)
+        write(tmp_path / "New" / "b" / "GN_Decoy.blend", body.replace(b"middle-1", b"middle-2"))
+        plan, stats = relink.plan_relink_tree(
+            [("GN_Wave", old)], str(tmp_path / "New"), match_content=True)
+        assert plan[0]["candidates"] == [str(tmp_path / "New" / "a" / "GN_Renamed.blend")]
+        assert stats["full_hashed"] == 3
+
+    def test_digests_are_reused_across_sessions(self, tmp_path):
+        old = write(tmp_path / "Old" / "GN_Wave.blend", b"W" * 100)
+        write(tmp_path / "New" / "GN_Wave_v2.blend", b"W" * 100)
+        cache = str(tmp_path / "hashes.json")
+        args = ([("GN_Wave", old)], str(tmp_path / "New"))
+        _plan, first = relink.plan_relink_tree(*args, match_content=True, hash_cache_path=cache)
+        _plan, second = relink.plan_relink_tree(*args, match_content=True, hash_cache_path=cache)
+        assert first["partial_hashed"] == 2
+        assert second["partial_hashed"] == 0 and second["reused"] == 2
@@ -0,0 +1,224 @@
+"""
+Paste this ENTIRE file into Blender's Scripting tab → Text Editor → New → paste
+→ Run Script (Alt+P). It times the Mass Collection Exporter's temporary-copy
+bake paths and prints a before/after table into the System Console (Window →
+Toggle System Console on Windows).
+
+What it does (nothing is exported, no files are written):
+
+  1. Finds the loaded addon module (same lookup as MASSEXPORTER_DIAGNOSE.py).
+  2. Builds a throwaway collection of OBJECT_COUNT meshes, each with a
+     Subdivision + Bevel stack, one viewport-disabled Array, a non-trivial
+     loc/rot/scale, and (every 10th object) an Armature modifier bound to a rig
+     in the selection.
+  3. Times, REPEAT times each, with the median reported:
+       - before: the pre-depsgraph path, kept below verbatim as
+         legacy_apply_modifiers / legacy_apply_transforms / legacy_cleanup
+         (bpy.ops duplicate + one modifier_apply per modifier + object.delete)
+       - after:  the addon's current _apply_modifiers_to_selection /
+         _apply_transforms_via_duplicates / _cleanup_modifier_copies
+  4. Checks both paths produce the same total vertex count.
+  5. Removes everything it created.
+
+Tweak OBJECT_COUNT / REPEAT / ONLY_VISIBLE below.
+"""
+import bpy
+import sys
+import statistics
+import time
+
+OBJECT_COUNT = 500
+REPEAT = 3
+ONLY_VISIBLE = True
+
+print("=" * 78)
+print("MASS EXPORTER BAKE BENCHMARK")
+print("=" * 78)
+
+mod = None
+for name, m in list(sys.modules.items()):
+    if m is None:
+        continue
+    bl_info = getattr(m, "bl_info", None)
+    if isinstance(bl_info, dict) and bl_info.get("name") == "Mass Collection Exporter":
+        mod = m
+        print(f"[module] {name} VERSION={getattr(m, 'VERSION', '<missing>')}")
+        break
+if mod is None:
+    print("[FATAL] Mass Collection Exporter is not loaded.")
+    raise SystemExit
+
+op = mod.MASSEXPORTER_OT_export_all
+batch_select_objects = mod.batch_select_objects
+batch_deselect_all = mod.batch_deselect_all
+
+
+# --- Legacy (pre-depsgraph) implementation, for the "before" column ----------
+
+def legacy_apply_modifiers(context, objects, skip_armature=False, only_visible=False):
+    copies, originals, names = [], [], []
+    rigs_in_selection = {o for o in objects if o.type == 'ARMATURE'}
+
+    def _should_skip(m):
+        if m.type != 'ARMATURE':
+            return False
+        return True if skip_armature else m.object in rigs_in_selection
+
+    def _is_hidden(m):
+        return only_visible and not m.show_viewport and not _should_skip(m)
+
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        if not [m for m in obj.modifiers if not _should_skip(m) and not _is_hidden(m)]:
+            continue
+        original_name = obj.name
+        obj.name = f"__mexport_{original_name}"
+        batch_select_objects([obj], context)
+        bpy.ops.object.duplicate(linked=False)
+        copy = context.active_object
+        copy.name = original_name
+        for m in list(copy.modifiers):
+            if _is_hidden(m):
+                copy.modifiers.remove(m)
+        for m in list(copy.modifiers):
+            if _should_skip(m):
+                continue
+            try:
+                bpy.ops.object.modifier_apply(modifier=m.name)
+            except Exception:
+                copy.modifiers.remove(m)
+        copies.append(copy)
+        originals.append(obj)
+        names.append(original_name)
+    for obj in originals:
+        obj.select_set(False)
+    for copy in copies:
+        copy.select_set(True)
+    return copies, originals, names
+
+
+def legacy_apply_transforms(context, objects):
+    copies, originals, names = [], [], []
+    for obj in objects:
+        if obj.type != 'MESH':
+            continue
+        original_name = obj.name
+        obj.name = f"__mexport_xform_{original_name}"
+        batch_select_objects([obj], context)
+        bpy.ops.object.duplicate(linked=False)
+        copy = context.active_object
+        copy.name = original_name
+        batch_select_objects([copy], context)
+        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        copies.append(copy)
+        originals.append(obj)
+        names.append(original_name)
+    return copies, originals, names
+
+
+def legacy_cleanup(context, copies, originals, names):
+    batch_deselect_all(context)
+    for copy in copies:
+        if copy.name in bpy.data.objects:
+            copy.select_set(True)
+    if copies:
+        bpy.ops.object.delete()
+    for obj, name in zip(originals, names):
+        if obj.name in bpy.data.objects:
+            obj.name = name
+
+
+# --- Scene ------------------------------------------------------------------
+
+def build_scene(count):
+    coll = bpy.data.collections.new("__mexport_bench")
+    bpy.context.scene.collection.children.link(coll)
+    rig_data = bpy.data.armatures.new("__mexport_bench_rig")
+    rig = bpy.data.objects.new("__mexport_bench_rig", rig_data)
+    coll.objects.link(rig)
+    base = bpy.data.meshes.new("__mexport_bench_cube")
+    verts = [(x, y, z) for x in (-1, 1) for y in (-1, 1) for z in (-1, 1)]
+    faces = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+    base.from_pydata(verts, [], faces)
+    objects = [rig]
+    for i in range(count):
+        obj = bpy.data.objects.new(f"__mexport_bench_{i:04d}", base.copy())
+        obj.location = (i % 25 * 3.0, i // 25 * 3.0, 0.0)
+        obj.rotation_euler = (0.1 * (i % 7), 0.0, 0.2 * (i % 5))
+        obj.scale = (1.0 + 0.01 * (i % 9),) * 3
+        coll.objects.link(obj)
+        sub = obj.modifiers.new("Subdivision", 'SUBSURF')
+        sub.levels = 2
+        obj.modifiers.new("Bevel", 'BEVEL')
+        arr = obj.modifiers.new("Array", 'ARRAY')
+        arr.show_viewport = False
+        if i % 10 == 0:
+            arm = obj.modifiers.new("Armature", 'ARMATURE')
+            arm.object = rig
+        objects.append(obj)
+    bpy.context.view_layer.update()
+    return coll, objects, base
+
+
+def teardown(coll, base):
+    objs = list(coll.all_objects)
+    data = [o.data for o in objs if o.data is not None]
+    bpy.data.batch_remove(objs + data + [base])
+    bpy.data.collections.remove(coll)
+
+
+def vertex_total(objs):
+    return sum(len(o.data.vertices) for o in objs if o.type == 'MESH')
+
+
+def timed(apply, cleanup, context, objects):
+    started = time.perf_counter()
+    copies, originals, names = apply(context, objects)
+    baked = time.perf_counter() - started
+    verts = vertex_total(copies)
+    started = time.perf_counter()
+    cleanup(context, copies, originals, names)
+    return baked, time.perf_counter() - started, verts
+
+
+context = bpy.context
+if context.mode != 'OBJECT' and bpy.ops.object.mode_set.poll():
+    bpy.ops.object.mode_set(mode='OBJECT')
+
+coll, objects, base = build_scene(OBJECT_COUNT)
+meshes = [o for o in objects if o.type == 'MESH']
+print(f"scene: {len(meshes)} meshes + 1 rig, repeat={REPEAT}, only_visible={ONLY_VISIBLE}")
+
+cases = [
+    ("modifiers", "before",
+     lambda c, objs: legacy_apply_modifiers(c, objs, only_visible=ONLY_VISIBLE), legacy_cleanup),
+    ("modifiers", "after",
+     lambda c, objs: op._apply_modifiers_to_selection(c, objs, only_visible=ONLY_VISIBLE),
+     op._cleanup_modifier_copies),
+    ("transforms", "before", legacy_apply_transforms, legacy_cleanup),
+    ("transforms", "after", op._apply_transforms_via_duplicates, op._cleanup_modifier_copies),
+]
+results = {}
+try:
+    for path, label, apply, cleanup in cases:
+        runs = [timed(apply, cleanup, context, objects) for _ in range(REPEAT)]
+        results[(path, label)] = (
+            statistics.median(r[0] for r in runs),
+            statistics.median(r[1] for r in runs),
+            runs[0][2],
+        )
+finally:
+    teardown(coll, base)
+
+print("\n  %-11s %-7s %10s %10s %10s %12s" % ("path", "", "bake s", "cleanup s", "total s", "vertices"))
+for (path, label), (bake, clean, verts) in results.items():
+    print("  %-11s %-7s %10.3f %10.3f %10.3f %12d" % (path, label, bake, clean, bake + clean, verts))
+for path in ("modifiers", "transforms"):
+    before, after = results.get((path, "before")), results.get((path, "after"))
+    if before and after:
+        speedup = (before[0] + before[1]) / max(after[0] + after[1], 1e-9)
+        same = "same geometry" if before[2] == after[2] else "VERTEX COUNTS DIFFER"
+        print(f"  {path}: {speedup:.1f}x faster, {same}")
+
+print("=" * 78)
@@ -59,6 +59,8 @@ print(f"export_rig_with_mesh      = {getattr(props, 'export_rig_with_mesh', '<n/
 print(f"apply_modifiers           = {getattr(props, 'apply_modifiers', '<n/a>')}")
 print(f"export_format             = {getattr(props, 'export_format', '<n/a>')}")
 print(f"debug_mode                = {props.debug_mode}")
+print(f"force_export              = {getattr(props, 'force_export', '<n/a>')}")
+print(f"use_background_export     = {getattr(props, 'use_background_export', '<n/a>')}")
 print(f"collection_items          = {len(props.collection_items)} rows")
 
 def _walk_lc(lc, depth=0, out=None):
@@ -241,6 +243,17 @@ print("\n" + "-" * 78)
 print("RUNNING bpy.ops.massexporter.export_all()")
 print("-" * 78)
 
+# Force a full export so the trace covers every row, not just the ones the
+# incremental-export cache considers changed.
+orig_force = getattr(props, "force_export", None)
+if orig_force is not None:
+    props.force_export = True
+# The trace patches only see this process: keep the export in the foreground
+# instead of handing it to background workers.
+orig_background = getattr(props, "use_background_export", None)
+if orig_background is not None:
+    props.use_background_export = False
+
 try:
     res = bpy.ops.massexporter.export_all()
     print(f"\n[operator] returned: {res}")
@@ -249,6 +262,10 @@ except Exception as e:
     traceback.print_exc()
 finally:
     # --- 5. Restore patches ---
+    if orig_force is not None:
+        props.force_export = orig_force
+    if orig_background is not None:
+        props.use_background_export = orig_background
     op_class._unhide_collection_for_export = orig_unhide
     op_class._restore_collection_for_export = orig_restore
     op_class.perform_export = orig_perform
@@ -16,6 +16,13 @@ bl_info = {
 import bpy
 import bmesh
 import os
+import array
+import hashlib
+import json
+import shutil
+import subprocess
+import tempfile
+import time
 import mathutils
 from bpy.props import (
     StringProperty,
@@ -577,9 +584,14 @@ def batch_select_objects(objects, context, deselect_first=True):
         context.view_layer.objects.active = objects[0]
 
 
-def build_collection_depth_map():
+def build_collection_depth_map(parent_map=None, object_map=None):
     """Build a collection -> depth map for fast O(n) lookups.
-    Depth is distance from the scene root collection (root = 0)."""
+    Depth is distance from the scene root collection (root = 0).
+
+    Pass dicts as `parent_map` / `object_map` to fill them in the same pass:
+    collection -> [parent collections] and object -> [collections directly
+    containing it], both in `bpy.data.collections` order. Scene root
+    collections are not data-block collections and never appear in either."""
     depth_map = {}
 
     def traverse(collection, depth):
@@ -593,21 +605,800 @@ def build_collection_depth_map():
     for coll in bpy.data.collections:
         if coll not in depth_map:
             depth_map[coll] = 0
+        if parent_map is not None:
+            for child in coll.children:
+                parent_map.setdefault(child, []).append(coll)
+        if object_map is not None:
+            for obj in coll.objects:
+                object_map.setdefault(obj, []).append(coll)
 
     return depth_map
 
 
-def find_immediate_collection(obj, depth_map=None):
-    """Return the deepest (most immediate) collection directly containing obj.
-    Pass a pre-built depth_map when calling in a loop for best performance."""
-    containing = [c for c in bpy.data.collections if obj.name in c.objects]
-    if not containing:
-        return None
-    if len(containing) == 1:
+class CollectionIndex:
+    """Object -> collections, collection -> depth and collection -> parents
+    for the whole file, built in one pass over the collection tree.
+
+    Lookups are O(1) (ancestor checks are memoized per collection). Build one
+    per operator run and drop it afterwards - it does not follow later edits.
+    """
+
+    def __init__(self):
+        self.parents = {}
+        self.collections_of = {}
+        self.depth = build_collection_depth_map(self.parents, self.collections_of)
+        self._ancestors = {}
+
+    def parent(self, collection):
+        """The first collection that has `collection` as a direct child."""
+        parents = self.parents.get(collection)
+        return parents[0] if parents else None
+
+    def ancestors(self, collection):
+        """Every collection `collection` is nested in, at any depth."""
+        found = self._ancestors.get(collection)
+        if found is None:
+            found = set()
+            for parent in self.parents.get(collection, ()):
+                found.add(parent)
+                found |= self.ancestors(parent)
+            self._ancestors[collection] = found
+        return found
+
+    def is_parent_of(self, parent_coll, child_coll):
+        """Check if parent_coll is a parent (or ancestor) of child_coll"""
+        return parent_coll in self.ancestors(child_coll)
+
+    def immediate_collection(self, obj):
+        """The most immediate collection directly containing obj: the first,
+        in `bpy.data.collections` order, that is not an ancestor of another
+        collection containing it."""
+        containing = self.collections_of.get(obj)
+        if not containing:
+            return None
+        if len(containing) == 1:
+            return containing[0]
+        nested_in = set()
+        for coll in containing:
+            nested_in |= self.ancestors(coll)
+        for coll in containing:
+            if coll not in nested_in:
+                return coll
         return containing[0]
-    if depth_map is None:
-        depth_map = build_collection_depth_map()
-    return max(containing, key=lambda c: depth_map.get(c, 0))
+
+    def parent_export_item(self, collection, props):
+        """The first export-list row whose collection contains `collection`."""
+        for item in props.collection_items:
+            if item.collection and self.is_parent_of(item.collection, collection):
+                return item
+        return None
+
+
+def find_immediate_collection(obj, index=None):
+    """Return the most immediate collection directly containing obj.
+    Pass a pre-built CollectionIndex when calling in a loop."""
+    if index is None:
+        index = CollectionIndex()
+    return index.immediate_collection(obj)
+
+
+# ============================================================================
+# Incremental Export (fingerprint cache)
+# ============================================================================
+#
+# Export All fingerprints what each output is made of - the evaluated geometry,
+# modifier stacks, transforms and material slots of the objects that go into it,
+# plus every setting that changes the written file - and remembers the
+# fingerprint in a JSON sidecar inside the export folder. On the next run an
+# output whose fingerprint and file on disk are both unchanged is not exported
+# again. Two levels share one sidecar per folder:
+#   - "collection:<name>" gates a whole row before any visibility isolation,
+#     selection or duplication happens (the big win when nothing in it moved);
+#   - "file:<name>" gates each file inside a row that did change, so touching
+#     one prop in a per-object row re-exports that one file only.
+
+EXPORT_CACHE_FILENAME = ".massexporter_cache.json"
+EXPORT_CACHE_VERSION = 1
+
+# MassExporterProperties that change what ends up in the exported file.
+# UI state (active row indices, debug output, the force toggle) is left out so
+# clicking around the panel does not invalidate the cache.
+_FINGERPRINT_PROPS = (
+    'apply_transforms', 'axis_forward', 'axis_up',
+    'override_materials', 'override_material', 'assign_if_no_material', 'add_m_prefix',
+    'export_format', 'use_custom_fbx_ascii', 'apply_scaling', 'bake_space_transform',
+    'apply_modifiers', 'apply_only_visible_modifiers', 'skip_armature_modifier',
+    'export_rig_with_mesh', 'primary_bone_axis', 'secondary_bone_axis',
+    'armature_nodetype', 'use_armature_deform_only', 'add_leaf_bones',
+)
+
+# CollectionExportItem settings that pick the export mode / shape the output.
+_FINGERPRINT_ITEM_PROPS = (
+    'merge_to_single', 'export_subcollections_as_single', 'use_empty_origins',
+    'center_parent_empties', 'move_empties_to_origin_on_export', 'join_empty_children',
+    'apply_modifiers_before_join', 'apply_only_visible', 'move_to_center',
+    'use_suffix_grouping', 'export_as_single_fbx', 'single_fbx_custom_name',
+)
+
+# RNA properties that are UI state or timings, not data: hashing them would
+# invalidate the cache on a panel click or on every evaluation.
+_FINGERPRINT_SKIP_RNA = frozenset({
+    'rna_type', 'show_expanded', 'is_active', 'execution_time',
+    'is_override_data_local', 'persistent_uid',
+    'users', 'tag', 'session_uid', 'is_evaluated', 'original',
+})
+
+# Object types whose evaluated geometry is part of their fingerprint.
+_GEOMETRY_TYPES = frozenset({'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'})
+
+
+def _plain(value):
+    """Reduce an RNA value to plain Python data with a stable repr.
+
+    IDs become their name (objects also carry their world matrix, so a moved
+    boolean cutter or curve target changes the fingerprint), arrays / vectors /
+    matrices become nested tuples, anything else opaque becomes its type name.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bpy.types.Object):
+        return ('Object', value.name, _plain(value.matrix_world))
+    if isinstance(value, bpy.types.ID):
+        return (type(value).__name__, value.name)
+    if hasattr(value, '__len__') and hasattr(value, '__iter__'):
+        try:
+            return tuple(_plain(v) for v in value)
+        except (TypeError, RuntimeError):
+            pass
+    return type(value).__name__
+
+
+def _rna_digest(h, struct):
+    """Feed every readable, non-collection RNA property of `struct` into `h`."""
+    for prop in struct.bl_rna.properties:
+        pid = prop.identifier
+        if pid in _FINGERPRINT_SKIP_RNA or prop.type == 'COLLECTION':
+            continue
+        try:
+            value = getattr(struct, pid)
+        except (AttributeError, RuntimeError):
+            continue
+        h.update(f"{pid}={_plain(value)!r};".encode())
+
+
+def _foreach_digest(h, seq, attr, typecode, width):
+    buf = array.array(typecode, [0]) * (len(seq) * width)
+    seq.foreach_get(attr, buf)
+    h.update(buf.tobytes())
+
+
+def _mesh_digest(h, mesh):
+    """Geometry, topology, UVs, smoothing and material indices of a mesh."""
+    h.update(b"mesh:%d:%d:%d;" % (len(mesh.vertices), len(mesh.loops), len(mesh.polygons)))
+    _foreach_digest(h, mesh.vertices, 'co', 'f', 3)
+    _foreach_digest(h, mesh.loops, 'vertex_index', 'i', 1)
+    _foreach_digest(h, mesh.polygons, 'loop_total', 'i', 1)
+    _foreach_digest(h, mesh.polygons, 'material_index', 'i', 1)
+    try:
+        smooth = [False] * len(mesh.polygons)
+        mesh.polygons.foreach_get('use_smooth', smooth)
+        h.update(bytes(smooth))
+    except (AttributeError, TypeError, RuntimeError):
+        pass
+    for layer in mesh.uv_layers:
+        h.update(f"uv:{layer.name};".encode())
+        _foreach_digest(h, layer.data, 'uv', 'f', 2)
+
+
+def _vertex_group_digest(h, obj):
+    """Skin weights - only worth the per-vertex walk when a rig deforms the mesh."""
+    h.update(repr([vg.name for vg in obj.vertex_groups]).encode())
+    for v in obj.data.vertices:
+        h.update(repr([(g.group, round(g.weight, 6)) for g in v.groups]).encode())
+
+
+def object_fingerprint(obj, depsgraph, evaluated=True):
+    """Hex digest of everything about `obj` that reaches an exported file.
+
+    `evaluated` hashes the depsgraph-evaluated geometry (modifiers, shape keys,
+    drivers, geometry nodes all included) - what Apply Modifiers bakes. With it
+    off the base mesh is hashed instead, which is what the exporter then writes.
+    Objects outside the view layer have no evaluated state; their base data plus
+    the modifier settings stand in for it.
+    """
+    h = hashlib.sha1()
+    h.update(f"{obj.name}|{obj.type}|{_plain(obj.matrix_world)}|{_plain(obj.parent)};".encode())
+    for slot in obj.material_slots:
+        h.update(f"mat:{slot.link}:{_plain(slot.material)};".encode())
+    for mod in obj.modifiers:
+        h.update(f"mod:{mod.type}:".encode())
+        _rna_digest(h, mod)
+        # Geometry Nodes inputs live in ID properties, not in bl_rna.
+        try:
+            keys = mod.keys()
+        except TypeError:
+            keys = ()
+        for key in keys:
+            h.update(f"{key}={_plain(mod[key])!r};".encode())
+
+    if obj.type in _GEOMETRY_TYPES:
+        if obj.type == 'MESH' and not evaluated:
+            _mesh_digest(h, obj.data)
+        else:
+            try:
+                source = obj.evaluated_get(depsgraph)
+                mesh = source.to_mesh()
+            except (RuntimeError, ReferenceError):
+                source, mesh = None, None
+            if mesh is not None:
+                try:
+                    _mesh_digest(h, mesh)
+                finally:
+                    source.to_mesh_clear()
+            elif obj.type == 'MESH':
+                _mesh_digest(h, obj.data)
+        if obj.type == 'MESH' and any(m.type == 'ARMATURE' for m in obj.modifiers):
+            _vertex_group_digest(h, obj)
+    elif obj.type == 'ARMATURE':
+        for bone in obj.data.bones:
+            h.update(f"bone:{bone.name}:{_plain(bone.parent)}:{_plain(bone.matrix_local)}"
+                     f":{bone.use_deform};".encode())
+        if obj.pose is not None:
+            for pbone in obj.pose.bones:
+                h.update(f"pose:{pbone.name}:{_plain(pbone.matrix_basis)};".encode())
+    elif obj.data is not None:
+        _rna_digest(h, obj.data)
+    return h.hexdigest()
+
+
+def export_settings_fingerprint(props, item):
+    """Hex digest of the global and per-row settings that shape an export."""
+    h = hashlib.sha1()
+    h.update(f"version={VERSION};".encode())
+    for name in _FINGERPRINT_PROPS:
+        h.update(f"{name}={_plain(getattr(props, name))!r};".encode())
+    for name in _FINGERPRINT_ITEM_PROPS:
+        h.update(f"item.{name}={_plain(getattr(item, name))!r};".encode())
+    if item.use_suffix_grouping:
+        suffixes = sorted(s.suffix for s in props.suffix_items if s.enabled)
+        h.update(f"suffixes={suffixes!r};".encode())
+    return h.hexdigest()
+
+
+def _output_size(filepath):
+    """Size of the file an export to `filepath` produced, or None if missing.
+    The glTF exporter writes `.glb` unless told otherwise, whatever the
+    extension it was handed, so both are accepted for a `.gltf` path."""
+    candidates = [filepath]
+    root, ext = os.path.splitext(filepath)
+    if ext.lower() == '.gltf':
+        candidates.append(root + '.glb')
+    for path in candidates:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            continue
+    return None
+
+
+class ExportCache:
+    """The fingerprint sidecar of one export folder.
+
+    Maps a key to {'fingerprint': hex, 'files': {basename: size}}. An entry
+    matches only if the fingerprint is equal AND every file it lists is still
+    on disk at the recorded size, so a deleted or hand-edited export is
+    written again.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.path = os.path.join(folder, EXPORT_CACHE_FILENAME)
+        self.entries = self._load()
+        self.dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != EXPORT_CACHE_VERSION:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+
+    def matches(self, key, fingerprint):
+        entry = self.entries.get(key)
+        if not entry or entry.get('fingerprint') != fingerprint or not entry.get('files'):
+            return False
+        return all(
+            _output_size(os.path.join(self.folder, name)) == size
+            for name, size in entry['files'].items()
+        )
+
+    def record(self, key, fingerprint, filenames):
+        files = {}
+        for name in filenames:
+            size = _output_size(os.path.join(self.folder, name))
+            if size is None:
+                return self.forget(key)
+            files[name] = size
+        self.entries[key] = {'fingerprint': fingerprint, 'files': files}
+        self.dirty = True
+
+    def forget(self, key):
+        if self.entries.pop(key, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        """Write the sidecar atomically; a failure only costs the next run time."""
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as fh:
+                json.dump({'version': EXPORT_CACHE_VERSION, 'entries': self.entries},
+                          fh, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"[MassExporter] Could not write export cache '{self.path}': {e}")
+
+
+class IncrementalExportRun:
+    """Per-run state of one Export All: the open sidecars, the row being
+    exported, the skip counters for the final report and a log of every file
+    (`files`: dicts of path / status / error) for background workers to
+    hand back.
+
+    `force` still fingerprints and records everything - so the next normal
+    run can skip again - it just never skips.
+    """
+
+    def __init__(self, force=False):
+        self.force = force
+        self.skipped_collections = 0
+        self.skipped_files = 0
+        self.files = []
+        self._caches = {}
+        self._collection = None   # (cache, key, fingerprint) of the open row
+        self._settings = ""
+        self._outputs = []
+        self._failed = False
+
+    def cache(self, folder):
+        folder = os.path.normpath(os.path.abspath(bpy.path.abspath(folder)))
+        if folder not in self._caches:
+            self._caches[folder] = ExportCache(folder)
+        return self._caches[folder]
+
+    # --- collection rows --------------------------------------------------
+
+    def begin_collection(self, props, item):
+        """Fingerprint a row; True when it is unchanged and can be skipped."""
+        collection = item.collection
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        self._settings = export_settings_fingerprint(props, item)
+        self._outputs = []
+        self._failed = False
+
+        objects = list(collection.all_objects)
+        if props.export_rig_with_mesh:
+            members = set(objects)
+            for obj in list(objects):
+                if obj.type != 'MESH':
+                    continue
+                for mod in obj.modifiers:
+                    if mod.type == 'ARMATURE' and mod.object and mod.object not in members:
+                        members.add(mod.object)
+                        objects.append(mod.object)
+        h = hashlib.sha1(self._settings.encode())
+        for obj in sorted(objects, key=lambda o: o.name):
+            h.update(object_fingerprint(obj, depsgraph, props.apply_modifiers).encode())
+        fingerprint = h.hexdigest()
+
+        cache = self.cache(item.export_path)
+        key = f"collection:{collection.name}"
+        self._collection = (cache, key, fingerprint)
+        if not self.force and cache.matches(key, fingerprint):
+            self.skipped_collections += 1
+            self._collection = None
+            return True
+        return False
+
+    def end_collection(self, ok):
+        """Remember the row's outputs, unless any of them failed."""
+        if self._collection is None:
+            return
+        cache, key, fingerprint = self._collection
+        if ok and not self._failed and self._outputs:
+            cache.record(key, fingerprint, self._outputs)
+        else:
+            cache.forget(key)
+        self._collection = None
+        self._settings = ""
+
+    # --- single files -----------------------------------------------------
+
+    def output_fingerprint(self, objects, props, filepath):
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        h = hashlib.sha1(f"{self._settings}|{os.path.basename(filepath)}".encode())
+        for obj in sorted(objects, key=lambda o: o.name):
+            h.update(object_fingerprint(obj, depsgraph, props.apply_modifiers).encode())
+        return h.hexdigest()
+
+    def output_unchanged(self, filepath, fingerprint):
+        name = os.path.basename(filepath)
+        if not self.force and self.cache(os.path.dirname(filepath)).matches(f"file:{name}", fingerprint):
+            self.skipped_files += 1
+            self.files.append({'path': filepath, 'status': 'skipped', 'error': ""})
+            self._note_output(filepath)
+            return True
+        return False
+
+    def output_done(self, filepath, fingerprint, ok, error=""):
+        name = os.path.basename(filepath)
+        cache = self.cache(os.path.dirname(filepath))
+        self.files.append({'path': filepath, 'status': 'exported' if ok else 'failed',
+                           'error': error})
+        if ok and fingerprint is not None:
+            cache.record(f"file:{name}", fingerprint, [name])
+            self._note_output(filepath)
+        else:
+            # Failed, or written without a fingerprint: nothing about this
+            # file - or the row it belongs to - can be trusted next time.
+            cache.forget(f"file:{name}")
+            self._failed = True
+
+    def _note_output(self, filepath):
+        # Only files in the row's own folder belong to its collection entry.
+        if self._collection is not None and \
+                self.cache(os.path.dirname(filepath)) is self._collection[0]:
+            self._outputs.append(os.path.basename(filepath))
+
+    def save(self):
+        for cache in self._caches.values():
+            cache.save()
+
+
+# ============================================================================
+# Export Planning
+# ============================================================================
+#
+# Every export mode used to pick its objects while it was already changing
+# selection and visibility. The planner resolves a row into the list of files
+# it will write first - pure reads, no selection, visibility, transform or
+# data change - and `export_collection` then executes that list. The same plan
+# feeds the Dry Run preview (with estimated vertex counts) and the background
+# export scheduler.
+
+# Jobs above this estimate are flagged in the Dry Run preview.
+DRY_RUN_HEAVY_VERTICES = 1_000_000
+
+# Rough vertex multipliers of the modifiers that grow (or shrink) a mesh the
+# most. Anything not listed counts as 1x; the estimate is for spotting a
+# runaway export, not for budgeting.
+_VERTEX_FACTORS = {
+    'SUBSURF': lambda m: 4 ** m.levels,
+    'MULTIRES': lambda m: 4 ** m.levels,
+    'ARRAY': lambda m: m.count if m.fit_type == 'FIXED_COUNT' else 1,
+    'MIRROR': lambda m: 2 ** sum(1 for axis in m.use_axis if axis),
+    'SOLIDIFY': lambda m: 2,
+    'SCREW': lambda m: max(1, m.steps),
+    'DECIMATE': lambda m: m.ratio if m.decimate_type == 'COLLAPSE' else 1,
+}
+
+
+class ExportJob:
+    """One file an export will write.
+
+    kind selects how the executor writes it:
+      'objects'        `objects` merged into one file (export_objects_as_single)
+      'object'         the single object in `objects` (export_single_object)
+      'collection'     the whole collection, hierarchy intact, as one file
+      'joined_empties' children of every parent empty in `collection`, joined
+      'empty_child'    one child of `empty`, exported as-is, the empty parked
+                       at the origin first when `center_empty` is set
+    `modifiers` maps object name -> names of the modifiers that will be baked;
+    `bake_transforms` / `move_to_center` say which transform steps run.
+    """
+
+    __slots__ = ('kind', 'filepath', 'name', 'objects', 'collection', 'empty',
+                 'center_empty', 'bake_transforms', 'move_to_center', 'modifiers',
+                 'vertices')
+
+    def __init__(self, kind, filepath, name, objects, collection=None, empty=None,
+                 center_empty=False, bake_transforms=False, move_to_center=False):
+        self.kind = kind
+        self.filepath = filepath
+        self.name = name
+        self.objects = objects
+        self.collection = collection
+        self.empty = empty
+        self.center_empty = center_empty
+        self.bake_transforms = bake_transforms
+        self.move_to_center = move_to_center
+        self.modifiers = {}
+        self.vertices = 0
+
+
+def export_mode(item, props):
+    """The export path `export_collection` takes for a row, in its priority order."""
+    if item.export_as_single_fbx:
+        return 'whole_collection'
+    if item.use_suffix_grouping and len(props.suffix_items) > 0:
+        return 'suffix_groups'
+    if item.export_subcollections_as_single:
+        return 'subcollections'
+    if item.use_empty_origins:
+        return 'empty_origins'
+    return 'merged' if item.merge_to_single else 'per_object'
+
+
+def modifier_bake_plan(obj, rigs_in_selection, skip_armature=False, only_visible=False):
+    """(to_apply, preserved) modifier lists for one mesh object.
+
+    Armature modifiers whose rig is in the export selection are preserved so
+    the skin binding survives; `skip_armature` preserves every armature
+    modifier. `only_visible` leaves out modifiers disabled in the viewport,
+    except preserved armature bindings.
+    """
+    to_apply, preserved = [], []
+    for mod in obj.modifiers:
+        if mod.type == 'ARMATURE' and (skip_armature or mod.object in rigs_in_selection):
+            preserved.append(mod)
+        elif not only_visible or mod.show_viewport:
+            to_apply.append(mod)
+    return to_apply, preserved
+
+
+def estimate_vertices(obj, modifiers=()):
+    """Estimated vertex count of `obj` after baking `modifiers`; 0 for non-meshes."""
+    if obj.type != 'MESH' or obj.data is None:
+        return 0
+    count = float(len(obj.data.vertices))
+    for mod in modifiers:
+        factor = _VERTEX_FACTORS.get(mod.type)
+        if factor is not None:
+            try:
+                count *= factor(mod)
+            except (AttributeError, TypeError):
+                pass
+    return int(count)
+
+
+def _collection_meshes(collection):
+    """Mesh objects of `collection` and its sub-collections, parents first
+    (the order get_collection_objects has always used)."""
+    objects = [obj for obj in collection.objects if obj.type == 'MESH']
+    for child in collection.children:
+        objects.extend(_collection_meshes(child))
+    return objects
+
+
+def _empties_with_mesh_children(collection):
+    """(empty, mesh children) for every parent empty in the collection tree,
+    first occurrence per name."""
+    found = {}
+    stack = [collection]
+    while stack:
+        coll = stack.pop(0)
+        for obj in coll.objects:
+            if obj.type == 'EMPTY' and obj.name not in found:
+                children = [child for child in obj.children if child.type == 'MESH']
+                if children:
+                    found[obj.name] = (obj, children)
+        stack.extend(coll.children)
+    return list(found.values())
+
+
+def _finish_job(job, props, item):
+    """Fill in the modifiers a job will bake and its estimated vertex count."""
+    skip_armature = props.skip_armature_modifier
+    if job.kind == 'joined_empties' and item.apply_modifiers_before_join:
+        # The join routine bakes the whole stack, armatures included, itself.
+        bake, only_visible, skip_armature = True, item.apply_only_visible, False
+        rigs = set()
+    else:
+        bake = props.apply_modifiers
+        only_visible = props.apply_only_visible_modifiers
+        rigs = {o for o in job.objects if o.type == 'ARMATURE'}
+        if props.export_rig_with_mesh:
+            rigs.update(
+                mod.object for obj in job.objects if obj.type == 'MESH'
+                for mod in obj.modifiers if mod.type == 'ARMATURE' and mod.object
+            )
+    for obj in job.objects:
+        if obj.type != 'MESH':
+            continue
+        to_apply = []
+        if bake:
+            to_apply, _preserved = modifier_bake_plan(
+                obj, rigs, skip_armature=skip_armature, only_visible=only_visible,
+            )
+        if to_apply:
+            job.modifiers[obj.name] = [mod.name for mod in to_apply]
+        job.vertices += estimate_vertices(obj, to_apply)
+    return job
+
+
+def plan_collection_jobs(props, item):
+    """Resolve one row into the ExportJobs it will write. Reads only.
+
+    Mirrors the mode priority of export_collection: whole collection as one
+    file, suffix grouping, sub-collections as single, empty origins, then
+    merged / per-object.
+    """
+    collection = item.collection
+    export_path = item.export_path
+    ext = props.export_format.lower()
+    mode = export_mode(item, props)
+
+    def path(name):
+        return os.path.join(export_path, f"{name}.{ext}")
+
+    def objects_job(objects, name):
+        return ExportJob('objects', path(name), name, objects,
+                         bake_transforms=props.apply_transforms,
+                         move_to_center=item.move_to_center)
+
+    def flat_jobs(objects, name):
+        """Merged or per-object export of `objects`, by the row's merge flag."""
+        if not objects:
+            return []
+        if item.merge_to_single:
+            return [objects_job(objects, name)]
+        return [
+            ExportJob('object', path(obj.name), obj.name, [obj],
+                      bake_transforms=props.apply_transforms,
+                      move_to_center=item.move_to_center)
+            for obj in objects
+        ]
+
+    def joined_jobs(coll):
+        """Join-all-empties export of `coll`; without parent empties it falls
+        back to the flat export, exactly like the join routine does."""
+        empties = _empties_with_mesh_children(coll)
+        if not empties:
+            return flat_jobs(_collection_meshes(coll), coll.name)
+        children = [child for _empty, kids in empties for child in kids]
+        return [ExportJob('joined_empties', path(coll.name), coll.name, children,
+                          collection=coll)]
+
+    jobs = []
+    if mode == 'whole_collection':
+        objects = [obj for obj in collection.all_objects
+                   if obj.type in MASSEXPORTER_OT_export_all._SINGLE_FBX_TYPES]
+        if objects:
+            name = (item.single_fbx_custom_name or "").strip() or collection.name
+            jobs.append(ExportJob('collection', path(name), name, objects,
+                                  collection=collection, move_to_center=item.move_to_center))
+    elif mode == 'suffix_groups':
+        groups = find_suffix_groups_in_collection(
+            collection, props.suffix_items, include_subcollections=True,
+            debug=props.debug_mode,
+        )
+        for base_name, group in groups.items():
+            meshes = [obj for obj, _suffix in group['objects'] if obj.type == 'MESH']
+            for empty in group['empties']:
+                meshes.extend(c for c in empty.children if c.type == 'MESH' and c not in meshes)
+            for subcoll in group['subcollections']:
+                meshes.extend(o for o in subcoll.all_objects if o.type == 'MESH' and o not in meshes)
+            if meshes:
+                jobs.append(objects_job(meshes, base_name))
+    elif mode == 'subcollections':
+        main_objects = [obj for obj in collection.objects if obj.type == 'MESH']
+        if main_objects:
+            jobs.append(objects_job(main_objects, f"{collection.name}_main"))
+        for sub in collection.children:
+            if item.use_empty_origins and item.join_empty_children:
+                jobs.extend(joined_jobs(sub))
+            else:
+                sub_objects = _collection_meshes(sub)
+                if sub_objects:
+                    jobs.append(objects_job(sub_objects, sub.name))
+    elif mode == 'empty_origins':
+        if item.join_empty_children:
+            jobs.extend(joined_jobs(collection))
+        else:
+            empties = _empties_with_mesh_children(collection)
+            if not empties:
+                jobs.extend(flat_jobs(_collection_meshes(collection), collection.name))
+            for empty, children in empties:
+                for child in children:
+                    name = f"{empty.name}_{child.name}" if len(children) > 1 else empty.name
+                    jobs.append(ExportJob('empty_child', path(name), name, [child], empty=empty,
+                                          center_empty=item.center_parent_empties))
+    else:
+        jobs.extend(flat_jobs(_collection_meshes(collection), collection.name))
+
+    return [_finish_job(job, props, item) for job in jobs]
+
+
+# ============================================================================
+# Background Export (worker processes)
+# ============================================================================
+#
+# Export All can run out of process: the UI Blender writes an export plan to
+# JSON, saves a copy of the .blend next to it and starts N `blender --background`
+# workers (background_worker.py), each exporting one shard of the plan's rows
+# through the very same Export All code. The UI stays responsive and rows that
+# do not depend on each other export on separate CPU cores.
+
+BACKGROUND_PLAN_VERSION = 1
+BACKGROUND_WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                        "background_worker.py")
+
+
+def exportable_rows(props):
+    """(index, item) for every row Export All would export."""
+    return [
+        (index, item) for index, item in enumerate(props.collection_items)
+        if item.export_enabled and item.collection and item.export_path
+        and hasattr(item.collection, 'all_objects')
+    ]
+
+
+def shard_rows(rows, worker_count):
+    """Split plan rows into at most `worker_count` shards of similar weight.
+
+    Rows that write into the same folder stay in one shard: they share the
+    incremental-export sidecar there and may even write the same file names,
+    so two workers must never own them at once. Folder groups are handed out
+    heaviest first, each to the currently lightest shard.
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault(os.path.normcase(row['export_path']), []).append(row)
+    shards = [[0, []] for _ in range(max(1, min(worker_count, len(groups))))]
+    for group in sorted(groups.values(), key=lambda g: -sum(r['weight'] for r in g)):
+        lightest = min(shards, key=lambda shard: shard[0])
+        lightest[0] += sum(r['weight'] for r in group)
+        lightest[1].extend(r['index'] for r in group)
+    return [sorted(indices) for _weight, indices in shards if indices]
+
+
+def build_export_plan(context, props, blend_path, worker_count):
+    """The JSON-ready plan a background export hands to its workers."""
+    rows = []
+    for index, item in exportable_rows(props):
+        jobs = plan_collection_jobs(props, item)
+        objects = sum(len(job.objects) for job in jobs)
+        vertices = sum(job.vertices for job in jobs)
+        rows.append({
+            'index': index,
+            'collection': item.collection.name,
+            'mode': export_mode(item, props),
+            'export_path': os.path.normpath(bpy.path.abspath(item.export_path)),
+            'files': [os.path.basename(job.filepath) for job in jobs],
+            'objects': objects,
+            'vertices': vertices,
+            # Scheduling weight: per-file and per-object overhead plus the
+            # estimated geometry size.
+            'weight': len(jobs) + objects + vertices // 1000,
+        })
+    settings = {name: _plain(getattr(props, name)) for name in _FINGERPRINT_PROPS}
+    settings['force_export'] = props.force_export
+    settings['export_hidden_collections'] = props.export_hidden_collections
+    return {
+        'version': BACKGROUND_PLAN_VERSION,
+        'blend': blend_path,
+        'scene': context.scene.name,
+        'addon_dir': os.path.dirname(os.path.abspath(__file__)),
+        'settings': settings,
+        'rows': rows,
+        'shards': shard_rows(rows, worker_count),
+    }
+
+
+def worker_command(plan, plan_path, shard, result_path):
+    """Command line of the background Blender that exports one shard."""
+    return [
+        bpy.app.binary_path, '--background', '--factory-startup', plan['blend'],
+        '--python-exit-code', '1',
+        '--python', BACKGROUND_WORKER_SCRIPT,
+        '--', plan_path, str(shard), result_path,
+    ]
 
 
 class CollectionExportItem(PropertyGroup):
@@ -874,7 +1665,8 @@ class MassExporterProperties(PropertyGroup):
         description=(
             "Only bake modifiers that are enabled in the viewport (monitor icon on). "
             "Blender's own Apply Modifier operator ignores that toggle and bakes disabled "
-            "modifiers anyway, so they are stripped from the temporary export copy first. "
+            "modifiers anyway; the temporary export copy is built from the viewport's "
+            "evaluated result instead, so they are left out. "
             "Armature modifiers kept for rig binding are never stripped"
         ),
         default=True
@@ -953,6 +1745,39 @@ class MassExporterProperties(PropertyGroup):
         default=True
     )
 
+    force_export: BoolProperty(
+        name="Force Re-export",
+        description=(
+            "Export every enabled collection even if nothing changed since the "
+            "last Export All. When off, collections and files whose geometry, "
+            "modifiers, transforms, materials and export settings match the "
+            "fingerprint cache in their export folder are skipped"
+        ),
+        default=False
+    )
+
+    use_background_export: BoolProperty(
+        name="Export in Background",
+        description=(
+            "Run Export All in separate background Blender processes working on "
+            "a saved copy of this file, so the UI stays usable and collections "
+            "export in parallel. Collections sharing an export folder are "
+            "exported by the same worker"
+        ),
+        default=False
+    )
+
+    background_workers: IntProperty(
+        name="Workers",
+        description=(
+            "Number of background Blender processes. Each one loads the whole "
+            "file, so memory use grows with the count"
+        ),
+        default=2,
+        min=1,
+        max=32
+    )
+
 # Blender has two separate "hide" flags:
 #   - Collection.hide_viewport: the monitor icon in the outliner (disable in
 #     viewports globally, across all view layers)
@@ -1274,12 +2099,21 @@ class MASSEXPORTER_OT_export_all(Operator):
     bl_label = "Export All"
     bl_description = "Export all enabled collections - join happens on-demand during each export"
 
+    # Set by background workers only (see MASSEXPORTER_OT_export_all_background):
+    # the rows of their shard, and where to write what happened.
+    row_indices: StringProperty(options={'HIDDEN', 'SKIP_SAVE'})
+    result_path: StringProperty(options={'HIDDEN', 'SKIP_SAVE'})
+
     def execute(self, context):
+        props = context.scene.mass_exporter_props
+        if props.use_background_export and not self.row_indices and not bpy.app.background:
+            bpy.ops.massexporter.export_all_background('INVOKE_DEFAULT')
+            return {'FINISHED'}
+
         # Force OBJECT mode to avoid operator context errors
         if bpy.ops.object.mode_set.poll():
             bpy.ops.object.mode_set(mode='OBJECT')
 
-        props = context.scene.mass_exporter_props
         exported_count = 0
         exported_collection_names = []  # NEW: Track exported collection names
 
@@ -1339,9 +2173,18 @@ class MASSEXPORTER_OT_export_all(Operator):
         # Export only collections whose checkbox is enabled, regardless of
         # which row is active/selected in the UIList. A per-item try/except
         # ensures one bad collection does not abort the rest of the batch.
+        # Rows and files whose fingerprint is unchanged since the last run are
+        # skipped (see IncrementalExportRun) unless Force Re-export is on.
         failed = []
+        run = IncrementalExportRun(force=props.force_export)
+        self._export_run = run
+        only_rows = None
+        if self.row_indices:
+            only_rows = {int(i) for i in self.row_indices.split(",") if i.strip()}
         try:
-            for item in props.collection_items:
+            for index, item in enumerate(props.collection_items):
+                if only_rows is not None and index not in only_rows:
+                    continue
                 if not (item.export_enabled and item.collection and item.export_path):
                     continue
                 coll = item.collection
@@ -1356,10 +2199,21 @@ class MASSEXPORTER_OT_export_all(Operator):
                                 f"Row '{coll_name}' is not a Collection "
                                 f"(type={type(coll).__name__}) — skipping")
                     continue
+                try:
+                    if run.begin_collection(props, item):
+                        if props.debug_mode:
+                            print(f"\n--- '{coll_name}' unchanged since last export, skipping ---")
+                        continue
+                except Exception as e:
+                    # A fingerprint that cannot be taken must never block the
+                    # export itself — fall through and export the row.
+                    print(f"[MassExporter] Could not fingerprint '{coll_name}': {e}")
                 if props.debug_mode:
                     print(f"\n--- Exporting '{coll_name}' ---")
+                ok = False
                 try:
-                    if self.export_collection(context, props, item):
+                    ok = self.export_collection(context, props, item)
+                    if ok:
                         exported_count += 1
                         exported_collection_names.append(coll_name)
                 except Exception as e:
@@ -1367,7 +2221,12 @@ class MASSEXPORTER_OT_export_all(Operator):
                     if props.debug_mode:
                         import traceback
                         traceback.print_exc()
+                finally:
+                    run.end_collection(ok)
         finally:
+            run.save()
+            self._export_run = None
+
             # Surface per-item failures to the user.
             for coll_name, err in failed:
                 self.report({'ERROR'}, f"Export failed for '{coll_name}': {err}")
@@ -1398,16 +2257,41 @@ class MASSEXPORTER_OT_export_all(Operator):
                 print("=== ALL POSITIONS RESTORED ===")
 
         # NEW: Report exported collection names
+        skipped_str = ""
+        if run.skipped_collections or run.skipped_files:
+            skipped_str = (f" — skipped {run.skipped_collections} unchanged collection(s)"
+                           f" and {run.skipped_files} unchanged file(s)")
         if exported_count > 0:
             names_str = ", ".join(exported_collection_names[:3])  # Show first 3
             if len(exported_collection_names) > 3:
                 names_str += f", ... ({len(exported_collection_names)} total)"
-            self.report({'INFO'}, f"Exported {exported_count} collections: {names_str}")
+            self.report({'INFO'}, f"Exported {exported_count} collections: {names_str}{skipped_str}")
+        elif skipped_str:
+            self.report({'INFO'}, "Everything up to date" + skipped_str +
+                        " (enable 'Force Re-export' to write anyway)")
         else:
             self.report({'WARNING'}, "No collections were exported")
-            
+
+        if self.result_path:
+            MASSEXPORTER_OT_export_all._write_result(self.result_path, {
+                'exported': exported_collection_names,
+                'failed': failed,
+                'skipped_collections': run.skipped_collections,
+                'skipped_files': run.skipped_files,
+                'files': run.files,
+            })
+
         return {'FINISHED'}
 
+    @staticmethod
+    def _write_result(path, result):
+        """Write a worker's result JSON atomically, so a worker killed
+        mid-write never leaves a half file for the UI to parse."""
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            json.dump(result, fh, indent=1)
+        os.replace(tmp, path)
+
     @staticmethod
     def _get_layer_collection_path(root_lc, target_coll):
         """Return all LayerCollections from root down to the one wrapping target_coll.
@@ -1721,68 +2605,60 @@ class MASSEXPORTER_OT_export_all(Operator):
         visibility_backup = MASSEXPORTER_OT_export_all._unhide_collection_for_export(collection)
 
         try:
-            # Handle different export modes
-            # Whole-collection-as-one-file takes highest priority — it bundles
-            # every object (meshes + armatures + empties + ...) into a single
-            # FBX with hierarchy intact, so it should short-circuit the other
-            # per-collection modes.
-            if item.export_as_single_fbx:
-                return MASSEXPORTER_OT_export_all.export_collection_as_single_fbx(self, context, props, item)
-            # Suffix grouping takes priority if enabled
-            if item.use_suffix_grouping and len(props.suffix_items) > 0:
-                return MASSEXPORTER_OT_export_all.export_with_suffix_grouping(self, context, props, item)
-            elif item.export_subcollections_as_single:
-                return MASSEXPORTER_OT_export_all.export_subcollections_as_single(self, context, props, item)
-            elif item.use_empty_origins:
-                return MASSEXPORTER_OT_export_all.export_with_empty_origins(self, context, props, item)
-            else:
-                objects = MASSEXPORTER_OT_export_all.get_collection_objects(self, collection)
-
-                if not objects:
-                    self.report({'WARNING'}, f"No objects found in collection: {collection.name}")
-                    return False
+            # Resolve the row into its files first (pure reads — see
+            # plan_collection_jobs for the mode priority), then write them.
+            jobs = plan_collection_jobs(props, item)
+            if not jobs:
+                self.report({'WARNING'}, f"No objects found in collection: {collection.name}")
+                return False
 
-                if item.merge_to_single:
-                    return MASSEXPORTER_OT_export_all.export_objects_as_single(self, context, props, objects, collection.name, export_path, item=item)
-                else:
-                    success_count = 0
-                    for obj in objects:
-                        if MASSEXPORTER_OT_export_all.export_single_object(self, context, props, obj, export_path, item=item):
-                            success_count += 1
-                    return success_count > 0
+            if props.debug_mode:
+                print(f"Planned {len(jobs)} file(s) ({export_mode(item, props)}):")
+                for job in jobs:
+                    print(f"  [{job.kind}] {os.path.basename(job.filepath)}: "
+                          f"{len(job.objects)} object(s), ~{job.vertices} vertices")
+
+            success_count = 0
+            for job in jobs:
+                if MASSEXPORTER_OT_export_all.run_export_job(self, context, props, item, job):
+                    success_count += 1
+                    if props.debug_mode:
+                        print(f"  ✓ {os.path.basename(job.filepath)}")
+                elif props.debug_mode:
+                    print(f"  ✗ {os.path.basename(job.filepath)}")
+            return success_count > 0
         finally:
             if visibility_backup:
                 MASSEXPORTER_OT_export_all._restore_collection_for_export(visibility_backup)
 
-    def export_subcollections_as_single(self, context, props, item):
-        """Export each sub-collection as a single merged object"""
-        collection = item.collection
-        export_path = item.export_path
-        success_count = 0
-
-        if props.debug_mode:
-            print(f"Exporting sub-collections as single files for: {collection.name}")
-
-        # Export main collection objects (if any) as one file
-        main_objects = [obj for obj in collection.objects if obj.type == 'MESH']
-        if main_objects:
-            if MASSEXPORTER_OT_export_all.export_objects_as_single(self, context, props, main_objects, f"{collection.name}_main", export_path, item=item):
-                success_count += 1
-
-        # Export each sub-collection as individual merged files
-        for sub_collection in collection.children:
-            # FIXED: Use new join logic if join_empty_children is enabled
-            if item.use_empty_origins and item.join_empty_children:
-                # Join all empties in this sub-collection and export as one
-                if MASSEXPORTER_OT_export_all.export_collection_with_all_empties_joined(self, context, props, item, sub_collection, export_path):
-                    success_count += 1
-            else:
-                sub_objects = MASSEXPORTER_OT_export_all.get_collection_objects(self, sub_collection)
-                if sub_objects:
-                    if MASSEXPORTER_OT_export_all.export_objects_as_single(self, context, props, sub_objects, sub_collection.name, export_path, item=item):
-                        success_count += 1
-
-        return success_count > 0
+    def run_export_job(self, context, props, item, job):
+        """Write one planned ExportJob with the export routine for its kind."""
+        export_path = os.path.dirname(job.filepath)
+        if job.kind == 'objects':
+            return MASSEXPORTER_OT_export_all.export_objects_as_single(
+                self, context, props, job.objects, job.name, export_path, item=item)
+        if job.kind == 'object':
+            return MASSEXPORTER_OT_export_all.export_single_object(
+                self, context, props, job.objects[0], export_path, item=item)
+        if job.kind == 'collection':
+            return MASSEXPORTER_OT_export_all.export_whole_collection(self, context, props, job)
+        if job.kind == 'joined_empties':
+            return MASSEXPORTER_OT_export_all.export_collection_with_all_empties_joined(
+                self, context, props, item, job.collection, export_path)
+        if job.kind == 'empty_child':
+            if not job.center_empty:
+                return MASSEXPORTER_OT_export_all.export_single_object_simple(
+                    self, context, props, job.objects[0], job.name, export_path)
+            original_empty_pos = job.empty.location.copy()
+            try:
+                job.empty.location = (0.0, 0.0, 0.0)
+                bpy.context.view_layer.update()
+                return MASSEXPORTER_OT_export_all.export_single_object_simple(
+                    self, context, props, job.objects[0], job.name, export_path)
+            finally:
+                job.empty.location = original_empty_pos
+                bpy.context.view_layer.update()
+        raise ValueError(f"unknown export job kind '{job.kind}'")
 
     # Object types that survive a round-trip through the FBX exporter. Anything
     # else (e.g. metaballs, volumes, grease pencil) is dropped silently and only
@@ -1792,18 +2668,6 @@ class MASSEXPORTER_OT_export_all(Operator):
         'META', 'FONT', 'CAMERA', 'LIGHT', 'LATTICE',
     })
 
-    @staticmethod
-    def _collect_collection_objects_for_single_fbx(collection):
-        """Return every exportable object from `collection` and its descendants.
-
-        Uses `collection.all_objects` so subcollections are included with no
-        manual recursion. Order is deterministic for stable debug output.
-        """
-        return [
-            obj for obj in collection.all_objects
-            if obj.type in MASSEXPORTER_OT_export_all._SINGLE_FBX_TYPES
-        ]
-
     @staticmethod
     def _center_root_objects_temporarily(objects):
         """Park every export-set root at world (0,0,0) for the export.
@@ -1853,7 +2717,7 @@ class MASSEXPORTER_OT_export_all(Operator):
                 obj.location = original
         bpy.context.view_layer.update()
 
-    def export_collection_as_single_fbx(self, context, props, item):
+    def export_whole_collection(self, context, props, job):
         """Export the whole collection (meshes + armatures + empties + ...)
         as a single file, preserving hierarchy.
 
@@ -1862,223 +2726,33 @@ class MASSEXPORTER_OT_export_all(Operator):
         picked up via `perform_export`'s `_select_associated_rigs` path when
         `export_rig_with_mesh` is enabled globally.
         """
-        collection = item.collection
-        export_path = item.export_path
-
-        if props.debug_mode:
-            print(f"\n=== SINGLE-FBX EXPORT: {collection.name} ===")
-
-        objects = MASSEXPORTER_OT_export_all._collect_collection_objects_for_single_fbx(collection)
-        if not objects:
-            self.report({'WARNING'}, f"No exportable objects in: {collection.name}")
-            return False
+        objects = job.objects
 
         if props.debug_mode:
+            print(f"\n=== SINGLE-FBX EXPORT: {job.collection.name} ===")
             print(f"  {len(objects)} objects:")
             for o in objects:
                 print(f"    [{o.type}] {o.name}")
 
-        # Resolve filename: custom override (trimmed) falls back to collection name.
-        custom = (item.single_fbx_custom_name or "").strip()
-        out_name = custom if custom else collection.name
-
         batch_select_objects(objects, context)
 
-        # Per-collection "Move to Center" — translate root-level objects so
-        # their centroid lands at the origin for the export, then restore.
+        # Per-collection "Move to Center" — park the export-set roots at the
+        # origin for the export, then restore.
         location_backup = None
-        if item.move_to_center:
+        if job.move_to_center:
             location_backup = MASSEXPORTER_OT_export_all._center_root_objects_temporarily(objects)
 
         try:
             if props.override_materials and props.override_material:
                 MASSEXPORTER_OT_export_all.apply_material_overrides(self, objects, props)
 
-            filename = f"{out_name}.{props.export_format.lower()}"
-            filepath = os.path.join(export_path, filename)
-
             if props.debug_mode:
-                print(f"  Exporting to: {filepath}")
+                print(f"  Exporting to: {job.filepath}")
 
-            return MASSEXPORTER_OT_export_all.perform_export(self, props, filepath)
+            return MASSEXPORTER_OT_export_all.perform_export(self, props, job.filepath)
         finally:
             MASSEXPORTER_OT_export_all._restore_root_object_locations(location_backup)
 
-    def export_with_suffix_grouping(self, context, props, item):
-        """
-        Export with suffix grouping enabled.
-        Groups objects/empties/subcollections by base name and exports them together.
-        Example: sm_cube_4x4 and sm_cube_4x4_COL are exported as single file 'sm_cube_4x4.fbx'
-        """
-        collection = item.collection
-        export_path = item.export_path
-        success_count = 0
-
-        if props.debug_mode:
-            print(f"\n=== SUFFIX GROUPING EXPORT: {collection.name} ===")
-            print(f"Enabled suffixes: {[s.suffix for s in props.suffix_items if s.enabled]}")
-
-        # Find all groups based on suffix matching
-        groups = find_suffix_groups_in_collection(
-            collection,
-            props.suffix_items,
-            include_subcollections=True,
-            debug=props.debug_mode
-        )
-
-        if not groups:
-            self.report({'WARNING'}, f"No objects found in collection: {collection.name}")
-            return False
-
-        if props.debug_mode:
-            print(f"\nFound {len(groups)} export group(s):")
-            for base_name, group_data in groups.items():
-                obj_count = len(group_data['objects'])
-                empty_count = len(group_data['empties'])
-                coll_count = len(group_data['subcollections'])
-                print(f"  '{base_name}': {obj_count} objects, {empty_count} empties, {coll_count} subcollections")
-
-        # Export each group
-        for base_name, group_data in groups.items():
-            # Collect all mesh objects from this group
-            all_meshes = []
-
-            # Add direct objects
-            for obj, suffix in group_data['objects']:
-                if obj.type == 'MESH':
-                    all_meshes.append(obj)
-
-            # Add children from empties
-            for empty in group_data['empties']:
-                for child in empty.children:
-                    if child.type == 'MESH' and child not in all_meshes:
-                        all_meshes.append(child)
-
-            # Add objects from subcollections
-            for subcoll in group_data['subcollections']:
-                for obj in subcoll.all_objects:
-                    if obj.type == 'MESH' and obj not in all_meshes:
-                        all_meshes.append(obj)
-
-            if not all_meshes:
-                if props.debug_mode:
-                    print(f"  Skipping '{base_name}' - no mesh objects found")
-                continue
-
-            if props.debug_mode:
-                print(f"\n  Exporting group '{base_name}' with {len(all_meshes)} mesh(es):")
-                for mesh in all_meshes:
-                    print(f"    - {mesh.name}")
-
-            # Export this group as a single file
-            if MASSEXPORTER_OT_export_all.export_objects_as_single(
-                self, context, props, all_meshes, base_name, export_path, item=item
-            ):
-                success_count += 1
-                if props.debug_mode:
-                    print(f"  ✓ Successfully exported '{base_name}'")
-            else:
-                if props.debug_mode:
-                    print(f"  ✗ Failed to export '{base_name}'")
-
-        if props.debug_mode:
-            print(f"\n=== SUFFIX GROUPING COMPLETE: {success_count}/{len(groups)} groups exported ===")
-
-        return success_count > 0
-
-    def export_with_empty_origins(self, context, props, item):
-        """Use empty origins for export centering
-        FIXED: If join_empty_children is enabled, joins ALL empties together into ONE export"""
-        collection = item.collection
-        export_path = item.export_path
-
-        if props.debug_mode:
-            print(f"Exporting with empty origins for: {collection.name}")
-
-        # FIXED: If join is enabled, export the entire collection as ONE joined file
-        if item.join_empty_children:
-            return MASSEXPORTER_OT_export_all.export_collection_with_all_empties_joined(self, context, props, item, collection, export_path)
-
-        # Original behavior: export each empty separately (without join)
-        return MASSEXPORTER_OT_export_all.export_with_empty_origins_individual(self, context, props, item)
-
-    def export_with_empty_origins_individual(self, context, props, item):
-        """Export each empty's children individually (original behavior without join)"""
-        collection = item.collection
-        export_path = item.export_path
-        success_count = 0
-
-        # Find empties with children in this collection
-        def find_empties_in_collection(collection):
-            """Recursively find empties with children in collection and sub-collections"""
-            empties_found = []
-            
-            # Check objects directly in collection
-            for obj in collection.objects:
-                if obj.type == 'EMPTY':
-                    children = [child for child in obj.children if child.type == 'MESH']
-                    if children:
-                        empties_found.append((obj, children))
-            
-            # Check sub-collections
-            for sub_coll in collection.children:
-                empties_found.extend(find_empties_in_collection(sub_coll))
-            
-            return empties_found
-        
-        # Collect all empties
-        all_empties = find_empties_in_collection(collection)
-        
-        # Remove duplicates
-        unique_empties = {}
-        for empty, children in all_empties:
-            if empty.name not in unique_empties:
-                unique_empties[empty.name] = (empty, children)
-        
-        if not unique_empties:
-            if props.debug_mode:
-                print("No empties with children found")
-            # No empties, export normally
-            objects = MASSEXPORTER_OT_export_all.get_collection_objects(self, collection)
-            if objects:
-                if item.merge_to_single:
-                    return MASSEXPORTER_OT_export_all.export_objects_as_single(self, context, props, objects, collection.name, export_path, item=item)
-                else:
-                    success_count = 0
-                    for obj in objects:
-                        if MASSEXPORTER_OT_export_all.export_single_object(self, context, props, obj, export_path, item=item):
-                            success_count += 1
-                    return success_count > 0
-            return False
-        
-        if props.debug_mode:
-            print(f"Found {len(unique_empties)} empties to process individually")
-
-        # Process each empty
-        for empty_name, (empty, children) in unique_empties.items():
-            if props.debug_mode:
-                print(f"\n--- PROCESSING EMPTY: {empty.name} ---")
-
-            if item.center_parent_empties:
-                original_empty_pos = empty.location.copy()
-
-                try:
-                    empty.location = (0.0, 0.0, 0.0)
-                    bpy.context.view_layer.update()
-
-                    # Export children individually
-                    if MASSEXPORTER_OT_export_all.export_children_individual(self, context, props, empty, children, export_path):
-                        success_count += 1
-
-                finally:
-                    empty.location = original_empty_pos
-                    bpy.context.view_layer.update()
-            else:
-                if MASSEXPORTER_OT_export_all.export_children_individual(self, context, props, empty, children, export_path):
-                    success_count += 1
-
-        return success_count > 0
-
     def export_collection_with_all_empties_joined(self, context, props, item, collection, export_path):
         """
         ========== FIXED v12: Export meshes even when no empties present ==========
@@ -2378,29 +3052,6 @@ class MASSEXPORTER_OT_export_all(Operator):
             if original_active and original_active.name in bpy.data.objects:
                 context.view_layer.objects.active = original_active
 
-    def export_children_individual(self, context, props, empty, children, export_path):
-        """Export children individually"""
-        if not children:
-            return False
-
-        empty_name = empty.name
-        success_count = 0
-        
-        if props.debug_mode:
-            print(f"Exporting children of {empty_name} individually")
-
-        # Export each child individually
-        for i, child in enumerate(children):
-            if props.debug_mode:
-                print(f"Exporting {child.name} at world position: {child.matrix_world.translation}")
-
-            # Export this child
-            child_name = f"{empty_name}_{child.name}" if len(children) > 1 else empty_name
-            if MASSEXPORTER_OT_export_all.export_single_object_simple(self, context, props, child, child_name, export_path):
-                success_count += 1
-
-        return success_count > 0
-
     def export_single_object_simple(self, context, props, obj, name, export_path):
         """Simple export of a single object without additional transform modifications"""
         if props.debug_mode:
@@ -2614,109 +3265,283 @@ class MASSEXPORTER_OT_export_all(Operator):
                 if not mat.name.startswith("M_"):
                     mat.name = "M_" + mat.name
 
+    @staticmethod
+    def _local_view_spaces():
+        """Every 3D viewport space (across every window) currently in local view."""
+        spaces = []
+        wm = getattr(bpy.context, 'window_manager', None)
+        if wm is None:
+            return spaces
+        for window in wm.windows:
+            for area in window.screen.areas:
+                if area.type != 'VIEW_3D':
+                    continue
+                for space in area.spaces:
+                    if space.type == 'VIEW_3D' and getattr(space, 'local_view', None):
+                        spaces.append(space)
+        return spaces
+
+    @staticmethod
+    def _make_temp_export_object(obj, mesh, prefix, local_view_spaces):
+        """Create an object named like `obj` that uses `mesh`, in the same
+        collections and local views, and rename `obj` to `prefix + name` so the
+        copy gets the clean name (no .001 suffix in the exported file).
+
+        `obj.copy()` carries modifiers, vertex-group names, material slots,
+        parent and transform, with no operator call, undo push or selection
+        change. Local-view membership is copied explicitly: unlike
+        bpy.ops.object.duplicate, a freshly linked object is outside every
+        local view, where select_set is a silent no-op.
+        """
+        original_name = obj.name
+        obj.name = f"{prefix}{original_name}"
+        copy = obj.copy()
+        copy.data = mesh
+        copy.name = original_name
+        collections = list(obj.users_collection) or [bpy.context.scene.collection]
+        for coll in collections:
+            coll.objects.link(copy)
+        for space in local_view_spaces:
+            try:
+                if obj.local_view_get(space):
+                    copy.local_view_set(space, True)
+            except (AttributeError, RuntimeError, TypeError, ReferenceError):
+                continue
+        return copy, original_name
+
+    @staticmethod
+    def _swap_selection_to_copies(context, objects, copies, originals_swapped):
+        """Deselect originals that have copies, select copies + passthroughs."""
+        for obj in originals_swapped:
+            obj.select_set(False)
+        for copy in copies:
+            copy.select_set(True)
+        # Keep non-mesh / no-modifier / armature objects selected
+        for obj in objects:
+            if obj not in originals_swapped:
+                obj.select_set(True)
+
+        if copies:
+            context.view_layer.objects.active = copies[0]
+        elif objects:
+            still_selected = [o for o in objects if o not in originals_swapped]
+            if still_selected:
+                context.view_layer.objects.active = still_selected[0]
+
+    @staticmethod
+    def _bake_shape_key_mesh(context, obj):
+        """Bake `obj` like `_apply_modifiers_to_selection` does, keeping its shape keys.
+
+        An evaluated mesh has no shape keys, so each key is evaluated on its
+        own (pinned with show_only_shape_key, unmuted, without its vertex
+        group) through the same modifier stack. The reference key gives the
+        base mesh. Returns (mesh, [(key settings, coordinates)]), or
+        (None, None) when the stack changes the vertex count from key to key.
+        In that case the keys cannot be rebuilt.
+        """
+        key = obj.data.shape_keys
+        blocks = list(key.key_blocks)
+        reference = key.reference_key
+        blocks.sort(key=lambda block: block != reference)   # reference first
+        pinned, active = obj.show_only_shape_key, obj.active_shape_key_index
+        saved = [(block, block.mute, block.vertex_group) for block in blocks]
+        mesh = None
+        shapes = []
+        try:
+            obj.show_only_shape_key = True
+            for block in blocks:
+                block.mute = False
+                block.vertex_group = ""
+            for block in blocks:
+                obj.active_shape_key_index = key.key_blocks.find(block.name)
+                context.view_layer.update()
+                depsgraph = context.evaluated_depsgraph_get()
+                evaluated = bpy.data.meshes.new_from_object(
+                    obj.evaluated_get(depsgraph),
+                    preserve_all_data_layers=True,
+                    depsgraph=depsgraph,
+                )
+                if mesh is None:
+                    mesh = evaluated
+                elif len(evaluated.vertices) != len(mesh.vertices):
+                    bpy.data.meshes.remove(evaluated)
+                    bpy.data.meshes.remove(mesh)
+                    return None, None
+                coords = array.array('f', bytes(len(evaluated.vertices) * 3 * 4))
+                evaluated.vertices.foreach_get("co", coords)
+                if evaluated is not mesh:
+                    bpy.data.meshes.remove(evaluated)
+                shapes.append(({
+                    'name': block.name,
+                    'relative_key': block.relative_key.name,
+                    'value': block.value,
+                    'slider_min': block.slider_min,
+                    'slider_max': block.slider_max,
+                    'interpolation': block.interpolation,
+                }, coords))
+        except Exception:
+            if mesh is not None:
+                bpy.data.meshes.remove(mesh)
+            raise
+        finally:
+            for block, mute, vertex_group in saved:
+                block.mute = mute
+                block.vertex_group = vertex_group
+            obj.show_only_shape_key = pinned
+            obj.active_shape_key_index = active
+            context.view_layer.update()
+        # The key settings the pins above ignored.
+        for (settings, _coords), (_block, mute, vertex_group) in zip(shapes, saved):
+            settings['mute'] = mute
+            settings['vertex_group'] = vertex_group
+        return mesh, shapes
+
+    @staticmethod
+    def _rebuild_shape_keys(copy, source_key, shapes):
+        """Re-create the baked shape keys on `copy`, with their settings and
+        the source key's animation (fcurves address key blocks by name)."""
+        for settings, coords in shapes:
+            block = copy.shape_key_add(name=settings['name'], from_mix=False)
+            block.data.foreach_set("co", coords)
+        blocks = copy.data.shape_keys.key_blocks
+        for settings, _coords in shapes:
+            block = blocks[settings['name']]
+            if settings['relative_key'] in blocks:
+                block.relative_key = blocks[settings['relative_key']]
+            block.slider_min = settings['slider_min']
+            block.slider_max = settings['slider_max']
+            block.value = settings['value']
+            block.interpolation = settings['interpolation']
+            block.mute = settings['mute']
+            block.vertex_group = settings['vertex_group']
+        new_key = copy.data.shape_keys
+        new_key.use_relative = source_key.use_relative
+        if source_key.animation_data and source_key.animation_data.action:
+            new_key.animation_data_create().action = source_key.animation_data.action
+
     @staticmethod
     def _apply_modifiers_to_selection(context, objects, skip_armature=False, only_visible=False):
         """Apply modifiers non-destructively on temporary copies of mesh objects.
         Swaps the selection so copies replace originals.
         Returns (copies, originals, original_names) for cleanup after export.
 
+        Each copy's mesh is built straight from the evaluated depsgraph object
+        (`evaluated_get` + `bpy.data.meshes.new_from_object`) — one depsgraph
+        evaluation for the whole selection instead of a duplicate operator
+        plus one modifier_apply operator per modifier, each with its own undo
+        push and depsgraph update.
+
         Armature modifiers whose rig is already in the export selection are
         always preserved — baking them would strip the skin binding from the
         FBX even though the rig ships in the same file. `skip_armature` is
         kept as a manual override that suppresses ALL armature modifiers
-        regardless of whether the rig is in the selection.
+        regardless of whether the rig is in the selection. Preserved
+        modifiers are switched off in the viewport for the evaluation, so the
+        baked mesh is the undeformed one, and stay on the copy, so the
+        exporter writes the binding.
 
         `only_visible` limits the bake to modifiers enabled in the viewport.
-        bpy.ops.object.modifier_apply has no notion of show_viewport — it bakes
-        a modifier that is switched off in the stack just the same — so the
-        workaround is to DELETE the disabled modifiers from the temporary copy
-        before applying anything. The copy is throwaway, so the source object's
-        stack is never touched. Deleting rather than skipping also keeps the
-        stack order intact: whatever follows a stripped modifier evaluates on
-        the previous result, which is exactly what the viewport shows.
-        Preserved armature modifiers are exempt — stripping a hidden armature
-        modifier would silently unbind the mesh from its rig in the FBX.
+        The viewport depsgraph evaluates exactly those, in stack order, which
+        is what the viewport shows. With it off, modifiers disabled in the
+        viewport are switched on for the evaluation so they are baked as well.
+        Preserved armature modifiers are exempt either way. Every
+        `show_viewport` flip on a source modifier is restored before returning.
+
+        Meshes with shape keys are baked from their reference key, and every key
+        is rebuilt on the copy through the same stack (`_bake_shape_key_mesh`).
+        When the stack changes the vertex count between keys, the object is
+        exported unbaked, with its keys, rather than losing its morph targets.
         """
         copies = []
         originals_swapped = []
         original_names = []
 
         rigs_in_selection = {o for o in objects if o.type == 'ARMATURE'}
-
-        def _should_skip(mod):
-            if mod.type != 'ARMATURE':
-                return False
-            if skip_armature:
-                return True
-            return mod.object in rigs_in_selection
-
-        def _is_hidden(mod):
-            """Disabled in the viewport, and not a preserved armature binding."""
-            return only_visible and not mod.show_viewport and not _should_skip(mod)
-
+        debug = context.scene.mass_exporter_props.debug_mode
+
+        # Pick the objects that need a bake and flip show_viewport so the
+        # evaluated stack is exactly "modifiers to apply". The rules live in
+        # modifier_bake_plan, shared with the export planner.
+        to_bake = []
+        preserved_names = {}   # object name -> names of modifiers kept on the copy
+        flipped = []   # [(mod, original show_viewport), ...]
         for obj in objects:
             if obj.type != 'MESH':
                 continue  # armatures/empties: leave in selection as-is
-
-            mods_to_apply = [
-                m for m in obj.modifiers if not _should_skip(m) and not _is_hidden(m)
-            ]
+            mods_to_apply, preserved = modifier_bake_plan(
+                obj, rigs_in_selection, skip_armature=skip_armature, only_visible=only_visible
+            )
             if not mods_to_apply:
                 continue  # nothing to bake — export the source object untouched
-
+            for mod in obj.modifiers:
+                want = mod in mods_to_apply
+                if not want and mod not in preserved and debug:
+                    print(f"[MassExporter] Skipping viewport-disabled modifier "
+                          f"'{mod.name}' on '{obj.name}'")
+                if mod.show_viewport != want:
+                    flipped.append((mod, mod.show_viewport))
+                    mod.show_viewport = want
+            preserved_names[obj.name] = {mod.name for mod in preserved}
+            to_bake.append(obj)
+
+        if to_bake:
+            local_view_spaces = MASSEXPORTER_OT_export_all._local_view_spaces()
             try:
-                original_name = obj.name
-                # Free the name so the copy can take it cleanly (no .001 suffix)
-                obj.name = f"__mexport_{original_name}"
-
-                batch_select_objects([obj], context)
-                bpy.ops.object.duplicate(linked=False)
-                copy = context.active_object
-                copy.name = original_name  # copy now has the clean original name
-
-                # Strip viewport-disabled modifiers off the copy BEFORE applying,
-                # otherwise modifier_apply bakes them regardless of show_viewport.
-                for mod in list(copy.modifiers):
-                    if _is_hidden(mod):
-                        print(f"[MassExporter] Skipping viewport-disabled modifier "
-                              f"'{mod.name}' on '{original_name}'")
-                        copy.modifiers.remove(mod)
-
-                for mod in list(copy.modifiers):
-                    if _should_skip(mod):
-                        continue
+                depsgraph = context.evaluated_depsgraph_get()
+                baked = []
+                for obj in to_bake:
                     try:
-                        bpy.ops.object.modifier_apply(modifier=mod.name)
+                        shapes = None
+                        if obj.data.shape_keys:
+                            mesh, shapes = MASSEXPORTER_OT_export_all._bake_shape_key_mesh(
+                                context, obj
+                            )
+                            if mesh is None:
+                                print(f"[MassExporter] '{obj.name}': modifiers change the vertex "
+                                      f"count between shape keys — exporting it unbaked to keep "
+                                      f"its shape keys")
+                                continue
+                        else:
+                            mesh = bpy.data.meshes.new_from_object(
+                                obj.evaluated_get(depsgraph),
+                                preserve_all_data_layers=True,
+                                depsgraph=depsgraph,
+                            )
+                        baked.append((obj, mesh, shapes))
                     except Exception as e:
-                        print(f"[MassExporter] Could not apply modifier '{mod.name}' on '{obj.name}': {e}")
-                        copy.modifiers.remove(mod)
-
-                copies.append(copy)
-                originals_swapped.append(obj)
-                original_names.append(original_name)
-            except Exception as e:
-                print(f"[MassExporter] Could not duplicate '{obj.name}' for modifier apply: {e}")
-                # Undo temp rename if duplication failed
-                if obj.name.startswith("__mexport_"):
-                    obj.name = obj.name[len("__mexport_"):]
-
-        # Swap selection: deselect originals that have copies, select copies
-        for obj in originals_swapped:
-            obj.select_set(False)
-        for copy in copies:
-            copy.select_set(True)
-        # Keep non-mesh / no-modifier / armature objects selected
-        for obj in objects:
-            if obj not in originals_swapped:
-                obj.select_set(True)
-
-        if copies:
-            context.view_layer.objects.active = copies[0]
-        elif objects:
-            still_selected = [o for o in objects if o not in originals_swapped]
-            if still_selected:
-                context.view_layer.objects.active = still_selected[0]
+                        print(f"[MassExporter] Could not evaluate '{obj.name}' for modifier apply: {e}")
+            finally:
+                for mod, show in flipped:
+                    mod.show_viewport = show
 
+            for obj, mesh, shapes in baked:
+                try:
+                    keep = preserved_names[obj.name]
+                    copy, original_name = MASSEXPORTER_OT_export_all._make_temp_export_object(
+                        obj, mesh, "__mexport_", local_view_spaces
+                    )
+                    if shapes:
+                        MASSEXPORTER_OT_export_all._rebuild_shape_keys(
+                            copy, obj.data.shape_keys, shapes
+                        )
+                    # Baked modifiers live in the mesh now; only the preserved
+                    # armature bindings stay on the copy.
+                    for mod in list(copy.modifiers):
+                        if mod.name not in keep:
+                            copy.modifiers.remove(mod)
+                    copies.append(copy)
+                    originals_swapped.append(obj)
+                    original_names.append(original_name)
+                except Exception as e:
+                    print(f"[MassExporter] Could not build modifier copy of '{obj.name}': {e}")
+                    if obj.name.startswith("__mexport_"):
+                        obj.name = obj.name[len("__mexport_"):]
+                    if mesh.users == 0:
+                        bpy.data.meshes.remove(mesh)
+
+        MASSEXPORTER_OT_export_all._swap_selection_to_copies(
+            context, objects, copies, originals_swapped
+        )
         return copies, originals_swapped, original_names
 
     @staticmethod
@@ -2724,17 +3549,18 @@ class MASSEXPORTER_OT_export_all(Operator):
         """Delete temporary modifier copies and restore original names and selection."""
         # Delete copies first — originals currently hold temp names, copies hold real names.
         # Deleting copies frees the real names so originals can be renamed back without conflict.
-        batch_deselect_all(context)
-        for copy in copies:
-            if copy.name in bpy.data.objects:
-                copy.select_set(True)
-        if copies:
-            bpy.ops.object.delete()
+        # One bulk bpy.data removal takes the copies and the meshes built for
+        # them; no operator, no selection juggling, no undo push.
+        live = [c for c in copies if c.name in bpy.data.objects]
+        meshes = [c.data for c in live if c.data is not None and c.data.users == 1]
+        if live:
+            bpy.data.batch_remove(live + meshes)
         # Restore original names now that copies (which held them) are gone
         for obj, orig_name in zip(originals, original_names):
             if obj.name in bpy.data.objects:
                 obj.name = orig_name
         # Restore selection
+        batch_deselect_all(context)
         for obj in originals:
             if obj.name in bpy.data.objects:
                 obj.select_set(True)
@@ -2745,12 +3571,14 @@ class MASSEXPORTER_OT_export_all(Operator):
     def _apply_transforms_via_duplicates(context, objects):
         """Bake location/rotation/scale into mesh data on temporary copies.
 
-        transform_apply rewrites vertex coordinates in place, so it must never
-        run on source meshes. Mirrors _apply_modifiers_to_selection: duplicate
-        each mesh, hand the original's name to the copy, bake the transform
-        into the copy's mesh data, swap selection to copies. Non-mesh objects
-        are left untouched (their transforms are restored unconditionally by
-        the caller's finally block).
+        Baking must never touch source meshes, so each mesh object gets a copy
+        with its own mesh data-block, `Mesh.transform` bakes the object's
+        local (basis) matrix into it, and the copy's basis is reset to
+        identity — what transform_apply does, minus the duplicate and apply
+        operators. The parent relation is kept, as with transform_apply.
+        Hands the original's name to the copy and swaps selection to copies.
+        Non-mesh objects are left untouched (their transforms are restored
+        unconditionally by the caller's finally block).
 
         Returns (copies, originals, original_names) for cleanup via
         _cleanup_modifier_copies — the cleanup pattern is identical.
@@ -2758,52 +3586,43 @@ class MASSEXPORTER_OT_export_all(Operator):
         copies = []
         originals_swapped = []
         original_names = []
+        local_view_spaces = MASSEXPORTER_OT_export_all._local_view_spaces()
 
         for obj in objects:
             if obj.type != 'MESH':
                 continue
 
+            mesh = None
             try:
-                original_name = obj.name
-                obj.name = f"__mexport_xform_{original_name}"
-
-                batch_select_objects([obj], context)
-                bpy.ops.object.duplicate(linked=False)
-                copy = context.active_object
-                copy.name = original_name
-
-                # duplicate(linked=False) already unlinks mesh data, but be defensive:
-                # if anything else is still sharing it, fork before baking vertices.
-                if copy.data and copy.data.users > 1:
-                    copy.data = copy.data.copy()
-
-                batch_select_objects([copy], context)
-                bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+                basis = obj.matrix_basis.copy()
+                mesh = obj.data.copy()
+                mesh.transform(basis, shape_keys=True)
+                # A mirroring (negative-determinant) matrix turns the faces
+                # inside out; flip them back like transform_apply does.
+                if basis.determinant() < 0 and hasattr(mesh, 'flip_normals'):
+                    mesh.flip_normals()
+                copy, original_name = MASSEXPORTER_OT_export_all._make_temp_export_object(
+                    obj, mesh, "__mexport_xform_", local_view_spaces
+                )
+                copy.matrix_basis = mathutils.Matrix.Identity(4)
 
                 copies.append(copy)
                 originals_swapped.append(obj)
                 original_names.append(original_name)
             except Exception as e:
-                print(f"[MassExporter] Could not duplicate '{obj.name}' for transform apply: {e}")
+                print(f"[MassExporter] Could not copy '{obj.name}' for transform apply: {e}")
                 if obj.name.startswith("__mexport_xform_"):
                     obj.name = obj.name[len("__mexport_xform_"):]
+                if mesh is not None and mesh.users == 0:
+                    bpy.data.meshes.remove(mesh)
 
-        # Swap selection: deselect originals that have copies, select copies + passthroughs
-        for obj in originals_swapped:
-            obj.select_set(False)
-        for copy in copies:
-            copy.select_set(True)
-        for obj in objects:
-            if obj not in originals_swapped:
-                obj.select_set(True)
-
+        MASSEXPORTER_OT_export_all._swap_selection_to_copies(
+            context, objects, copies, originals_swapped
+        )
+        # Matrices of the copies changed outside the depsgraph; flush so the
+        # exporter and the modifier bake that may follow see the baked state.
         if copies:
-            context.view_layer.objects.active = copies[0]
-        elif objects:
-            still_selected = [o for o in objects if o not in originals_swapped]
-            if still_selected:
-                context.view_layer.objects.active = still_selected[0]
-
+            context.view_layer.update()
         return copies, originals_swapped, original_names
 
     @staticmethod
@@ -2931,6 +3750,23 @@ class MASSEXPORTER_OT_export_all(Operator):
         # Snapshot full selection now (includes any added rigs)
         selected = [obj for obj in bpy.context.selected_objects]
 
+        # Incremental export: only set while Export All runs. Fingerprint the
+        # selection before any modifier copies are built, so an unchanged file
+        # costs a hash and nothing else.
+        run = getattr(self, '_export_run', None)
+        fingerprint = None
+        if run is not None:
+            try:
+                fingerprint = run.output_fingerprint(selected, props, filepath)
+            except Exception as e:
+                print(f"[MassExporter] Could not fingerprint '{filepath}': {e}")
+            if fingerprint is not None and run.output_unchanged(filepath, fingerprint):
+                if props.debug_mode:
+                    print(f"  Unchanged, skipping: {filepath}")
+                if added_rigs:
+                    MASSEXPORTER_OT_export_all._deselect_rigs(added_rigs)
+                return True
+
         # Apply modifiers via temporary copies so the result is guaranteed.
         # Armature objects in the selection are non-mesh and pass through untouched.
         modifier_copies = []
@@ -2984,10 +3820,14 @@ class MASSEXPORTER_OT_export_all(Operator):
                     use_selection=True
                 )
 
+            if run is not None:
+                run.output_done(filepath, fingerprint, True)
             return True
 
         except Exception as e:
             print(f"Export error: {str(e)}")
+            if run is not None:
+                run.output_done(filepath, fingerprint, False, str(e))
             return False
 
         finally:
@@ -2998,58 +3838,256 @@ class MASSEXPORTER_OT_export_all(Operator):
             if added_rigs:
                 MASSEXPORTER_OT_export_all._deselect_rigs(added_rigs)
 
-class MASSEXPORTER_OT_export_selected_collection(Operator):
-    """Export collection of currently selected object as a whole"""
-    bl_idname = "massexporter.export_selected_collection"
-    bl_label = "Export Collection of Selected"
-    bl_description = "Export the immediate collection containing the selected object as a whole, using configured export settings (ignores 'Sub-Collections as Single' mode)"
+class MASSEXPORTER_OT_export_all_background(Operator):
+    """Export all enabled collections in background Blender processes"""
+    bl_idname = "massexporter.export_all_background"
+    bl_label = "Export All in Background"
+    bl_description = (
+        "Save a copy of this file and export all enabled collections from it in "
+        "parallel background Blender processes, keeping the UI responsive. Esc cancels"
+    )
 
-    def find_immediate_collection(self, obj):
-        """Find the immediate (lowest-level) collection containing the object"""
-        # Start with all collections that contain this object
-        containing_collections = []
-        for collection in bpy.data.collections:
-            if obj.name in collection.objects:
-                containing_collections.append(collection)
+    _timer = None
 
-        if not containing_collections:
-            return None
+    def execute(self, context):
+        return self.invoke(context, None)
 
-        # If only one collection, return it
-        if len(containing_collections) == 1:
-            return containing_collections[0]
-
-        # Find the most specific (deepest) collection by checking which collections
-        # are children of other collections in the list
-        # A collection is "immediate" if it's not a parent of any other collection in the list
-        immediate_collection = None
-        for coll in containing_collections:
-            is_parent = False
-            for other_coll in containing_collections:
-                if coll != other_coll and self.is_parent_of(coll, other_coll):
-                    is_parent = True
-                    break
-
-            # If this collection is not a parent of any other, it's more immediate
-            if not is_parent:
-                immediate_collection = coll
-                break
+    def invoke(self, context, event):
+        props = context.scene.mass_exporter_props
+        # Edit-mode changes only reach the mesh data (and so the saved copy)
+        # once the object leaves edit mode.
+        if bpy.ops.object.mode_set.poll():
+            bpy.ops.object.mode_set(mode='OBJECT')
+        if not exportable_rows(props):
+            self.report({'WARNING'}, "No collections are enabled for export")
+            return {'CANCELLED'}
 
-        return immediate_collection if immediate_collection else containing_collections[0]
+        self._workdir = tempfile.mkdtemp(prefix="massexporter_")
+        blend_path = os.path.join(self._workdir, "export_copy.blend")
+        try:
+            bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+        except RuntimeError as e:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self.report({'ERROR'}, f"Could not save a copy for the background export: {e}")
+            return {'CANCELLED'}
 
-    def is_parent_of(self, parent_coll, child_coll):
-        """Check if parent_coll is a parent (or ancestor) of child_coll"""
-        # Check direct children by comparing collection objects
-        for child in parent_coll.children:
-            if child == child_coll:
-                return True
+        plan = build_export_plan(context, props, blend_path, props.background_workers)
+        plan_path = os.path.join(self._workdir, "plan.json")
+        with open(plan_path, 'w', encoding='utf-8') as fh:
+            json.dump(plan, fh, indent=1)
+        self._rows = len(plan['rows'])
+
+        self._workers = []
+        for shard in range(len(plan['shards'])):
+            result_path = os.path.join(self._workdir, f"result_{shard}.json")
+            log_path = os.path.join(self._workdir, f"worker_{shard}.log")
+            log = open(log_path, 'w', encoding='utf-8')
+            try:
+                proc = subprocess.Popen(
+                    worker_command(plan, plan_path, shard, result_path),
+                    stdout=log, stderr=subprocess.STDOUT,
+                )
+            except OSError as e:
+                log.close()
+                self._stop_workers()
+                self.report({'ERROR'}, f"Could not start background Blender: {e}")
+                return {'CANCELLED'}
+            self._workers.append({
+                'shard': shard, 'proc': proc, 'log': log,
+                'log_path': log_path, 'result_path': result_path,
+            })
+            if props.debug_mode:
+                print(f"[MassExporter] worker {shard}: rows {plan['shards'][shard]}")
+
+        self._started = time.perf_counter()
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.5, window=context.window)
+        wm.modal_handler_add(self)
+        self.report({'INFO'}, f"Exporting {self._rows} collections in "
+                              f"{len(self._workers)} background worker(s) — Esc to cancel")
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self._stop_workers()
+            self._end(context)
+            self.report({'WARNING'}, "Background export cancelled")
+            return {'CANCELLED'}
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}
 
-        # Check recursively through all descendants
-        for child in parent_coll.children:
-            if self.is_parent_of(child, child_coll):
-                return True
+        done = sum(1 for w in self._workers if w['proc'].poll() is not None)
+        if context.workspace is not None:
+            context.workspace.status_text_set(
+                f"Mass Exporter: {done}/{len(self._workers)} background workers finished — Esc to cancel"
+            )
+        if done < len(self._workers):
+            return {'PASS_THROUGH'}
 
-        return False
+        self._end(context)
+        self._report_results()
+        return {'FINISHED'}
+
+    def _stop_workers(self):
+        for worker in self._workers:
+            if worker['proc'].poll() is None:
+                worker['proc'].terminate()
+        for worker in self._workers:
+            try:
+                worker['proc'].wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                worker['proc'].kill()
+            worker['log'].close()
+        shutil.rmtree(self._workdir, ignore_errors=True)
+
+    def _end(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        if context.workspace is not None:
+            context.workspace.status_text_set(None)
+
+    @staticmethod
+    def _log_tail(path, lines=5):
+        try:
+            with open(path, encoding='utf-8', errors='replace') as fh:
+                return " | ".join(line.strip() for line in fh.readlines()[-lines:] if line.strip())
+        except OSError:
+            return "<no log>"
+
+    def _report_results(self):
+        """Merge the workers' result files into this operator's report."""
+        exported, files, problems = [], 0, 0
+        skipped_collections = skipped_files = 0
+        for worker in self._workers:
+            worker['log'].close()
+            try:
+                with open(worker['result_path'], encoding='utf-8') as fh:
+                    result = json.load(fh)
+            except (OSError, ValueError):
+                problems += 1
+                self.report({'ERROR'}, (
+                    f"Background worker {worker['shard']} exited with code "
+                    f"{worker['proc'].returncode} without a result: "
+                    f"{self._log_tail(worker['log_path'])}"
+                ))
+                continue
+            exported.extend(result.get('exported', ()))
+            skipped_collections += result.get('skipped_collections', 0)
+            skipped_files += result.get('skipped_files', 0)
+            for coll_name, err in result.get('failed', ()):
+                problems += 1
+                self.report({'ERROR'}, f"Export failed for '{coll_name}': {err}")
+            for entry in result.get('files', ()):
+                if entry['status'] == 'exported':
+                    files += 1
+                elif entry['status'] == 'failed':
+                    problems += 1
+                    self.report({'ERROR'}, f"Export failed for '{entry['path']}': {entry['error']}")
+
+        if problems:
+            # Keep plan, copy and logs for a post-mortem.
+            print(f"[MassExporter] Background export files kept in {self._workdir}")
+        else:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - self._started
+        summary = (f"Background export: {len(exported)}/{self._rows} collections, "
+                   f"{files} files written by {len(self._workers)} worker(s) in {elapsed:.1f}s")
+        if skipped_collections or skipped_files:
+            summary += (f" — skipped {skipped_collections} unchanged collection(s)"
+                        f" and {skipped_files} unchanged file(s)")
+        self.report({'WARNING'} if problems else {'INFO'}, summary)
+
+
+class MASSEXPORTER_OT_dry_run(Operator):
+    """Preview what Export All would write, without exporting anything"""
+    bl_idname = "massexporter.dry_run"
+    bl_label = "Dry Run"
+    bl_description = (
+        "List every file Export All would write, with object counts and estimated "
+        "vertex counts. Nothing is selected, changed or exported"
+    )
+
+    # Rows shown in the dialog; the System Console gets the full list.
+    MAX_LINES = 40
+
+    def execute(self, context):
+        return {'FINISHED'}
+
+    def invoke(self, context, event):
+        props = context.scene.mass_exporter_props
+        rows = exportable_rows(props)
+        if not rows:
+            self.report({'WARNING'}, "No collections are enabled for export")
+            return {'CANCELLED'}
+
+        self._rows = []
+        files = vertices = heavy = 0
+        print(f"\n[MassExporter] Dry run — {len(rows)} collection(s)")
+        for _index, item in rows:
+            collection = item.collection
+            skipped = (MASSEXPORTER_OT_export_all._collection_is_hidden(collection)
+                       and not props.export_hidden_collections)
+            jobs = [] if skipped else plan_collection_jobs(props, item)
+            self._rows.append((collection.name, export_mode(item, props), skipped, jobs))
+            note = " (hidden, skipped)" if skipped else ""
+            print(f"  {collection.name} [{export_mode(item, props)}]{note}")
+            for job in jobs:
+                flag = "  HEAVY" if job.vertices >= DRY_RUN_HEAVY_VERTICES else ""
+                print(f"    {job.filepath}  [{job.kind}] {len(job.objects)} object(s), "
+                      f"~{job.vertices:,} vertices{flag}")
+                for obj_name, modifiers in job.modifiers.items():
+                    print(f"      bake {obj_name}: {', '.join(modifiers)}")
+                files += 1
+                vertices += job.vertices
+                heavy += job.vertices >= DRY_RUN_HEAVY_VERTICES
+
+        summary = f"Dry run: {files} file(s), ~{vertices:,} vertices"
+        if heavy:
+            summary += f", {heavy} over {DRY_RUN_HEAVY_VERTICES:,}"
+        print(f"[MassExporter] {summary}")
+        self.report({'WARNING'} if heavy else {'INFO'}, summary)
+        return context.window_manager.invoke_props_dialog(self, width=560)
+
+    def draw(self, context):
+        layout = self.layout
+        col = layout.column(align=True)
+        lines = 0
+        hidden = 0
+        for name, mode, skipped, jobs in self._rows:
+            if lines >= self.MAX_LINES:
+                hidden += len(jobs)
+                continue
+            col.label(text=f"{name}  ({mode})", icon='OUTLINER_COLLECTION')
+            lines += 1
+            if skipped:
+                col.label(text="    hidden — skipped ('Export Hidden Collections' is off)",
+                          icon='HIDE_ON')
+                lines += 1
+            elif not jobs:
+                col.label(text="    no objects to export", icon='INFO')
+                lines += 1
+            for job in jobs:
+                if lines >= self.MAX_LINES:
+                    hidden += 1
+                    continue
+                heavy = job.vertices >= DRY_RUN_HEAVY_VERTICES
+                col.label(
+                    text=f"    {os.path.basename(job.filepath)} — {len(job.objects)} object(s), "
+                         f"~{job.vertices:,} vertices",
+                    icon='ERROR' if heavy else 'FILE',
+                )
+                lines += 1
+        if hidden:
+            col.label(text=f"… {hidden} more file(s), see the System Console")
+
+
+class MASSEXPORTER_OT_export_selected_collection(Operator):
+    """Export collection of currently selected object as a whole"""
+    bl_idname = "massexporter.export_selected_collection"
+    bl_label = "Export Collection of Selected"
+    bl_description = "Export the immediate collection containing the selected object as a whole, using configured export settings (ignores 'Sub-Collections as Single' mode)"
 
     def execute(self, context):
         # Force OBJECT mode
@@ -3063,7 +4101,9 @@ class MASSEXPORTER_OT_export_selected_collection(Operator):
             return {'CANCELLED'}
 
         # Find the immediate collection containing this object
-        target_collection = self.find_immediate_collection(active_obj)
+        # One pass over the collection tree serves every lookup below.
+        coll_index = CollectionIndex()
+        target_collection = coll_index.immediate_collection(active_obj)
 
         if not target_collection:
             self.report({'WARNING'}, f"Object '{active_obj.name}' is not in any collection")
@@ -3080,7 +4120,7 @@ class MASSEXPORTER_OT_export_selected_collection(Operator):
         # If not in export list, we need an export path from somewhere
         if not export_item:
             # Try to find a parent collection in the export list and use its settings
-            parent_export_item = self.find_parent_export_item(target_collection, props)
+            parent_export_item = coll_index.parent_export_item(target_collection, props)
 
             if not parent_export_item:
                 self.report({'WARNING'}, f"Collection '{target_collection.name}' is not in export list and no parent collection found")
@@ -3148,12 +4188,6 @@ class MASSEXPORTER_OT_export_selected_collection(Operator):
             if original_active and original_active.name in bpy.data.objects:
                 context.view_layer.objects.active = original_active
 
-    def find_parent_export_item(self, collection, props):
-        """Find a parent collection in the export list"""
-        for item in props.collection_items:
-            if item.collection and self.is_parent_of(item.collection, collection):
-                return item
-        return None
 
 class MASSEXPORTER_OT_export_selected_subcollections(Operator):
     """Export sub-collections of currently selected object's collection"""
@@ -3161,60 +4195,6 @@ class MASSEXPORTER_OT_export_selected_subcollections(Operator):
     bl_label = "Export Sub-Collections of Selected"
     bl_description = "Export each sub-collection of the collection containing the selected object, using the collection's configured export settings"
 
-    def find_immediate_collection(self, obj):
-        """Find the immediate (lowest-level) collection containing the object"""
-        # Start with all collections that contain this object
-        containing_collections = []
-        for collection in bpy.data.collections:
-            if obj.name in collection.objects:
-                containing_collections.append(collection)
-
-        if not containing_collections:
-            return None
-
-        # If only one collection, return it
-        if len(containing_collections) == 1:
-            return containing_collections[0]
-
-        # Find the most specific (deepest) collection by checking which collections
-        # are children of other collections in the list
-        # A collection is "immediate" if it's not a parent of any other collection in the list
-        immediate_collection = None
-        for coll in containing_collections:
-            is_parent = False
-            for other_coll in containing_collections:
-                if coll != other_coll and self.is_parent_of(coll, other_coll):
-                    is_parent = True
-                    break
-
-            # If this collection is not a parent of any other, it's more immediate
-            if not is_parent:
-                immediate_collection = coll
-                break
-
-        return immediate_collection if immediate_collection else containing_collections[0]
-
-    def is_parent_of(self, parent_coll, child_coll):
-        """Check if parent_coll is a parent (or ancestor) of child_coll"""
-        # Check direct children by comparing collection objects
-        for child in parent_coll.children:
-            if child == child_coll:
-                return True
-
-        # Check recursively through all descendants
-        for child in parent_coll.children:
-            if self.is_parent_of(child, child_coll):
-                return True
-
-        return False
-
-    def find_parent_export_item(self, collection, props):
-        """Find a parent collection in the export list"""
-        for item in props.collection_items:
-            if item.collection and self.is_parent_of(item.collection, collection):
-                return item
-        return None
-
     def execute(self, context):
         # Force OBJECT mode
         if bpy.ops.object.mode_set.poll():
@@ -3227,7 +4207,9 @@ class MASSEXPORTER_OT_export_selected_subcollections(Operator):
             return {'CANCELLED'}
 
         # Find the immediate collection containing this object
-        target_collection = self.find_immediate_collection(active_obj)
+        # One pass over the collection tree serves every lookup below.
+        coll_index = CollectionIndex()
+        target_collection = coll_index.immediate_collection(active_obj)
 
         if not target_collection:
             self.report({'WARNING'}, f"Object '{active_obj.name}' is not in any collection")
@@ -3248,7 +4230,7 @@ class MASSEXPORTER_OT_export_selected_subcollections(Operator):
 
         # If not in export list, try to find parent collection settings
         if not export_item:
-            parent_export_item = self.find_parent_export_item(target_collection, props)
+            parent_export_item = coll_index.parent_export_item(target_collection, props)
 
             if not parent_export_item:
                 self.report({'WARNING'}, f"Collection '{target_collection.name}' is not in export list and no parent collection found")
@@ -3322,63 +4304,6 @@ class MASSEXPORTER_OT_export_selected_objects(Operator):
     bl_label = "Export Selected Object(s)"
     bl_description = "Export the collections containing selected objects, using each collection's configured export settings (merge, sub-collections, etc.)"
 
-    def find_immediate_collection(self, obj):
-        """Find the immediate (lowest-level) collection containing the object"""
-        # Start with all collections that contain this object
-        containing_collections = []
-        for collection in bpy.data.collections:
-            if obj.name in collection.objects:
-                containing_collections.append(collection)
-
-        if not containing_collections:
-            return None
-
-        # If only one collection, return it
-        if len(containing_collections) == 1:
-            return containing_collections[0]
-
-        # Find the most specific (deepest) collection
-        immediate_collection = None
-        for coll in containing_collections:
-            is_parent = False
-            for other_coll in containing_collections:
-                if coll != other_coll and self.is_parent_of(coll, other_coll):
-                    is_parent = True
-                    break
-
-            if not is_parent:
-                immediate_collection = coll
-                break
-
-        return immediate_collection if immediate_collection else containing_collections[0]
-
-    def is_parent_of(self, parent_coll, child_coll):
-        """Check if parent_coll is a parent (or ancestor) of child_coll"""
-        for child in parent_coll.children:
-            if child == child_coll:
-                return True
-
-        for child in parent_coll.children:
-            if self.is_parent_of(child, child_coll):
-                return True
-
-        return False
-
-    def find_parent_export_item(self, collection, props):
-        """Find a parent collection in the export list"""
-        for item in props.collection_items:
-            if item.collection and self.is_parent_of(item.collection, collection):
-                return item
-        return None
-
-
-    def find_parent_collection(self, collection):
-        """Find the direct parent collection of the given collection"""
-        for coll in bpy.data.collections:
-            if collection.name in coll.children:
-                return coll
-        return None
-
     def execute(self, context):
         """Export ONLY the selected objects, not entire collections.
 
@@ -3408,10 +4333,12 @@ class MASSEXPORTER_OT_export_selected_objects(Operator):
                 cancelled = True
                 return {'CANCELLED'}
 
-            # Group selected objects by their immediate collection
+            # Group selected objects by their immediate collection. One pass
+            # over the collection tree serves every lookup below.
+            coll_index = CollectionIndex()
             collection_groups = {}
             for obj in selected_objects:
-                coll = self.find_immediate_collection(obj)
+                coll = coll_index.immediate_collection(obj)
                 if coll:
                     collection_groups.setdefault(coll, []).append(obj)
 
@@ -3431,7 +4358,7 @@ class MASSEXPORTER_OT_export_selected_objects(Operator):
 
                 # If not found, check parent collections
                 if not export_item:
-                    parent_export_item = self.find_parent_export_item(collection, props)
+                    parent_export_item = coll_index.parent_export_item(collection, props)
                     if not parent_export_item:
                         self.report({'WARNING'}, f"Collection '{collection.name}' not in export list - skipping")
                         continue
@@ -3458,7 +4385,7 @@ class MASSEXPORTER_OT_export_selected_objects(Operator):
                 visibility_backup = MASSEXPORTER_OT_export_all._unhide_collection_for_export(collection)
                 try:
                     # Check if this is a subcollection and should be exported as a whole
-                    parent_coll = self.find_parent_collection(collection)
+                    parent_coll = coll_index.parent(collection)
                     parent_item = None
                     if parent_coll:
                         for item in props.collection_items:
@@ -3528,8 +4455,16 @@ class MASSEXPORTER_PT_main_panel(Panel):
         props = context.scene.mass_exporter_props
 
         # Export button
-        layout.operator("massexporter.export_all", text="Export All Collections", icon='EXPORT')
+        row = layout.row(align=True)
+        row.operator("massexporter.export_all", text="Export All Collections", icon='EXPORT')
+        row.operator("massexporter.dry_run", text="", icon='VIEWZOOM')
         layout.prop(props, "export_hidden_collections")
+        layout.prop(props, "force_export")
+        row = layout.row(align=True)
+        row.prop(props, "use_background_export")
+        sub = row.row(align=True)
+        sub.enabled = props.use_background_export
+        sub.prop(props, "background_workers")
 
         layout.separator()
 
@@ -3844,6 +4779,8 @@ classes = [
     MASSEXPORTER_OT_remove_suffix,
     MASSEXPORTER_OT_add_default_suffixes,
     MASSEXPORTER_OT_export_all,
+    MASSEXPORTER_OT_export_all_background,
+    MASSEXPORTER_OT_dry_run,
     MASSEXPORTER_OT_export_selected_collection,
     MASSEXPORTER_OT_export_selected_subcollections,
     MASSEXPORTER_OT_export_selected_objects,
@@ -0,0 +1,84 @@
+"""
+Background export worker — started by MASSEXPORTER_OT_export_all_background,
+never imported by the addon and not meant to be run by hand:
+
+    blender --background --factory-startup <copy.blend> --python-exit-code 1 \
+            --python background_worker.py -- <plan.json> <shard> <result.json>
+
+Loads the addon from the plan's `addon_dir` (factory startup means it is not
+enabled here), points each row of its shard at the plan's absolute export path
+— `//` paths would otherwise resolve next to the temp copy — and runs the
+regular Export All operator restricted to those rows. The operator writes the
+result JSON; if anything goes wrong before it can, this script writes one with
+the error instead, so the UI always has something to report.
+"""
+import bpy
+import importlib.util
+import json
+import os
+import sys
+import traceback
+
+
+def _load_addon(addon_dir):
+    for module in list(sys.modules.values()):
+        bl_info = getattr(module, "bl_info", None)
+        if isinstance(bl_info, dict) and bl_info.get("name") == "Mass Collection Exporter" \
+                and hasattr(bpy.types.Scene, "mass_exporter_props"):
+            return module
+    spec = importlib.util.spec_from_file_location(
+        "mass_collection_exporter_worker",
+        os.path.join(addon_dir, "__init__.py"),
+        submodule_search_locations=[addon_dir],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    module.register()
+    return module
+
+
+def _write_failure(result_path, message):
+    tmp = result_path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"exported": [], "failed": [["<worker>", message]],
+                   "skipped_collections": 0, "skipped_files": 0, "files": []}, fh)
+    os.replace(tmp, result_path)
+
+
+def main():
+    plan_path, shard, result_path = sys.argv[sys.argv.index("--") + 1:][:3]
+    try:
+        with open(plan_path, encoding="utf-8") as fh:
+            plan = json.load(fh)
+        module = _load_addon(plan["addon_dir"])
+        if plan.get("version") != module.BACKGROUND_PLAN_VERSION:
+            raise RuntimeError(f"plan version {plan.get('version')} does not match the addon")
+
+        scene = bpy.context.scene
+        if scene.name != plan["scene"]:
+            raise RuntimeError(f"active scene is '{scene.name}', the plan was made for '{plan['scene']}'")
+        props = scene.mass_exporter_props
+        rows = {row["index"]: row for row in plan["rows"]}
+        indices = plan["shards"][int(shard)]
+        for index in indices:
+            row = rows[index]
+            item = props.collection_items[index]
+            coll_name = getattr(item.collection, "name", None)
+            if coll_name != row["collection"]:
+                raise RuntimeError(f"row {index} is '{coll_name}' in the saved copy, "
+                                   f"the plan expected '{row['collection']}'")
+            item.export_path = row["export_path"]
+
+        print(f"[MassExporter worker {shard}] exporting rows {indices}")
+        bpy.ops.massexporter.export_all(
+            row_indices=",".join(str(i) for i in indices),
+            result_path=result_path,
+        )
+    except Exception as e:
+        traceback.print_exc()
+        _write_failure(result_path, f"{type(e).__name__}: {e}")
+        sys.exit(1)
+
+
+main()